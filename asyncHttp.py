@@ -0,0 +1,291 @@
+import os
+import json
+import time
+import asyncio
+import hashlib
+import threading
+from urllib.parse import urlencode, urlparse
+
+import requests
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+# br, aiohttp ve urllib3 tarafından sadece brotli paketi varsa çözülür; yoksa istenmez
+try:
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        ACCEPT_ENCODING = "gzip, deflate, br"
+    except ImportError:
+        ACCEPT_ENCODING = "gzip, deflate"
+
+# Host bazında aynı anda açık istek sınırı; listede olmayan hostlar DEFAULT_HOST_LIMIT kullanır
+HOST_LIMITS = {
+    "api.mylnikov.org": 4,
+    "report.admin.doktarim.com": 8,
+}
+DEFAULT_HOST_LIMIT = 8
+TOTAL_LIMIT = 100
+DEFAULT_TIMEOUT = 30
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Yanıt önbelleği: ETag / Last-Modified olan yanıtlar diske yazılır, sonraki istek koşullu gönderilir (304 = gövde yok)
+HTTP_CACHE_ENABLED = True
+HTTP_CACHE_DIR = os.path.join(os.getcwd(), "Device Cache", "http")
+
+HTTP_ERRORS = (requests.exceptions.RequestException, asyncio.TimeoutError, OSError)
+if aiohttp is not None:
+    HTTP_ERRORS += (aiohttp.ClientError,)
+
+class HttpResponse:
+    # from_cache: None (ağdan geldi), "fresh" (max-age içinde, istek yok) veya "revalidated" (sunucu 304 döndü)
+    def __init__(self, url, status, headers, body, from_cache=None):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.from_cache = from_cache
+
+    def header(self, name, default=None):
+        name = name.lower()
+        for key, value in self.headers.items():
+            if key.lower() == name:
+                return value
+        return default
+
+    def digest(self):
+        # Gövde içeriğinin özeti; aynı gövde tekrar ayrıştırılmasın diye karşılaştırmada kullanılır
+        return hashlib.blake2b(self.body, digest_size=16).hexdigest()
+
+    def text(self, encoding="utf-8"):
+        return self.body.decode(encoding, errors="replace")
+
+    def json(self):
+        return json.loads(self.body)
+
+def _cache_control(response):
+    directives = {}
+    for part in (response.header("Cache-Control") or "").split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('"')
+    return directives
+
+class HttpCache:
+    # Anahtar başına iki dosya: .json (doğrulayıcılar, başlıklar, zaman) ve .body (ham gövde, sadece 304'te okunur)
+    def __init__(self, cache_dir=HTTP_CACHE_DIR):
+        self.cache_dir = cache_dir
+
+    def _path(self, url, params):
+        key = url + ("?" + urlencode(sorted(params.items())) if params else "")
+        return os.path.join(self.cache_dir, hashlib.sha1(key.encode()).hexdigest())
+
+    def lookup(self, url, params=None):
+        path = self._path(url, params)
+        try:
+            with open(f"{path}.json", "r", encoding="utf-8") as file:
+                entry = json.load(file)
+        except (OSError, ValueError):
+            return None
+        entry["path"] = path
+        return entry
+
+    def is_fresh(self, entry):
+        return entry.get("max_age") is not None and time.time() < entry["stored_at"] + entry["max_age"]
+
+    def validators(self, entry):
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def response(self, entry, from_cache):
+        try:
+            with open(f"{entry['path']}.body", "rb") as file:
+                body = file.read()
+        except OSError:
+            return None
+        return HttpResponse(entry["url"], 200, entry["headers"], body, from_cache=from_cache)
+
+    def _write_meta(self, path, entry):
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump({key: value for key, value in entry.items() if key != "path"}, file)
+        os.replace(temp_path, f"{path}.json")
+
+    def store(self, url, params, response):
+        directives = _cache_control(response)
+        etag, last_modified = response.header("ETag"), response.header("Last-Modified")
+        max_age = int(directives["max-age"]) if directives.get("max-age", "").isdigit() else None
+        if "no-store" in directives or not (etag or last_modified or max_age):
+            return
+        if "no-cache" in directives:
+            max_age = None
+
+        path = self._path(url, params)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Önce gövde, sonra meta yazılır; meta varsa gövde her zaman tamdır
+            temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp_path, "wb") as file:
+                file.write(response.body)
+            os.replace(temp_path, f"{path}.body")
+            self._write_meta(path, {
+                "url": response.url,
+                "etag": etag,
+                "last_modified": last_modified,
+                "max_age": max_age,
+                "stored_at": time.time(),
+                # Gövde çözülmüş halde saklanır; sıkıştırma başlıkları artık geçerli değil
+                "headers": {
+                    key: value for key, value in response.headers.items()
+                    if key.lower() not in ("content-encoding", "content-length")
+                },
+            })
+        except OSError as e:
+            print(f"Warning: Could not cache HTTP response for {url} - {e}")
+
+    def refresh(self, entry, response):
+        # 304: gövde aynı; sunucunun gönderdiği yeni doğrulayıcı ve max-age meta'ya işlenir
+        directives = _cache_control(response)
+        entry["etag"] = response.header("ETag") or entry.get("etag")
+        entry["last_modified"] = response.header("Last-Modified") or entry.get("last_modified")
+        if directives.get("max-age", "").isdigit() and "no-cache" not in directives:
+            entry["max_age"] = int(directives["max-age"])
+        entry["stored_at"] = time.time()
+        try:
+            self._write_meta(entry["path"], entry)
+        except OSError as e:
+            print(f"Warning: Could not update HTTP cache entry for {entry['url']} - {e}")
+
+class AsyncHttpClient:
+    # Tüm istekler tek bir event loop thread'inde çalışır; bağlantılar (keep-alive) paylaşılır.
+    # aiohttp yoksa aynı arayüz requests.Session + executor ile çalışır.
+    def __init__(self, total_limit=TOTAL_LIMIT, host_limits=None, timeout=DEFAULT_TIMEOUT, cache=None):
+        self.total_limit = total_limit
+        self.host_limits = dict(HOST_LIMITS if host_limits is None else host_limits)
+        self.timeout = timeout
+        self.cache = cache if cache is not None else (HttpCache() if HTTP_CACHE_ENABLED else None)
+        self.session = None
+        self.semaphores = {}
+
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self._run_loop, name="http-loop", daemon=True)
+        self.thread.start()
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def _semaphore(self, url):
+        host = urlparse(url).hostname or ""
+        if host not in self.semaphores:
+            self.semaphores[host] = asyncio.Semaphore(self.host_limits.get(host, DEFAULT_HOST_LIMIT))
+        return self.semaphores[host]
+
+    def _session(self):
+        if self.session is None:
+            if aiohttp is not None:
+                connector = aiohttp.TCPConnector(limit=self.total_limit, keepalive_timeout=60)
+                self.session = aiohttp.ClientSession(connector=connector)
+            else:
+                self.session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(pool_maxsize=self.total_limit)
+                self.session.mount("http://", adapter)
+                self.session.mount("https://", adapter)
+        return self.session
+
+    async def get(self, url, params=None, timeout=None, stream_to=None, chunk_size=STREAM_CHUNK_SIZE, cache=True):
+        # stream_to verilirse gövde parça parça ona yazılır (write(bytes) olan dosya vb.), bellekte tutulmaz ve önbelleğe alınmaz
+        timeout = timeout or self.timeout
+        cache = self.cache if cache and stream_to is None else None
+        entry = cache.lookup(url, params) if cache is not None else None
+        if entry is not None and cache.is_fresh(entry):
+            cached = cache.response(entry, "fresh")
+            if cached is not None:
+                return cached
+
+        headers = {"Accept-Encoding": ACCEPT_ENCODING}
+        if entry is not None:
+            headers.update(cache.validators(entry))
+        response = await self._request(url, params, headers, timeout, stream_to, chunk_size)
+
+        if entry is not None and response.status == 304:
+            cached = cache.response(entry, "revalidated")
+            if cached is not None:
+                cache.refresh(entry, response)
+                return cached
+            # Gövde dosyası silinmişse koşulsuz tekrar istenir
+            response = await self._request(url, params, {"Accept-Encoding": ACCEPT_ENCODING}, timeout, stream_to, chunk_size)
+        if cache is not None and response.status == 200:
+            cache.store(url, params, response)
+        return response
+
+    async def _request(self, url, params, headers, timeout, stream_to, chunk_size):
+        async with self._semaphore(url):
+            session = self._session()
+            if aiohttp is None:
+                return await self.loop.run_in_executor(
+                    None, self._blocking_get, session, url, params, headers, timeout, stream_to, chunk_size
+                )
+
+            async with session.get(url, params=params, headers=headers, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                if stream_to is not None:
+                    async for chunk in response.content.iter_chunked(chunk_size):
+                        stream_to.write(chunk)
+                    body = b""
+                else:
+                    body = await response.read()
+                return HttpResponse(str(response.url), response.status, dict(response.headers), body)
+
+    def _blocking_get(self, session, url, params, headers, timeout, stream_to, chunk_size):
+        with session.get(url, params=params, headers=headers, timeout=timeout, stream=stream_to is not None) as response:
+            if stream_to is not None:
+                for chunk in response.iter_content(chunk_size):
+                    stream_to.write(chunk)
+                body = b""
+            else:
+                body = response.content
+            return HttpResponse(response.url, response.status_code, dict(response.headers), body)
+
+    async def _gather(self, coroutines):
+        return await asyncio.gather(*coroutines, return_exceptions=True)
+
+    def submit(self, coroutine):
+        # Başka bir thread'den (GUI, QThread worker) coroutine çalıştırır; concurrent.futures.Future döner
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    def fetch(self, url, params=None, timeout=None, stream_to=None, cache=True):
+        return self.submit(self.get(url, params, timeout, stream_to, cache=cache)).result()
+
+    def fetch_many(self, urls, timeout=None, cache=True):
+        # Sonuç listesi url sırasındadır; başarısız isteklerin yerinde exception nesnesi bulunur
+        return self.submit(self._gather([self.get(url, timeout=timeout, cache=cache) for url in urls])).result()
+
+    def close(self):
+        async def _close():
+            await self.session.close()
+        if isinstance(self.session, requests.Session):
+            self.session.close()
+        elif self.session is not None:
+            self.submit(_close()).result()
+        self.session = None
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+
+_client = None
+_client_lock = threading.Lock()
+
+def http_client():
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = AsyncHttpClient()
+        return _client
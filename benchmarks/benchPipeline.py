@@ -0,0 +1,155 @@
+import os
+import io
+import copy
+import sys
+import json
+import time
+import platform
+import argparse
+import tracemalloc
+from contextlib import redirect_stdout
+from datetime import datetime
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+import pandas as pd
+
+from dataFetch import (
+    merge_data, normalize_timestamp, split_gsm_info_column, filter_columns, sort_by_timestamp, read_portal_excel
+)
+from defaultTests import DataTests
+from testAccumulator import TestAccumulator
+from syntheticData import device_frames, portal_excel_bytes
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+SIZES = {"10k": 10_000, "100k": 100_000, "1M": 1_000_000}
+
+# Excel üretimi çok yavaş olduğu için okuma ölçümü bu boyuta kadar yapılır
+EXCEL_MAX_ROWS = 100_000
+
+def prepare_stages(n, seed=0):
+    # Her aşamanın girdisi bir önceki aşamanın çıktısıdır; ölçüm dışında bir kez hazırlanır
+    with redirect_stdout(io.StringIO()):
+        report_df, portal_df = device_frames(n, seed)
+        merged = merge_data(report_df.copy(), portal_df.copy())
+        split = split_gsm_info_column(merged.copy())
+        filtered = filter_columns(split.copy())
+        ordered = sort_by_timestamp(filtered.copy())
+        tester = DataTests()
+        tested, _ = tester.add_time_difference_column(ordered)
+
+    cases = []
+    if n <= EXCEL_MAX_ROWS:
+        excel_bytes = portal_excel_bytes(portal_df)
+        cases.append(("read_portal_excel", lambda: read_portal_excel(excel_bytes)))
+
+    cases += [
+        ("merge_data", lambda: merge_data(report_df.copy(), portal_df.copy())),
+        ("normalize_timestamp", lambda: normalize_timestamp(portal_df, "Log Date (Raw)")),
+        ("split_gsm_info_column", lambda: split_gsm_info_column(merged.copy())),
+        ("filter_columns", lambda: filter_columns(split.copy())),
+        ("sort_by_timestamp", lambda: sort_by_timestamp(filtered.copy())),
+        ("add_time_difference_column", lambda: tester.add_time_difference_column(ordered)),
+    ]
+    # Artımlı değerlendirme: geçmişin %99'u önceden işlenmiş, sadece son %1 ekleniyor
+    history = tested.sort_values("LogDate", kind="stable")
+    split_at = len(history) - max(1, len(history) // 100)
+    with redirect_stdout(io.StringIO()):
+        accumulator = TestAccumulator(tester=tester)
+        accumulator.append(history.iloc[:split_at])
+    new_rows = history.iloc[split_at:]
+    cases.append(("TestAccumulator.append (1% new rows)", lambda: copy.deepcopy(accumulator).append(new_rows)))
+
+    for name in sorted(dir(tester)):
+        if name.startswith("filter_"):
+            method = getattr(tester, name)
+            cases.append((f"DataTests.{name}", lambda method=method: method(tested.copy())))
+    return cases
+
+def measure(func, repeat, memory=True):
+    # Süre ölçümü tracemalloc kapalıyken yapılır; tracemalloc Python döngülerini çok yavaşlatır
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with redirect_stdout(io.StringIO()):
+            func()
+        timings.append(time.perf_counter() - start)
+
+    peak = 0
+    if memory:
+        tracemalloc.start()
+        with redirect_stdout(io.StringIO()):
+            func()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return min(timings), peak
+
+def run(sizes, repeat, only=None, memory=True):
+    results = []
+    for label in sizes:
+        n = SIZES[label]
+        print(f"Status: Generating {label} synthetic rows...")
+        cases = prepare_stages(n)
+        for name, func in cases:
+            if only and not any(key in name for key in only):
+                continue
+            seconds, peak = measure(func, repeat, memory)
+            results.append({"size": label, "rows": n, "name": name, "seconds": seconds, "peak_mb": peak / 2**20})
+            print(f"{label:>5} {name:<42} {seconds * 1000:10.1f} ms {peak / 2**20:10.1f} MB")
+    return results
+
+def compare(results, baseline, tolerance):
+    base = {(item["size"], item["name"]): item for item in baseline["results"]}
+    regressions = []
+    print("\nComparison with baseline:")
+    for item in results:
+        old = base.get((item["size"], item["name"]))
+        if not old:
+            continue
+        ratio = item["seconds"] / old["seconds"] if old["seconds"] else float("inf")
+        memory_ratio = item["peak_mb"] / old["peak_mb"] if old["peak_mb"] and item["peak_mb"] else 1.0
+        flag = ""
+        if ratio > 1 + tolerance or memory_ratio > 1 + tolerance:
+            flag = "REGRESSION"
+            regressions.append(item)
+        print(f"{item['size']:>5} {item['name']:<42} time x{ratio:5.2f}  memory x{memory_ratio:5.2f} {flag}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the data pipeline on synthetic device data.")
+    parser.add_argument("--sizes", nargs="+", default=["10k", "100k"], choices=list(SIZES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", nargs="+", help="Run only benchmarks whose name contains one of these")
+    parser.add_argument("--skip-memory", action="store_true", help="Measure time only (tracemalloc run skipped)")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--baseline", help="Result file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown ratio before flagging")
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.repeat, args.only, memory=not args.skip_memory)
+
+    output = args.output
+    if not output:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"{datetime.now():%Y%m%d_%H%M%S}.json")
+    with open(output, "w", encoding="utf-8") as file:
+        json.dump({
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "machine": platform.platform(),
+            "results": results,
+        }, file, indent=2)
+    print(f"Status: Results saved to {output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            regressions = compare(results, json.load(file), args.tolerance)
+        if regressions:
+            print(f"Error: {len(regressions)} benchmark(s) regressed beyond {args.tolerance:.0%}.")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+import io
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import threading
+from contextlib import redirect_stdout
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+import pandas as pd
+import requests
+
+import fetchScheduler
+from dataFetch import combine_frames, fetch_report_frame, read_portal_excel
+from fetchScheduler import FetchScheduler, RetryPolicy
+from syntheticData import device_frames, report_html, portal_excel_bytes
+
+class FaultConfig:
+    def __init__(self, fail_rate=0.0, error_status=503, latency=0.0, hang_rate=0.0, hang_seconds=35, down=()):
+        self.fail_rate = fail_rate
+        self.error_status = error_status
+        self.latency = latency
+        self.hang_rate = hang_rate
+        self.hang_seconds = hang_seconds
+        self.down = set(down)
+        self.requests = {}
+        self.lock = threading.Lock()
+
+class FaultHandler(BaseHTTPRequestHandler):
+    # /report?deviceId=X -> report.admin tablosu (HTML), /portal?deviceId=X -> portal Excel export'u
+    config = None
+    rows = 2000
+    payloads = {}
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        source = url.path.strip("/")
+        device_id = parse_qs(url.query).get("deviceId", ["0"])[0]
+        config = self.config
+
+        with config.lock:
+            config.requests[source] = config.requests.get(source, 0) + 1
+
+        if source not in ("report", "portal"):
+            self.send_error(404)
+            return
+
+        time.sleep(config.latency)
+        if source in config.down or random.random() < config.fail_rate:
+            self.send_error(config.error_status)
+            return
+        if random.random() < config.hang_rate:
+            time.sleep(config.hang_seconds)
+
+        body = self.payload(source, device_id)
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def payload(self, source, device_id):
+        key = (source, device_id)
+        if key not in self.payloads:
+            report_df, portal_df = device_frames(self.rows, seed=int(device_id) % 1000 if device_id.isdigit() else 0)
+            self.payloads[("report", device_id)] = report_html(report_df).encode("utf-8")
+            self.payloads[("portal", device_id)] = portal_excel_bytes(portal_df)
+        return self.payloads[key]
+
+    def log_message(self, format, *args):
+        pass
+
+def start_server(config, port=0, rows=2000):
+    handler = type("Handler", (FaultHandler,), {"config": config, "rows": rows, "payloads": {}})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def stub_portal_frame(base_url):
+    # Selenium yerine aynı Excel dosyasını doğrudan HTTP ile çeker
+    def fetch(device_id):
+        response = requests.get(f"{base_url}/portal", params={"deviceId": device_id}, timeout=10)
+        response.raise_for_status()
+        return read_portal_excel(response.content)
+    return fetch
+
+def run_demo(base_url, device_ids, attempts, base_delay):
+    scheduler = FetchScheduler(
+        sources={
+            "report": lambda device_id: fetch_report_frame(device_id, f"{base_url}/report"),
+            "portal": stub_portal_frame(base_url),
+        },
+        combine=lambda frames: combine_frames(frames["report"], frames["portal"]),
+        policy=RetryPolicy(attempts=attempts, base_delay=base_delay, max_delay=base_delay * 8),
+    )
+    results = {}
+    for device_id in device_ids:
+        with redirect_stdout(io.StringIO()):
+            df = scheduler.fetch(device_id)
+        results[device_id] = None if df is None else len(df)
+        print(f"{device_id}: {'failed' if df is None else f'{len(df)} rows'}")
+    return scheduler.outcomes, results
+
+def main():
+    parser = argparse.ArgumentParser(description="Fault-injecting stub of the report and portal sources.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--rows", type=int, default=2000, help="Synthetic rows per device")
+    parser.add_argument("--fail-rate", type=float, default=0.3, help="Share of requests answered with --error-status")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every request")
+    parser.add_argument("--hang-rate", type=float, default=0.0, help="Share of requests that hang past the client timeout")
+    parser.add_argument("--down", nargs="*", default=[], choices=["report", "portal"], help="Sources that always fail")
+    parser.add_argument("--demo", type=int, metavar="N", help="Fetch N devices through FetchScheduler and exit")
+    parser.add_argument("--attempts", type=int, default=4)
+    parser.add_argument("--base-delay", type=float, default=0.1)
+    args = parser.parse_args()
+
+    config = FaultConfig(args.fail_rate, args.error_status, args.latency, args.hang_rate, down=args.down)
+    server = start_server(config, 0 if args.demo else args.port, args.rows)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    if not args.demo:
+        print(f"Status: Serving {base_url}/report?deviceId=... and {base_url}/portal?deviceId=... (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            server.shutdown()
+        return
+
+    # Partial cache demo sırasında geçici klasöre yazılır
+    fetchScheduler.PARTIAL_DIR = tempfile.mkdtemp(prefix="partial_")
+    outcomes, _ = run_demo(base_url, [str(60516000 + i) for i in range(args.demo)], args.attempts, args.base_delay)
+    server.shutdown()
+
+    df = pd.DataFrame(outcomes)
+    print("\nOutcomes:")
+    print(df.groupby(["source", "status"]).agg(count=("device_id", "size"), attempts=("attempts", "sum")).to_string())
+    print(f"\nServer requests: {config.requests}")
+
+if __name__ == "__main__":
+    main()
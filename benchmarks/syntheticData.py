@@ -0,0 +1,129 @@
+import io
+
+import numpy as np
+import pandas as pd
+
+OPERATORS = ["Turkcell", "Vodafone TR", "Turk Telekom"]
+TOWERS = [("286", "01", "0FA1", "1A2B"), ("286", "01", "0FA1", "3C4D"), ("286", "02", "1B20", "77E0")]
+ACC_VALUES = [
+    "[OK] X:12 Y:-4 Z:1003",
+    "[OK] X:8 Y:2 Z:998",
+    "[SHOCK] X:310 Y:-122 Z:640 E:12",
+    "[TILT] X:702 Y:15 Z:80 E:3",
+]
+
+def log_times(n, seed=0, start="2024-01-01", gap_ratio=0.02, duplicate_ratio=0.01):
+    # Saatlik kayıtlar; rastgele boşluklar (missed data) ve tekrar eden zamanlar (duplicate) içerir
+    rng = np.random.default_rng(seed)
+    total = int(n / (1 - gap_ratio)) + 2
+    times = pd.date_range(start, periods=total, freq="h") + pd.to_timedelta(rng.integers(0, 120, total), unit="s")
+
+    keep = np.ones(total, dtype=bool)
+    gap_count = int(total * gap_ratio)
+    if gap_count:
+        keep[rng.choice(total, gap_count, replace=False)] = False
+    times = times[keep][:n]
+
+    duplicate_count = int(n * duplicate_ratio)
+    if duplicate_count:
+        positions = rng.choice(np.arange(1, n), duplicate_count, replace=False)
+        values = times.to_numpy().copy()
+        values[positions] = values[positions - 1]
+        times = pd.DatetimeIndex(values)
+    return times
+
+def gsm_info(rng, n):
+    tower_idx = rng.integers(0, len(TOWERS), n)
+    pwr = rng.integers(-112, -55, n)
+    operators = np.array(OPERATORS)[tower_idx % len(OPERATORS)]
+    return [
+        f"{operators[i]},PWR:{pwr[i]}dbm,Id:{TOWERS[t][3]},LAC:{TOWERS[t][2]},TAC:0,"
+        f"MMC:{TOWERS[t][0]},MNC:{TOWERS[t][1]},IMSI:28601{i % 100000:010d},IMEI:35{i % 100000:013d}"
+        for i, t in enumerate(tower_idx)
+    ]
+
+def nmea(rng, n, base, hemisphere):
+    values = base + rng.normal(0, 0.05, n)
+    coords = np.char.add(np.char.mod("%.4f", values), hemisphere)
+    # Konumu olmayan kayıtlar portalde -999 olarak gelir
+    missing = rng.random(n) < 0.05
+    coords[missing] = "-999"
+    return coords
+
+def report_frame(n, seed=0):
+    rng = np.random.default_rng(seed)
+    times = log_times(n, seed)
+    created = times + pd.to_timedelta(rng.integers(5, 900, n), unit="s")
+    return pd.DataFrame({
+        "LogDate": times.strftime("%d/%m/%Y %H:%M:%S"),
+        "CreatedOn": created.strftime("%d/%m/%Y %H:%M:%S"),
+        "Acc": rng.choice(ACC_VALUES, n, p=[0.6, 0.3, 0.05, 0.05]),
+        "Bat": np.char.mod("%.2f", rng.normal(3.85, 0.15, n)),
+        "RC": rng.integers(0, 5, n).astype(str),
+        "WSD": np.char.mod("%.1f", rng.uniform(0, 12, n)),
+        "LI": rng.integers(0, 60000, n).astype(str),
+        "Lat": nmea(rng, n, 4100.1234, "N"),
+        "Lon": nmea(rng, n, 2900.5678, "E"),
+    })
+
+def portal_frame(report_df, seed=0, duplicate_ratio=0.05):
+    # Portal export'u rapordaki kayıtların aynısını (ve bir miktar tekrarını) ham tarih formatıyla içerir
+    rng = np.random.default_rng(seed + 1)
+    n = len(report_df)
+    times = pd.to_datetime(report_df["LogDate"], format="%d/%m/%Y %H:%M:%S")
+
+    df = pd.DataFrame({
+        "Log Date (Raw)": times.dt.strftime("%Y-%m-%d %H:%M:%S"),
+        "Accelerometer": report_df["Acc"].to_numpy(),
+        "DeviceId": "60516000",
+        "Master Device ID": "60516000",
+        "State": "Active",
+        "Status": rng.choice(["2G", "2G", "2G", "Log"], n),
+        "Ver": "1.7.3",
+        "Malfunction": rng.choice(["0_0", "0_0", "0_0", "1_0"], n),
+        "Defect Code": rng.choice([0, 0, 0, 0, 4], n),
+        "CPUTemp": np.round(rng.normal(32, 6, n), 1),
+        "DevInfo": "FW1.7",
+        "GSMInfo": gsm_info(rng, n),
+        "Air Temperature": np.round(rng.normal(15, 6, n), 1),
+        "Air Humidity": np.round(rng.uniform(20, 95, n), 1),
+        "Soil Surface Temperature": np.round(rng.normal(14, 5, n), 1),
+        "Soil Surface Humidity": np.round(rng.uniform(10, 60, n), 1),
+        "Under Soil Moisture(20 cm)": np.round(rng.uniform(10, 45, n), 1),
+        "Under Soil Moisture(40 cm)": np.round(rng.uniform(10, 45, n), 1),
+        "Under Soil Moisture(60 cm)": np.round(rng.uniform(10, 45, n), 1),
+        "Main Board PCB Humidity": np.round(rng.normal(50, 9, n), 1),
+        "Main Board PCB Temperature": np.round(rng.normal(30, 6, n), 1),
+        "Soil Moisture Sensor PCB Humidity": np.round(rng.normal(52, 9, n), 1),
+        "Soil Moisture Sensor PCB Temperature": np.round(rng.normal(18, 5, n), 1),
+        # filter_columns tarafından atılan sütunlar
+        "Battery Voltage (Raw)": report_df["Bat"].to_numpy(),
+        "Row Number": np.arange(n),
+    })
+    for i in range(1, 9):
+        df[f"SC{i}"] = np.round(rng.uniform(0, 100, n), 1)
+
+    duplicate_count = int(n * duplicate_ratio)
+    if duplicate_count:
+        df = pd.concat([df, df.iloc[rng.choice(n, duplicate_count, replace=False)]], ignore_index=True)
+    return df.sample(frac=1, random_state=seed).reset_index(drop=True)
+
+def device_frames(n, seed=0):
+    report_df = report_frame(n, seed)
+    return report_df, portal_frame(report_df, seed)
+
+def report_html(report_df):
+    # report.admin sayfasındaki tablo yapısı: <table id="dataTable"><thead>..<tbody>..
+    buffer = io.StringIO()
+    buffer.write('<html><body><table id="dataTable"><thead><tr>')
+    buffer.write("".join(f"<th>{col}</th>" for col in report_df.columns))
+    buffer.write("</tr></thead><tbody>")
+    for row in report_df.itertuples(index=False, name=None):
+        buffer.write("<tr>" + "".join(f"<td>{value}</td>" for value in row) + "</tr>")
+    buffer.write("</tbody></table></body></html>")
+    return buffer.getvalue()
+
+def portal_excel_bytes(portal_df):
+    buffer = io.BytesIO()
+    portal_df.to_excel(buffer, index=False)
+    return buffer.getvalue()
@@ -0,0 +1,137 @@
+import os
+import re
+
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+# Büyük tablolar bu boyutta parçalar halinde yazılır; bellek kullanımı tablo boyundan bağımsız kalır
+EXPORT_CHUNK_ROWS = 50_000
+
+EXPORT_FORMATS = {
+    ".csv": "CSV (*.csv)",
+    ".parquet": "Parquet (*.parquet)",
+    ".xlsx": "Excel (*.xlsx)",
+}
+
+def ensure_extension(file_path, selected_filter):
+    # Dosya diyaloğu uzantı eklemezse seçili filtrenin uzantısı kullanılır
+    if os.path.splitext(file_path)[1]:
+        return file_path
+    for extension, name in EXPORT_FORMATS.items():
+        if name == selected_filter:
+            return file_path + extension
+    return file_path + ".csv"
+
+def iter_chunks(df, chunk_rows=EXPORT_CHUNK_ROWS):
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+def export_csv(df, file_path, chunk_rows=EXPORT_CHUNK_ROWS):
+    with open(file_path, "w", newline="", encoding="utf-8") as file:
+        if df.empty:
+            df.to_csv(file, index=False)
+            return
+        for i, chunk in enumerate(iter_chunks(df, chunk_rows)):
+            chunk.to_csv(file, index=False, header=(i == 0))
+
+def _arrow_safe(chunk):
+    # Karışık tipli object sütunları Arrow şemasını bozmasın diye metne çevrilir
+    chunk = chunk.copy()
+    for col in chunk.columns:
+        if chunk[col].dtype == object:
+            chunk[col] = chunk[col].astype("string")
+    return chunk
+
+def export_parquet(df, file_path, chunk_rows=EXPORT_CHUNK_ROWS):
+    if pa is None:
+        raise ImportError("Parquet export requires pyarrow (pip install pyarrow).")
+
+    writer = None
+    try:
+        chunks = iter_chunks(df, chunk_rows) if not df.empty else [df]
+        for chunk in chunks:
+            chunk = _arrow_safe(chunk)
+            if writer is None:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                writer = pq.ParquetWriter(file_path, table.schema)
+            else:
+                table = pa.Table.from_pandas(chunk, schema=writer.schema, preserve_index=False)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+def _excel_value(value):
+    if value is None or value is pd.NaT:
+        return None
+    if isinstance(value, float) and np.isnan(value):
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.to_pydatetime()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+def _sheet_name(name, used):
+    # Excel sayfa adı kuralları: en fazla 31 karakter, []:*?/\ yok, benzersiz
+    base = re.sub(r"[\[\]:*?/\\]", "_", str(name))[:31] or "Sheet"
+    sheet = base
+    i = 2
+    while sheet in used:
+        suffix = f" ({i})"
+        sheet = base[:31 - len(suffix)] + suffix
+        i += 1
+    used.add(sheet)
+    return sheet
+
+def export_xlsx(frames, file_path, chunk_rows=EXPORT_CHUNK_ROWS):
+    # write_only modunda satırlar diske akıtılır, çalışma kitabı bellekte tutulmaz
+    workbook = Workbook(write_only=True)
+    used = set()
+    for name, df in frames:
+        sheet = workbook.create_sheet(_sheet_name(name, used))
+        sheet.append([str(col) for col in df.columns])
+        for chunk in iter_chunks(df, chunk_rows):
+            for row in chunk.itertuples(index=False, name=None):
+                sheet.append([_excel_value(value) for value in row])
+    if not used:
+        workbook.create_sheet("Empty")
+    workbook.save(file_path)
+
+def export_frame(df, file_path, sheet_name="Data"):
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension == ".csv":
+        export_csv(df, file_path)
+    elif extension == ".parquet":
+        export_parquet(df, file_path)
+    elif extension == ".xlsx":
+        export_xlsx([(sheet_name, df)], file_path)
+    else:
+        raise ValueError(f"Unsupported export format: '{extension}'")
+    print(f"Status: Exported {len(df)} rows to {file_path}")
+
+def export_frames(frames, file_path):
+    # frames: (isim, DataFrame) çiftleri. Jeneratör olabilir; her tablo yazılıp bırakılır.
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension == ".xlsx":
+        export_xlsx(frames, file_path)
+        print(f"Status: Exported results to {file_path}")
+        return [file_path]
+
+    # CSV/Parquet tek tablo tutar: her tablo <dosya>_<isim>.<uzantı> olarak yazılır
+    base = os.path.splitext(file_path)[0]
+    written = []
+    for name, df in frames:
+        safe_name = re.sub(r"[^\w\- ]", "_", str(name)).strip()
+        target = f"{base}_{safe_name}{extension}"
+        export_frame(df, target)
+        written.append(target)
+    return written
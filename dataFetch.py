@@ -1,32 +1,156 @@
+import io
 import os
 import time
+import shutil
+import tempfile
+import threading
 
+import numpy as np
 import pandas as pd
-import requests
 from bs4 import BeautifulSoup
 from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
 from PyQt5.QtCore import QObject, pyqtSignal
 
+try:
+    import python_calamine  # noqa: F401
+    EXCEL_ENGINE = "calamine"
+except ImportError:
+    EXCEL_ENGINE = "openpyxl"
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
+
+from asyncHttp import HTTP_ERRORS, http_client
+from deviceRegistry import DeviceRegistry
+from fetchScheduler import FetchScheduler
+from fetchTrace import span, start_trace
+from processPool import run_in_process
+from resultCache import result_cache
+
+FILTERED_COLUMNS_ORDER = [
+    "LogDate", "CreatedOn", "TimestampRounded", "DeviceId", "Master Device ID", "State", "Status", "Ver", "Malfunction", "Defect Code", "Bat", "Acc", "AccStatus", "AccX", "AccY", "AccZ", "AccEvent", "CPUTemp", "DevInfo",
+    "LI", "RC", "WSD", "Light Intensity", "Precipitation (mm)", "Wind Speed & Direction", "Lat", "Lon", "Operator", "PWR", "Id", "LAC", "TAC", "MMC", "MNC", "IMSI", "IMEI", "Air Temperature", "Air Humidity",
+    "Soil Surface Temperature", "Soil Surface Humidity", "Under Soil Moisture(20 cm)", "Under Soil Moisture(40 cm)",
+    "Under Soil Moisture(60 cm)", "Under Soil Temperature - Filiz 1.7 - 20 cm - Data",
+    "Under Soil Temperature - Filiz 1.7 - 40 cm", "Under Soil Temperature - Filiz 1.7 - 60 cm - Data", "SC1", "SC2",
+    "SC3", "SC4", "SC5", "SC6", "SC7", "SC8", "Main Board PCB Humidity", "Main Board PCB Temperature",
+    "Soil Moisture Sensor PCB Humidity", "Soil Moisture Sensor PCB Temperature"
+]
+
+# Portal export'undan okunan sütunlar: filter_columns'un tuttukları + merge anahtarları + GSMInfo (split edilir)
+PORTAL_COLUMNS = set(FILTERED_COLUMNS_ORDER) | {"Log Date (Raw)", "Accelerometer", "GSMInfo"}
+
+# Metin olarak karşılaştırılan sütunlar okuma sırasında string olarak alınır (tip tahmini yapılmaz)
+PORTAL_DTYPES = {
+    "Log Date (Raw)": str, "Accelerometer": str, "GSMInfo": str,
+    "State": str, "Status": str, "Malfunction": str, "DevInfo": str,
+}
+
+# Acc alanı "[DURUM] X:.. Y:.. Z:.. E:.." biçimindedir; tek seferde bu sütunlara ayrılır
+ACC_PATTERNS = {
+    "AccStatus": r"^\[([^\]]*)\]",
+    "AccX": r"X:\s*(-?\d+(?:\.\d+)?)",
+    "AccY": r"Y:\s*(-?\d+(?:\.\d+)?)",
+    "AccZ": r"Z:\s*(-?\d+(?:\.\d+)?)",
+    "AccEvent": r"E:\s*(-?\d+)",
+}
+
+# watchdog yoksa indirme klasörü bu aralıkla kontrol edilir; varsa sadece güvenlik amaçlı
+DOWNLOAD_POLL_INTERVAL = 0.05
+DOWNLOAD_WATCH_INTERVAL = 1.0
+
+# Yalın Chrome modu: sayfa DOM hazır olunca döner (eager), görsel/font/stil ve üçüncü taraf istekleri CDP ile
+# engellenir, statik dosyalar kalıcı profilin disk önbelleğinden gelir. Sorun olursa False yapılır.
+LEAN_DRIVER = True
+PORTAL_ORIGIN = "https://portal.doktar.io"
+EXCEL_BUTTON_XPATH = "//button[.//i[contains(@class, 'fa-file-excel')]]"
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg", "*.webp", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot", "*.css",
+    "*google-analytics.com*", "*googletagmanager.com*", "*fonts.googleapis.com*", "*fonts.gstatic.com*",
+    "*doubleclick.net*", "*hotjar.com*", "*facebook.net*", "*clarity.ms*",
+]
+LEAN_CHROME_ARGS = [
+    "--disable-extensions", "--disable-background-networking", "--disable-component-update",
+    "--disable-default-apps", "--disable-sync", "--disable-notifications", "--no-first-run",
+    "--no-default-browser-check", "--mute-audio", "--metrics-recording-only",
+]
+
+# Aynı profil klasörü iki Chrome'da açılamaz; eşzamanlı her fetch boştaki ilk profili alır (0, 1, 2...)
+CHROME_PROFILE_DIR = os.path.join(os.getcwd(), "Device Cache", "chrome_profiles")
+_profiles_in_use = set()
+_profiles_lock = threading.Lock()
+
+def _claim_profile():
+    with _profiles_lock:
+        index = 0
+        while index in _profiles_in_use:
+            index += 1
+        _profiles_in_use.add(index)
+    return index
+
+def _release_profile(index):
+    with _profiles_lock:
+        _profiles_in_use.discard(index)
+
+class _DownloadHandler(FileSystemEventHandler):
+    # Chrome dosyayı .crdownload olarak yazar ve bitince asıl ismine taşır (moved olayı)
+    def __init__(self, extension, event):
+        super().__init__()
+        self.extension = extension
+        self.event = event
+
+    def on_created(self, event):
+        if event.src_path.endswith(self.extension):
+            self.event.set()
+
+    def on_moved(self, event):
+        if event.dest_path.endswith(self.extension):
+            self.event.set()
+
 class Portal_dataFetch:
-    def __init__(self, email, password, download_dir="temps", headless=True):
+    def __init__(self, email, password, download_dir="temps", headless=True, lean=LEAN_DRIVER):
         self.email = email
         self.password = password
-        self.download_path = os.path.join(os.getcwd(), download_dir)
-        os.makedirs(self.download_path, exist_ok=True)
-        self.driver = self._init_driver(headless)
+        self.lean = lean
+        self.profile = None
+        # Her fetch kendi klasörüne indirir; paralel fetch'ler birbirinin dosyasını görmez/silmez
+        self.download_root = os.path.join(os.getcwd(), download_dir)
+        os.makedirs(self.download_root, exist_ok=True)
+        self.download_path = tempfile.mkdtemp(prefix="fetch_", dir=self.download_root)
+        self.download_event = threading.Event()
+        self.observer = None
+        try:
+            with span("portal.chrome_start", headless=headless, lean=lean):
+                self.driver = self._init_driver(headless)
+        except Exception:
+            self._release_profile()
+            shutil.rmtree(self.download_path, ignore_errors=True)
+            raise
         self.wait = WebDriverWait(self.driver, 15)
-        print(f"Status: Initialized Portal dataFetch. headless={headless}, download:{self.download_path}")
+        print(f"Status: Initialized Portal dataFetch. headless={headless}, lean={lean}, download:{self.download_path}")
 
-    def _init_driver(self, headless):
+    def _chrome_options(self, headless, profile_path=None):
         options = webdriver.ChromeOptions()
         if headless:
             options.add_argument("--headless")
             options.add_argument("--disable-gpu")
             options.add_argument("--window-size=1920,1080")
+        if self.lean:
+            options.page_load_strategy = "eager"
+            for argument in LEAN_CHROME_ARGS:
+                options.add_argument(argument)
+        if profile_path:
+            options.add_argument(f"--user-data-dir={profile_path}")
         prefs = {
             "download.default_directory": self.download_path,
             "download.prompt_for_download": False,
@@ -34,49 +158,109 @@ class Portal_dataFetch:
             "safebrowsing.enabled": True
         }
         options.add_experimental_option("prefs", prefs)
-        print("Status: Chrome driver initialized.")
-        return webdriver.Chrome(options=options)
+        return options
+
+    def _init_driver(self, headless):
+        if not self.lean:
+            print("Status: Chrome driver initialized.")
+            return webdriver.Chrome(options=self._chrome_options(headless))
+
+        self.profile = _claim_profile()
+        profile_path = os.path.join(CHROME_PROFILE_DIR, str(self.profile))
+        try:
+            driver = webdriver.Chrome(options=self._chrome_options(headless, profile_path))
+        except WebDriverException as e:
+            # Profil başka bir uygulama örneğinde açık olabilir; geçici profille devam edilir
+            print(f"Warning: Chrome profile {profile_path} unavailable, using a temporary profile - {e.msg}")
+            self._release_profile()
+            driver = webdriver.Chrome(options=self._chrome_options(headless))
+
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+        except WebDriverException as e:
+            print(f"Warning: Could not block static requests - {e.msg}")
+        print(f"Status: Chrome driver initialized (lean, profile {self.profile}).")
+        return driver
+
+    def _release_profile(self):
+        if self.profile is not None:
+            _release_profile(self.profile)
+            self.profile = None
+
+    def _clear_session(self):
+        # Kalıcı profilde önceki oturumun çerezleri/token'ı kalır; HTTP önbelleği korunur, oturum verisi silinir
+        try:
+            self.driver.execute_cdp_cmd("Storage.clearDataForOrigin", {
+                "origin": PORTAL_ORIGIN,
+                "storageTypes": "cookies,local_storage,session_storage,indexeddb",
+            })
+        except WebDriverException as e:
+            print(f"Warning: Could not clear portal session data - {e.msg}")
 
     def login(self):
-        print("Status: Navigating to login page...")
-        self.driver.get("https://portal.doktar.io/auth/login")
-        self.wait.until(EC.presence_of_element_located((By.ID, "input-email")))
-        self.driver.find_element(By.ID, "input-email").send_keys(self.email)
-        self.driver.find_element(By.ID, "input-password").send_keys(self.password)
-        print("Status: Submitting login form...")
-        self.driver.find_element(
-            By.CSS_SELECTOR,
-            "button.appearance-filled.full-width.size-large.status-primary"
-        ).click()
-        self.wait.until(EC.url_contains("/pages"))
-        print("Status: Logged into portal.")
+        with span("portal.login"):
+            if self.profile is not None:
+                self._clear_session()
+            print("Status: Navigating to login page...")
+            self.driver.get(f"{PORTAL_ORIGIN}/auth/login")
+            self.wait.until(EC.presence_of_element_located((By.ID, "input-email")))
+            self.driver.find_element(By.ID, "input-email").send_keys(self.email)
+            self.driver.find_element(By.ID, "input-password").send_keys(self.password)
+            print("Status: Submitting login form...")
+            self.driver.find_element(
+                By.CSS_SELECTOR,
+                "button.appearance-filled.full-width.size-large.status-primary"
+            ).click()
+            self.wait.until(EC.url_contains("/pages"))
+            print("Status: Logged into portal.")
 
     def go_to_device_logs(self, device_id):
-        url = f"https://portal.doktar.io/pages/filiz/{device_id}/filizLogList/2"
+        url = f"{PORTAL_ORIGIN}/pages/filiz/{device_id}/filizLogList/2"
         print(f"Status: Navigating to device log page: {url}")
-        self.driver.get(url)
-        self.wait.until(EC.invisibility_of_element_located((By.CSS_SELECTOR, "nb-spinner")))
+        with span("portal.device_logs", device_id=device_id):
+            self.driver.get(url)
+            # Eager modda get() DOM hazır olunca döner; spinner henüz eklenmemiş olabilir, önce Excel butonu beklenir
+            self.wait.until(EC.presence_of_element_located((By.XPATH, EXCEL_BUTTON_XPATH)))
+            self.wait.until(EC.invisibility_of_element_located((By.CSS_SELECTOR, "nb-spinner")))
         print("Status: Portal page loaded.")
 
+    def _watch_downloads(self, extension=".xlsx"):
+        if Observer is None or self.observer is not None:
+            return
+        try:
+            self.observer = Observer()
+            self.observer.schedule(_DownloadHandler(extension, self.download_event), self.download_path)
+            self.observer.start()
+        except Exception as e:
+            print(f"Warning: Download watcher unavailable, polling instead - {e}")
+            self.observer = None
+
     def download_excel(self):
+        self._watch_downloads()
         print("Status: Looking for Excel button...")
-        excel_button = self.driver.find_element(
-            By.XPATH, "//button[.//i[contains(@class, 'fa-file-excel')]]"
-        )
+        excel_button = self.driver.find_element(By.XPATH, EXCEL_BUTTON_XPATH)
         self.driver.execute_script("arguments[0].click();", excel_button)
         print("Status: Excel download triggered.")
 
     def _get_downloaded_file(self, extension=".xlsx", wait_timeout=30):
         print(f"Status: Waiting for Excel file download... (timeout = {wait_timeout}s)")
-        start_time = time.time()
-        while time.time() - start_time < wait_timeout:
-            files = [f for f in os.listdir(self.download_path) if f.endswith(extension)]
-            if len(files) == 1:
-                full_path = os.path.join(self.download_path, files[0])
-                if not os.path.exists(full_path + ".crdownload"):
+        with span("portal.download_wait", timeout=wait_timeout) as download_span:
+            interval = DOWNLOAD_WATCH_INTERVAL if self.observer is not None else DOWNLOAD_POLL_INTERVAL
+            download_span.set(watcher="watchdog" if self.observer is not None else "poll")
+            deadline = time.time() + wait_timeout
+            while time.time() < deadline:
+                files = os.listdir(self.download_path)
+                completed = [f for f in files if f.endswith(extension)]
+                if completed and not any(f.endswith(".crdownload") for f in files):
+                    full_path = os.path.join(self.download_path, completed[0])
+                    download_span.set(bytes=os.path.getsize(full_path))
                     print(f"Status: Excel file downloaded: {full_path}")
                     return full_path
-            time.sleep(0.5)
+                # Dosya olayı gelince hemen uyanır, gelmezse interval sonunda tekrar bakar
+                self.download_event.wait(interval)
+                self.download_event.clear()
+            download_span.set(error="timeout")
         print("Warning: Download timeout or file not completed.")
         return None
 
@@ -94,19 +278,16 @@ class Portal_dataFetch:
         if file_path and os.path.exists(file_path):
             print(f"Status: Reading downloaded Excel file: {file_path}")
             try:
-                df = pd.read_excel(file_path)
+                with open(file_path, "rb") as file:
+                    data = file.read()
+                with span("portal.read_excel", file_bytes=len(data), engine=EXCEL_ENGINE) as read_span:
+                    df = run_in_process(read_portal_excel, data)
+                    read_span.set_frame(df)
                 print(f"Status: Excel data loaded into DataFrame. Shape: {df.shape}")
             except Exception as e:
                 print(f"Error: Failed to read Excel file - {e}")
                 df = pd.DataFrame()
 
-            # Klasör temizliği
-            for f in os.listdir(self.download_path):
-                try:
-                    os.remove(os.path.join(self.download_path, f))
-                except Exception as e:
-                    print(f"Warning: Could not remove file {f} - {e}")
-
             return df
         else:
             print("Error: No Excel file found after download.")
@@ -114,8 +295,32 @@ class Portal_dataFetch:
             return None  # veya return pd.DataFrame() dersen uygulama çökmez
 
     def close(self):
-        self.driver.quit()
-        print("Status: Chrome driver closed.")
+        # Chrome çöktükten sonra quit() hata fırlatabilir; profil slotu, izleyici thread ve klasör yine bırakılır
+        try:
+            self.driver.quit()
+            print("Status: Chrome driver closed.")
+        except Exception as e:
+            # İndirilmiş veri kapanış hatası yüzünden kaybedilmez
+            print(f"Warning: Chrome driver did not quit cleanly - {e}")
+        finally:
+            self._release_profile()
+
+            if self.observer is not None:
+                self.observer.stop()
+                self.observer.join()
+                self.observer = None
+
+            # Klasör temizliği: sadece bu fetch'in klasörü silinir
+            shutil.rmtree(self.download_path, ignore_errors=True)
+
+def read_portal_excel(data, columns=PORTAL_COLUMNS, dtypes=PORTAL_DTYPES):
+    # Bellekteki byte'lardan okunur; kullanılmayan sütunlar DataFrame'e hiç alınmaz
+    return pd.read_excel(
+        io.BytesIO(data),
+        engine=EXCEL_ENGINE,
+        usecols=lambda col: col in columns,
+        dtype=dtypes
+    )
 
 class Report_dataFetch:
     def __init__(self, base_url="https://report.admin.doktarim.com/sensor/values/by/device/id"):
@@ -125,41 +330,57 @@ class Report_dataFetch:
         try:
             url = f"{self.base_url}?deviceId={device_id}"
             print(f"Status: Fetching report HTML data from: {url}")
-            response = requests.get(url, timeout=30)
+            with span("report.http", device_id=device_id) as http_span:
+                response = http_client().fetch(url, timeout=30)
+                http_span.set(status=response.status, bytes=len(response.body), cache=response.from_cache or "miss")
 
-            if response.status_code != 200:
-                print(f"Error: HTTP {response.status_code}")
+            if response.status != 200:
+                print(f"Error: HTTP {response.status}")
                 return None
 
-            soup = BeautifulSoup(response.text, "html.parser")
-            table = soup.find("table", {"id": "dataTable"})
-
-            if not table:
-                print("Error: HTML table not found.")
-                return None
-
-            headers = [th.text.strip() for th in table.find("thead").find_all("th")]
-            rows = []
-            for tr in table.find("tbody").find_all("tr"):
-                cols = [td.text.strip() for td in tr.find_all("td")]
-                rows.append(cols)
-
-            df = pd.DataFrame(rows, columns=headers)
+            # Gövde son fetch ile aynıysa (304 veya aynı içerik) HTML tekrar ayrıştırılmaz
+            digest = response.digest()
+            cached = result_cache().get("report_html", str(device_id))
+            if cached is not None and cached[0] == digest:
+                print("Status: Report HTML unchanged since last fetch, parsing skipped.")
+                return cached[1].copy(deep=False)
+
+            with span("report.parse_html") as parse_span:
+                df = run_in_process(parse_report_html, response.text())
+                if df is None:
+                    return None
+                parse_span.set_frame(df)
+            result_cache().put("report_html", str(device_id), (digest, df))
             print("Status: Report data parsed.")
-
-            keep_columns = ["LogDate", "CreatedOn", "Acc", "Bat", "RC", "WSD", "LI", "Lat", "Lon"]
-            df = df[[col for col in keep_columns if col in df.columns]]
-
             print("Status: Columns removed.")
-            return df
+            return df.copy(deep=False)
 
-        except requests.exceptions.RequestException as e:
+        except HTTP_ERRORS as e:
             print(f"Network error: {e}")
         except Exception as e:
             print(f"Unexpected error while parsing report: {e}")
 
         return None  # Her durumda fallback
 
+def parse_report_html(html):
+    # Worker process içinde çalışır: BeautifulSoup ayrıştırması GIL'i GUI sürecinde tutmaz
+    soup = BeautifulSoup(html, "html.parser")
+    table = soup.find("table", {"id": "dataTable"})
+
+    if not table:
+        print("Error: HTML table not found.")
+        return None
+
+    headers = [th.text.strip() for th in table.find("thead").find_all("th")]
+    rows = []
+    for tr in table.find("tbody").find_all("tr"):
+        cols = [td.text.strip() for td in tr.find_all("td")]
+        rows.append(cols)
+
+    df = pd.DataFrame(rows, columns=headers)
+    keep_columns = ["LogDate", "CreatedOn", "Acc", "Bat", "RC", "WSD", "LI", "Lat", "Lon"]
+    return df[[col for col in keep_columns if col in df.columns]]
+
 class FetchWorker(QObject):
     finished = pyqtSignal(object)
     error = pyqtSignal(str)
@@ -177,34 +398,63 @@ class FetchWorker(QObject):
         except Exception as e:
             self.error.emit(str(e))
 
-def datafetch(device_id, email, password, silent=True):
+def datafetch(device_id, email, password, silent=True, scheduler=None):
+    with start_trace("fetch", save=True, device_id=device_id) as trace:
+        scheduler = scheduler or build_fetch_scheduler(email, password, silent, registry=DeviceRegistry())
+        df = scheduler.fetch(device_id)
+        trace.set_frame(df)
+    return df
+
+def build_fetch_scheduler(email, password, silent=True, registry=None, policy=None, report_url=None):
+    # Rapor (tek HTTP isteği) önce çekilir; portal tekrar denenirken rapor sonucu partial cache'te bekler
+    return FetchScheduler(
+        sources={
+            "report": lambda device_id: fetch_report_frame(device_id, report_url),
+            "portal": lambda device_id: fetch_portal_frame(device_id, email, password, silent),
+        },
+        combine=lambda frames: combine_frames(frames["report"], frames["portal"]),
+        policy=policy,
+        registry=registry
+    )
+
+def fetch_portal_frame(device_id, email, password, silent=True):
     print(f"Status: Fetching portal data for device {device_id}...")
-    try:
+    with span("portal"):
         portal_client = Portal_dataFetch(email=email, password=password, headless=silent)
         try:
-            portal_df = portal_client.fetch_device_data(str(device_id))
+            return portal_client.fetch_device_data(str(device_id))
         finally:
             portal_client.close()
-    except Exception as e:
-        print(f"Error: Failed to fetch portal data - {e}")
-        return None
 
+def fetch_report_frame(device_id, report_url=None):
     print("Status: Fetching report data...")
-    try:
-        report_fetcher = Report_dataFetch()
+    with span("report"):
+        report_fetcher = Report_dataFetch(report_url) if report_url else Report_dataFetch()
         report_df = report_fetcher.fetch_table_data(device_id)
+    if report_df is not None:
         print(f"Status: Report data shape: {report_df.shape}")
-    except Exception as e:
-        print(f"Error: Failed to fetch report data - {e}")
+    return report_df
+
+def combine_frames(report_df, portal_df):
+    # Birleştirme ve temizlik (merge, GSMInfo split, sıralama) worker process'te yapılır
+    if portal_df is None or report_df is None:
+        print("Error: One of the data sources returned None.")
         return None
+    with span("process_frames") as stage:
+        merged_df = run_in_process(process_frames, report_df, portal_df)
+        stage.set_frame(merged_df)
+    return merged_df
 
+def process_frames(report_df, portal_df):
     if portal_df is None or report_df is None:
         print("Error: One of the data sources returned None.")
         return None
 
     print("Status: Merging data...")
     try:
-        merged_df = merge_data(report_df, portal_df)
+        with span("merge_data") as stage:
+            merged_df = merge_data(report_df, portal_df)
+            stage.set_frame(merged_df)
         if merged_df is None or merged_df.empty:
             print("Warning: No data after merging.")
             return None
@@ -215,9 +465,18 @@ def datafetch(device_id, email, password, silent=True):
 
     print("Status: Cleaning and sorting data...")
     try:
-        merged_df = split_gsm_info_column(merged_df)
-        merged_df = filter_columns(merged_df)
-        merged_df = sort_by_timestamp(merged_df)
+        with span("parse_acc_column") as stage:
+            merged_df = parse_acc_column(merged_df)
+            stage.set_frame(merged_df)
+        with span("split_gsm_info_column") as stage:
+            merged_df = split_gsm_info_column(merged_df)
+            stage.set_frame(merged_df)
+        with span("filter_columns") as stage:
+            merged_df = filter_columns(merged_df)
+            stage.set_frame(merged_df)
+        with span("sort_by_timestamp") as stage:
+            merged_df = sort_by_timestamp(merged_df)
+            stage.set_frame(merged_df)
     except Exception as e:
         print(f"Error during cleaning/sorting - {e}")
         return None
@@ -249,9 +508,9 @@ def merge_data(report_df, portal_df):
         #portal_df["merge_key"] += pd.Timedelta(hours=2)
         #report_df["merge_key"] += pd.Timedelta(hours=2)
 
-        # Accelerometreyi eşleşme sütunu olarak kullan
-        portal_df["acc_match"] = portal_df[portal_acc_col].astype(str).str.strip()
-        report_df["acc_match"] = report_df[report_acc_col].astype(str).str.strip()
+        # Accelerometreyi eşleşme sütunu olarak kullan (metin yerine 64-bit hash ile karşılaştırılır)
+        portal_df["acc_match"] = acc_hash(portal_df[portal_acc_col])
+        report_df["acc_match"] = acc_hash(report_df[report_acc_col])
 
         # Merge sırasında duplicate olanlar tek hale gelsin. Zaten tamamen aynı veriler.
         portal_df_dedup = portal_df.drop_duplicates(subset=["merge_key", "acc_match"])
@@ -278,6 +537,27 @@ def merge_data(report_df, portal_df):
         print(f"Error: Error during merge: {e}")
         return None
 
+def _factorize_acc(series):
+    # Acc değerleri çok tekrar eder: metin işlemleri sadece farklı değerler üzerinde yapılır, sonra kodlarla yayılır
+    codes, uniques = pd.factorize(series, use_na_sentinel=False)
+    return codes, pd.Index(uniques).astype(str).str.strip()
+
+def acc_hash(series):
+    codes, uniques = _factorize_acc(series)
+    return pd.util.hash_array(uniques.to_numpy(dtype=object))[codes]
+
+def parse_acc_column(df, column_name="Acc"):
+    if column_name not in df.columns:
+        return df
+
+    codes, uniques = _factorize_acc(df[column_name])
+    for col, pattern in ACC_PATTERNS.items():
+        values = uniques.str.extract(pattern, expand=False)
+        if col != "AccStatus":
+            values = pd.to_numeric(values, errors="coerce").astype(float)
+        df[col] = values.to_numpy()[codes]
+    return df
+
 def normalize_timestamp(df, column_name, date_format=None):
     try:
         dt = pd.to_datetime(df[column_name], format=date_format, errors='coerce') if date_format \
@@ -327,15 +607,6 @@ def split_gsm_info_column(df, gsm_column="GSMInfo"):
     return df
 
 def filter_columns(df):
-    FILTERED_COLUMNS_ORDER = [
-        "LogDate", "CreatedOn", "TimestampRounded", "DeviceId", "Master Device ID", "State", "Status", "Ver", "Malfunction", "Defect Code", "Bat", "Acc", "CPUTemp", "DevInfo",
-        "LI", "RC", "WSD", "Light Intensity", "Precipitation (mm)", "Wind Speed & Direction", "Lat", "Lon", "Operator", "PWR", "Id", "LAC", "TAC", "MMC", "MNC", "IMSI", "IMEI", "Air Temperature", "Air Humidity",
-        "Soil Surface Temperature", "Soil Surface Humidity", "Under Soil Moisture(20 cm)", "Under Soil Moisture(40 cm)",
-        "Under Soil Moisture(60 cm)", "Under Soil Temperature - Filiz 1.7 - 20 cm - Data",
-        "Under Soil Temperature - Filiz 1.7 - 40 cm", "Under Soil Temperature - Filiz 1.7 - 60 cm - Data", "SC1", "SC2",
-        "SC3", "SC4", "SC5", "SC6", "SC7", "SC8", "Main Board PCB Humidity", "Main Board PCB Temperature",
-        "Soil Moisture Sensor PCB Humidity", "Soil Moisture Sensor PCB Temperature"
-    ]
 
     # Silinecek sütunları bul
     columns_to_drop = [col for col in df.columns if col not in FILTERED_COLUMNS_ORDER]
@@ -355,14 +626,135 @@ def filter_columns(df):
     print("Status: Unwanted columns dropped, reordered, and LogDate adjusted.")
     return df
 
+def _timestamp_values(df, column_name):
+    # Sütunun kendi biriminde (s/ms/us/ns) int64 görünümü; kopya oluşturmaz
+    values = df[column_name].to_numpy()
+    if values.dtype.kind != "M":
+        values = df[column_name].to_numpy(dtype="datetime64[ns]")
+    return values.view("int64"), values.dtype
+
+def _timestamp_bound(value, dtype):
+    return int(np.datetime64(pd.Timestamp(value)).astype(dtype).astype("int64"))
+
+def timestamp_order(df, column_name="LogDate"):
+    # True: artan, False: azalan, None: sıralı değil. NaT'ler sort_values gibi sonda olmalıdır.
+    # Sıralama bilgisi df.attrs'ta tutulmaz: attrs iloc/take/başka sütuna göre sıralamada da taşınır ve
+    # ortası karışmış çerçeveyi sıralı gösterir. Tek geçişlik O(n) kontrol ikili aramadan önce her seferinde yapılır.
+    if column_name not in df.columns or not pd.api.types.is_datetime64_any_dtype(df[column_name]):
+        return None
+    values, _ = _timestamp_values(df, column_name)
+    nat = values == np.iinfo(np.int64).min
+    valid = len(values) - int(nat.sum())
+    if not nat[valid:].all():
+        return None
+    diffs = np.diff(values[:valid])
+    for ascending in (False, True):
+        if (diffs >= 0).all() if ascending else (diffs <= 0).all():
+            return ascending
+    return None
+
 def sort_by_timestamp(df, column_name="LogDate", ascending=False):
     if column_name in df.columns:
         try:
-            df.loc[:, column_name] = pd.to_datetime(df[column_name], errors="coerce", dayfirst=True)
-            df = df.sort_values(column_name, ascending=ascending)
+            if not pd.api.types.is_datetime64_any_dtype(df[column_name]):
+                df[column_name] = pd.to_datetime(df[column_name], errors="coerce", dayfirst=True)
+            # Çoğu zaman veri zaten sıralıdır (önbellek, birleştirilmiş fetch); tekrar sıralanmaz
+            if timestamp_order(df, column_name) != ascending:
+                # stable: eşit zamanlı satırların sırası belirli kalır (TestAccumulator aynı sırayı kurar)
+                df = df.sort_values(column_name, ascending=ascending, kind="stable")
           #  print(f"Status: '{column_name}' sorted ({'ascending' if ascending else 'descending'}).")
         except Exception as e:
             print(f"Warning: Could not sort by '{column_name}': {e}")
     else:
         print(f"Warning: '{column_name}' column not found for sorting.")
-    return df
\ No newline at end of file
+    return df
+
+def slice_by_date_range(df, start_date=None, end_date=None, column_name="LogDate", ascending=False):
+    # Sıralı çerçevede ikili arama (O(log n)); iloc aralığı kopya değil görünüm döner
+    if start_date is None and end_date is None:
+        return df
+    values, dtype = _timestamp_values(df, column_name)
+    # NaT (int64 minimum) sıralı çerçevede sondadır
+    valid = len(values) - int(np.count_nonzero(values == np.iinfo(np.int64).min))
+    values = values[:valid] if ascending else values[:valid][::-1]
+
+    low = 0 if start_date is None else np.searchsorted(values, _timestamp_bound(start_date, dtype), side="left")
+    high = valid if end_date is None else np.searchsorted(values, _timestamp_bound(end_date, dtype), side="right")
+    if high <= low:
+        return df.iloc[0:0]
+    if ascending:
+        return df.iloc[low:high]
+    return df.iloc[valid - high:valid - low]
+
+def filter_by_date_range(df, start_date=None, end_date=None, column_name="LogDate"):
+    if not pd.api.types.is_datetime64_any_dtype(df[column_name]):
+        df[column_name] = pd.to_datetime(df[column_name], errors="coerce")
+
+    # End Date filtresi (2000-01-01 = .drep içinde bitiş tarihi yok)
+    if end_date is not None and str(end_date) == "2000-01-01 00:00:00":
+        end_date = None
+
+    ascending = timestamp_order(df, column_name)
+    if ascending is not None:
+        return slice_by_date_range(df, start_date, end_date, column_name, ascending)
+
+    # Start Date filtresi
+    if start_date is not None:
+        df = df[df[column_name] >= start_date]
+
+    if end_date is not None:
+        df = df[df[column_name] <= end_date]
+
+    return df
+
+CACHE_DIR = os.path.join(os.getcwd(), "Device Cache")
+
+def cache_path(device_id):
+    return os.path.join(CACHE_DIR, f"{device_id}.pkl")
+
+def save_cached_frame(device_id, df):
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        df.to_pickle(cache_path(device_id))
+        print(f"Status: Cached {len(df)} rows for device {device_id}.")
+    except Exception as e:
+        print(f"Warning: Could not cache data for device {device_id} - {e}")
+
+def load_cached_frame(device_id):
+    path = cache_path(device_id)
+    if not os.path.exists(path):
+        return None
+    try:
+        df = pd.read_pickle(path)
+    except Exception as e:
+        print(f"Warning: Could not read cached data for device {device_id} - {e}")
+        return None
+    # Eski önbellek dosyalarında ayrıştırılmış Acc sütunları yoktur
+    if "Acc" in df.columns and "AccStatus" not in df.columns:
+        df = parse_acc_column(df)
+    return df
+
+def merge_new_rows(cached_df, fetched_df, column_name="LogDate"):
+    # Önbellekteki en yeni kayıttan (high-water mark) sonraki satırlar eklenir; eski satırlar tekrar işlenmez
+    if cached_df is None or cached_df.empty:
+        return fetched_df, fetched_df
+    if fetched_df is None or fetched_df.empty:
+        return cached_df, fetched_df.iloc[0:0] if fetched_df is not None else cached_df.iloc[0:0]
+
+    high_water = pd.to_datetime(cached_df[column_name], errors="coerce").max()
+    new_rows = fetched_df[pd.to_datetime(fetched_df[column_name], errors="coerce") > high_water]
+    if new_rows.empty:
+        return cached_df, new_rows
+
+    combined = sort_by_timestamp(pd.concat([new_rows, cached_df], ignore_index=True), column_name)
+    return combined, new_rows
+
+def fetch_metadata(df, column_name="LogDate"):
+    # .drep [INFO] bölümüne yazılan fetch bilgileri (son fetch zamanı, en yeni kayıt, satır sayısı)
+    metadata = {
+        "lastFetch": pd.Timestamp.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "lastRowCount": str(len(df)),
+    }
+    if column_name in df.columns and not df.empty:
+        metadata["lastLogDate"] = pd.to_datetime(df[column_name]).max().strftime("%Y-%m-%d %H:%M:%S")
+    return metadata
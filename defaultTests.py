@@ -1,14 +1,55 @@
+import weakref
+
 import pandas as pd
 
 from PyQt5.QtWidgets import (
     QApplication, QDialog, QVBoxLayout, QHBoxLayout, QLabel, QComboBox,
-    QTableWidget, QTableWidgetItem, QPushButton, QMessageBox
+    QTableWidget, QTableWidgetItem, QPushButton, QMessageBox, QFileDialog
 )
 
 from dataFetch import sort_by_timestamp
+from dataExport import EXPORT_FORMATS, ensure_extension, export_frames
+from fetchTrace import span
+from latencyAnalysis import BURST_GAP_SECONDS, BURST_MIN_ROWS, LATENCY_GROUPS, evaluate_latency
+from processPool import submit
+from resultCache import frame_fingerprint, result_cache
+from sensorHealth import FLATLINE_READINGS, SENSOR_CHANNELS, evaluate_sensor_health
+from testRules import CompiledRuleSet, detect_hardware, load_rules
+
+# Özet tablosunda çalışan testler: (görünen isim, DataTests metodu)
+SUMMARY_TESTS = [
+    ("Low Battery", "filter_battery_data"),
+    ("Low Signal", "filter_signal_data"),
+    ("Defect", "filter_defect_data"),
+    ("Malfunction", "filter_malfunction_data"),
+    ("Missed Data", "filter_missed_data"),
+    ("Log Data", "filter_status_log"),
+    ("Duplicate Data", "filter_duplicate_data"),
+    ("Acc Alert", "filter_acc_alert"),
+    ("Mainboard Internal Humidity", "filter_mainboard_humidity"),
+    ("Soil Sensor Internal Humidity", "filter_soilsensor_humidity"),
+]
+
+# Kural dışı testlerin (Missed/Duplicate Data, Acc Alert) okuduğu sütunlar; kural sütunlarıyla birlikte
+# değerleri önbellek anahtarına girer
+TESTED_COLUMNS = ["LogDate", "TimestampRounded", "DeltaSeconds_TS", "Status", "AccStatus"]
+
+# Satırları çerçeveden seçilmeyip anahtardaki sütunlardan üretilen testler; sonuç çerçevesi olduğu gibi önbelleğe girer
+GENERATED_ROW_TESTS = {"filter_missed_data"}
+
+SUMMARY_COLUMNS = ["Device ID", "Test", "Error Count", "Total", "Rate"]
+
+def summary_frame(device_id, summary_rows):
+    records = []
+    for name, error_count, total_count in summary_rows:
+        error_rate = f"{(error_count / total_count * 100):.2f}%" if total_count > 0 else "N/A"
+        records.append([device_id, name, error_count, total_count, error_rate])
+    return pd.DataFrame(records, columns=SUMMARY_COLUMNS)
 
 class DefaultTests(QDialog):
-    def __init__(self, tester, df_all, device_id_input, selected_tests=None, parent=None):
+    def __init__(self, tester, df_all, device_id_input, selected_tests=None, parent=None, prepared=None):
+        # prepared: prepare_summary sonucu (zaman farkı sütunları eklenmiş çerçeve, özet satırları);
+        # verilirse diyalog hiçbir hesaplamayı GUI thread'inde tekrarlamaz
         super().__init__(parent)
         self.setWindowTitle("Default Tests")
         self.resize(900, 600)
@@ -17,6 +58,15 @@ class DefaultTests(QDialog):
         self.df_all = df_all
         self.device_display = device_id_input
         self.selected_tests = selected_tests
+        self.summary_df = pd.DataFrame(columns=SUMMARY_COLUMNS)
+        self.summary_rows = []
+        if prepared is not None:
+            self.df_tested, self.summary_rows = prepared
+        elif df_all is not None:
+            self.df_tested, _ = tester.add_time_difference_column(df_all)
+            self.summary_rows = tester.run_summary(self.df_tested, selected_tests) if not self.df_tested.empty else []
+        else:
+            self.df_tested = None
 
         self.main_layout = QVBoxLayout()
         self.setLayout(self.main_layout)
@@ -47,82 +97,72 @@ class DefaultTests(QDialog):
 
         # === SUMMARY TARAFI ===
         self.summary_table = QTableWidget()
-        self.summary_table.setColumnCount(5)
-        self.summary_table.setHorizontalHeaderLabels(["Device ID", "Test", "Error Count", "Total", "Rate"])
+        self.summary_table.setColumnCount(len(SUMMARY_COLUMNS))
+        self.summary_table.setHorizontalHeaderLabels(SUMMARY_COLUMNS)
         self.main_layout.addWidget(self.summary_table)
 
+        buttons_layout = QHBoxLayout()
         self.copy_btn = QPushButton("Copy Report")
         self.copy_btn.clicked.connect(self.copy_summary_to_clipboard)
-        self.main_layout.addWidget(self.copy_btn)
+        buttons_layout.addWidget(self.copy_btn)
+
+        self.export_btn = QPushButton("Export Results")
+        self.export_btn.clicked.connect(self.export_results)
+        buttons_layout.addWidget(self.export_btn)
+        self.main_layout.addLayout(buttons_layout)
 
+        self.update_summary_box()
         self.update_table_by_filter()
 
     def update_table_by_filter(self):
-        if self.df_all is None:
+        if self.df_tested is None:
             return
 
-        df = self.df_all.copy()
-        df, _ = self.tester.add_time_difference_column(df)
+        df = self.df_tested
         selection = self.filter_combo.currentText()
 
         test_map = {
-            "Low Battery": self.tester.filter_battery_data,
-            "Low Signal": self.tester.filter_signal_data,
-            "Defect": self.tester.filter_defect_data,
-            "Malfunction": self.tester.filter_malfunction_data,
-            "Missed Data": self.tester.filter_missed_data,
-            "Duplicate Data": self.tester.filter_duplicate_data,
-            "Accelerometer Alert": self.tester.filter_acc_alert,
-            "Log Data": self.tester.filter_status_log,
-            "Mainboard Humidity": self.tester.filter_mainboard_humidity,
-            "Soil Sensor Humidity": self.tester.filter_soilsensor_humidity
+            "Low Battery": "filter_battery_data",
+            "Low Signal": "filter_signal_data",
+            "Defect": "filter_defect_data",
+            "Malfunction": "filter_malfunction_data",
+            "Missed Data": "filter_missed_data",
+            "Duplicate Data": "filter_duplicate_data",
+            "Accelerometer Alert": "filter_acc_alert",
+            "Log Data": "filter_status_log",
+            "Mainboard Humidity": "filter_mainboard_humidity",
+            "Soil Sensor Humidity": "filter_soilsensor_humidity"
         }
 
         if selection in test_map:
-            filtered_df, info_text = test_map[selection](df)
+            filtered_df, info_text = self.tester.run_test(test_map[selection], df)
         else:
             filtered_df = df
             info_text = f"📄 Total: {len(df)} record."
 
         self.info_label.setText(info_text)
         self.update_table(filtered_df)
-        self.update_summary_box(df)
 
-    def update_summary_box(self, df):
-        if df is None or df.empty:
+    def update_summary_box(self):
+        # Özet filtre seçiminden bağımsızdır; diyalog açılırken bir kez doldurulur
+        if not self.summary_rows:
+            self.summary_df = pd.DataFrame(columns=SUMMARY_COLUMNS)
             self.summary_table.setRowCount(0)
             return
 
         device_id = str(self.device_display.text().strip())
-        summary_funcs = [
-            ("Low Battery", self.tester.filter_battery_data),
-            ("Low Signal", self.tester.filter_signal_data),
-            ("Defect", self.tester.filter_defect_data),
-            ("Malfunction", self.tester.filter_malfunction_data),
-            ("Missed Data", self.tester.filter_missed_data),
-            ("Log Data", self.tester.filter_status_log),
-            ("Duplicate Data", self.tester.filter_duplicate_data),
-            ("Acc Alert", self.tester.filter_acc_alert),
-            ("Mainboard Internal Humidity", self.tester.filter_mainboard_humidity),
-            ("Soil Sensor Internal Humidity", self.tester.filter_soilsensor_humidity),
-        ]
-
-        if self.selected_tests:
-            summary_funcs = [item for item in summary_funcs if item[0] in self.selected_tests]
-
-        self.summary_table.setRowCount(len(summary_funcs))
-
-        for i, (name, func) in enumerate(summary_funcs):
-            filtered_df, _ = func(df.copy())
-            error_count = len(filtered_df)
-            total_count = len(df)
-            error_rate = f"{(error_count / total_count * 100):.2f}%" if total_count > 0 else "N/A"
-
-            self.summary_table.setItem(i, 0, QTableWidgetItem(device_id))
-            self.summary_table.setItem(i, 1, QTableWidgetItem(name))
-            self.summary_table.setItem(i, 2, QTableWidgetItem(str(error_count)))
-            self.summary_table.setItem(i, 3, QTableWidgetItem(str(total_count)))
-            self.summary_table.setItem(i, 4, QTableWidgetItem(error_rate))
+        self.summary_df = summary_frame(device_id, self.summary_rows)
+
+        self.summary_table.setRowCount(len(self.summary_df))
+
+        for i, row in enumerate(self.summary_df.itertuples(index=False, name=None)):
+            for j, value in enumerate(row):
+                item = QTableWidgetItem(str(value))
+                if SUMMARY_COLUMNS[j] == "Test":
+                    severity = self.tester.severity(value)
+                    if severity:
+                        item.setToolTip(f"Severity: {severity}")
+                self.summary_table.setItem(i, j, item)
 
     def update_table(self, df):
         self.table.clear()
@@ -136,91 +176,230 @@ class DefaultTests(QDialog):
                 self.table.setItem(i, j, item)
 
     def copy_summary_to_clipboard(self):
-        row_count = self.summary_table.rowCount()
-        col_count = self.summary_table.columnCount()
-
-        if row_count == 0 or col_count == 0:
+        if self.summary_df.empty:
             QMessageBox.warning(self, "Warning", "Summary table is empty.")
             return
 
-        headers = [self.summary_table.horizontalHeaderItem(col).text() for col in range(col_count)]
-        data_lines = ["\t".join(headers)]
-
-        for row in range(row_count):
-            row_data = []
-            for col in range(col_count):
-                item = self.summary_table.item(row, col)
-                text = item.text() if item else ""
-                row_data.append(text)
-            data_lines.append("\t".join(row_data))
-
-        final_text = "\n".join(data_lines)
+        final_text = self.summary_df.to_csv(sep="\t", index=False, lineterminator="\n").rstrip("\n")
 
         clipboard = QApplication.clipboard()
         clipboard.setText(final_text)
 
         QMessageBox.information(self, "Copied", "Summary table copied to clipboard.")
 
+    def export_results(self):
+        if self.df_all is None or self.df_all.empty:
+            QMessageBox.warning(self, "Warning", "There is no data to export.")
+            return
+
+        device_id = str(self.device_display.text().strip())
+        file_path, selected_filter = QFileDialog.getSaveFileName(
+            self,
+            "Export Test Results",
+            f"{device_id}_results.xlsx",
+            ";;".join(EXPORT_FORMATS.values())
+        )
+        if not file_path:
+            return
+
+        try:
+            file_path = ensure_extension(file_path, selected_filter)
+            df = self.df_tested
+
+            def frames():
+                # Test sonuçları tek tek üretilir; bir sonraki yazılırken önceki bellekten düşer
+                yield "Merged", self.df_all
+                yield "Summary", self.summary_df
+                yield from self.tester.iter_test_frames(df, self.selected_tests)
+
+            written = export_frames(frames(), file_path)
+            QMessageBox.information(self, "Exported", "Results exported:\n" + "\n".join(written))
+        except Exception as e:
+            print(f"Error: Export failed - {e}")
+            QMessageBox.critical(self, "Error", f"Failed to export results:\n{e}")
+
+def acc_alert_kinds(df):
+    # Uyarılar AccStatus etiketine göre gruplanır (SHOCK, TILT ...); etiketi olmayanlar "Unknown"
+    if "AccStatus" not in df.columns:
+        return pd.Series(dtype=int)
+    return df["AccStatus"].fillna("Unknown").replace("", "Unknown").value_counts()
+
+def summary_task(tester, df, selected_tests=None):
+    # Worker process içinde çalışır; diyaloğun kullandığı çerçeveyle aynı şekilde hazırlanıp hesaplanır
+    df, _ = tester.add_time_difference_column(df)
+    return tester._run_summary(df, selected_tests)
+
+def prepare_summary(tester, df, selected_tests=None):
+    # QThread worker'da çalışır. Anahtar ham çerçeveden hesaplanır; özet havuzda hesaplanırken diyaloğun
+    # ihtiyaç duyduğu zaman farkı sütunları bu thread'de eklenir. Sonuç DefaultTests(prepared=...) ile verilir.
+    key = tester.summary_key(df, selected_tests)
+    rows = result_cache().get("summary", key)
+    future = submit(summary_task, tester, df, selected_tests) if rows is None and not df.empty else None
+    prepared_df, _ = tester.add_time_difference_column(df)
+    if future is not None:
+        rows = future.result()
+        result_cache().put("summary", key, rows)
+    return prepared_df, rows or []
+
 class DataTests:
+    # Eşiği test_rules.ini'den gelen testler: metod -> kural adı
+    RULE_TESTS = {
+        "filter_battery_data": "Low Battery",
+        "filter_signal_data": "Low Signal",
+        "filter_defect_data": "Defect",
+        "filter_malfunction_data": "Malfunction",
+        "filter_mainboard_humidity": "Mainboard Humidity",
+        "filter_soilsensor_humidity": "Soil Sensor Humidity",
+        "filter_acc_alert": "Accelerometer Alert",
+        "filter_status_log": "Log Data",
+    }
+
+    def __init__(self, rules=None):
+        self.rules = rules if rules is not None else load_rules()
+        # Son parmak izi çerçeve nesnesine bağlı tutulur; özet ve testler aynı çerçeveyi tekrar hash'lemez
+        self._fingerprint = (None, None)
+
+    def __getstate__(self):
+        # weakref pickle edilemez; havuza giden kopya parmak izini gerekirse yeniden hesaplar
+        state = self.__dict__.copy()
+        state["_fingerprint"] = (None, None)
+        return state
+
+    def frame_key(self, df):
+        frame_ref, key = self._fingerprint
+        if frame_ref is not None and frame_ref() is df:
+            return key
+        key = (frame_fingerprint(df, value_columns=TESTED_COLUMNS + self.rules.columns()), detect_hardware(df))
+        self._fingerprint = (weakref.ref(df), key)
+        return key
+
+    def cache_key(self, df, *extra):
+        # Aynı veri + aynı kurallar = aynı sonuç; diyalog tekrar açıldığında veya veri değişmediğinde yeniden hesaplanmaz
+        return self.frame_key(df) + (self.rules.fingerprint(),) + extra
+
+    def summary_key(self, df, selected_tests=None):
+        return self.cache_key(df, tuple(selected_tests or ()))
+
+    def run_summary(self, df, selected_tests=None):
+        key = self.summary_key(df, selected_tests)
+        cached = result_cache().get("summary", key)
+        if cached is not None:
+            print("Status: Test summary loaded from cache.")
+            return cached
+
+        rows = self._run_summary(df, selected_tests)
+        result_cache().put("summary", key, rows)
+        return rows
+
+    def run_test(self, method_name, df):
+        key = self.cache_key(df, method_name)
+        if method_name in GENERATED_ROW_TESTS:
+            return result_cache().memoize("tests", key, lambda: getattr(self, method_name)(df.copy()))
+
+        # Önbellekte sadece hatalı satırların konumları tutulur; satırlar her seferinde güncel çerçeveden alınır,
+        # anahtara girmeyen sütunlar (PWR, Operator ...) değişse de eski içerik gösterilmez
+        positions, info_text = result_cache().memoize("test_rows", key, lambda: self._test_positions(method_name, df))
+        filtered_df = df.iloc[positions].copy()
+        rule_name = self.RULE_TESTS.get(method_name)
+        rule = self.rules.compile(df, [rule_name]).rules.get(rule_name) if rule_name else None
+        if rule is not None and rule.kind == "numeric" and rule.column in filtered_df.columns:
+            filtered_df[rule.column] = pd.to_numeric(filtered_df[rule.column], errors="coerce").astype(float)
+        if "LogDate" in filtered_df.columns and not pd.api.types.is_datetime64_any_dtype(filtered_df["LogDate"]):
+            filtered_df["LogDate"] = pd.to_datetime(filtered_df["LogDate"], errors="coerce", dayfirst=True)
+        return filtered_df, info_text
+
+    def _test_positions(self, method_name, df):
+        filtered_df, info_text = getattr(self, method_name)(df.reset_index(drop=True))
+        return filtered_df.index.to_numpy(dtype=int), info_text
+
+    def sensor_health(self, df, flatline_readings=FLATLINE_READINGS):
+        # Donma / sıçrama / fiziksel sınır testleri tüm kanallarda tek geçişte; sonuç matrisleri büyük, diske yazılmaz
+        key = (frame_fingerprint(df, value_columns=list(SENSOR_CHANNELS)), flatline_readings)
+        return result_cache().memoize(
+            "sensor_health", key, lambda: evaluate_sensor_health(df, flatline_readings=flatline_readings), disk=False
+        )
+
+    def latency(self, df, gap_seconds=BURST_GAP_SECONDS, min_rows=BURST_MIN_ROWS):
+        columns = ["LogDate", "CreatedOn"] + [col for group in LATENCY_GROUPS.values() for col in group]
+        key = (frame_fingerprint(df, value_columns=columns), gap_seconds, min_rows)
+        return result_cache().memoize(
+            "latency", key, lambda: evaluate_latency(df, gap_seconds=gap_seconds, min_rows=min_rows), disk=False
+        )
+
+    def _run_summary(self, df, selected_tests=None):
+        summary_funcs = SUMMARY_TESTS
+        if selected_tests:
+            summary_funcs = [item for item in summary_funcs if item[0] in selected_tests]
+
+        # Kural tabanlı testlerin hepsi tek bir derlenmiş plan ile değerlendirilir
+        rule_names = [self.RULE_TESTS[m] for _, m in summary_funcs if m in self.RULE_TESTS]
+        with span("tests.rules", rules=len(rule_names), rows=len(df)):
+            result = self.rules.compile(df, rule_names).evaluate(df)
+
+        rows = []
+        for name, method_name in summary_funcs:
+            rule_name = self.RULE_TESTS.get(method_name)
+            if rule_name and result.has(rule_name):
+                error_count = result.count(rule_name)
+            else:
+                with span(f"tests.{method_name}") as stage:
+                    filtered_df, _ = self.run_test(method_name, df)
+                    stage.set_frame(filtered_df)
+                error_count = len(filtered_df)
+            rows.append((name, error_count, len(df)))
+        return rows
+
+    def iter_test_frames(self, df, selected_tests=None):
+        for name, method_name in SUMMARY_TESTS:
+            if selected_tests and name not in selected_tests:
+                continue
+            filtered_df, _ = self.run_test(method_name, df)
+            yield name, filtered_df
+
+    def severity(self, test_name):
+        method_name = dict(SUMMARY_TESTS).get(test_name)
+        rule = self.rules.rule(self.RULE_TESTS.get(method_name, test_name))
+        return rule.severity if rule else None
+
+    def _filter_by_rule(self, df, rule_name, label, threshold=None):
+        rule = self.rules.compile(df, [rule_name]).rules.get(rule_name)
+        if rule is None:
+            return df, f"Warning: No rule defined for '{rule_name}'."
+        if rule.column not in df.columns:
+            return df, f"Warning: '{rule.column}' column not found."
+        if threshold is not None:
+            rule.threshold = float(threshold)
+
+        result = CompiledRuleSet([rule]).evaluate(df)
+        if rule.column in result.numeric_columns:
+            df[rule.column] = result.numeric_columns[rule.column]
+        filtered_df = df[result.mask(rule_name)]
+        filtered_df = sort_by_timestamp(filtered_df)
+        return filtered_df, f"{label}: {len(filtered_df)}"
+
     def filter_battery_data(self, df):
         print("Status: Running Battery Test...")
-        if "Bat" not in df.columns:
-            return df, "Warning: 'Bat' column not found."
-        df["Bat"] = pd.to_numeric(df["Bat"], errors='coerce')
-        filtered_df = df[df["Bat"] < 3.60]
-        err_rate = len(filtered_df) / len(df) if len(df) > 0 else 0
-        filtered_df = sort_by_timestamp(filtered_df)
-        return filtered_df, f"Low Battery: {len(filtered_df)}"
+        return self._filter_by_rule(df, "Low Battery", "Low Battery")
 
     def filter_signal_data(self, df):
         print("Status: Running Signal Test...")
-        if "PWR" not in df.columns:
-            return df, "Warning: 'PWR' column not found."
-        filtered_df = df[df["PWR"] < -90]
-        err_rate = len(filtered_df) / len(df) if len(df) > 0 else 0
-        filtered_df = sort_by_timestamp(filtered_df)
-        return filtered_df, f"Low Signal: {len(filtered_df)}"
+        return self._filter_by_rule(df, "Low Signal", "Low Signal")
 
     def filter_defect_data(self, df):
         print("Status: Running Defect Test...")
-        if "Defect Code" not in df.columns:
-            return df, "Warning: 'Defect Code' column not found."
-        df["Defect Code"] = pd.to_numeric(df["Defect Code"], errors="coerce")
-        filtered_df = df[df["Defect Code"] != 0]
-        err_rate = len(filtered_df) / len(df) if len(df) > 0 else 0
-        filtered_df = sort_by_timestamp(filtered_df)
-        return filtered_df, f"Defect: {len(filtered_df)}"
+        return self._filter_by_rule(df, "Defect", "Defect")
 
     def filter_malfunction_data(self, df):
         print("Status: Running Malfunction Test...")
-        if "Malfunction" not in df.columns:
-            return df, "Warning: 'Malfunction' column not found."
-        filtered_df = df[df["Malfunction"] != "0_0"]
-        err_rate = len(filtered_df) / len(df) if len(df) > 0 else 0
-        filtered_df = sort_by_timestamp(filtered_df)
-        return filtered_df, f"Malfunction: {len(filtered_df)}"
+        return self._filter_by_rule(df, "Malfunction", "Malfunction")
 
-    def filter_mainboard_humidity(self, df, threshold=60):
+    def filter_mainboard_humidity(self, df, threshold=None):
         print("Status: Running Mainboard Humidity Test...")
-        col = "Main Board PCB Humidity"
-        if col not in df.columns:
-            return df, f"Warning: '{col}' column not found."
-        df[col] = pd.to_numeric(df[col], errors="coerce")
-        filtered_df = df[df[col] > threshold]
-        err_rate = len(filtered_df) / len(df) if len(df) > 0 else 0
-        filtered_df = sort_by_timestamp(filtered_df)
-        return filtered_df, f"Mainboard Internal Humidity: {len(filtered_df)}"
+        return self._filter_by_rule(df, "Mainboard Humidity", "Mainboard Internal Humidity", threshold)
 
-    def filter_soilsensor_humidity(self, df, threshold=60):
+    def filter_soilsensor_humidity(self, df, threshold=None):
         print("Status: Running Soil Sensor Humidity Test...")
-        col = "Soil Moisture Sensor PCB Humidity"
-        if col not in df.columns:
-            return df, f"Warning: '{col}' column not found."
-        df[col] = pd.to_numeric(df[col], errors="coerce")
-        filtered_df = df[df[col] > threshold]
-        err_rate = len(filtered_df) / len(df) if len(df) > 0 else 0
-        filtered_df = sort_by_timestamp(filtered_df)
-        return filtered_df, f"Soil Sensor Internal Humidity: {len(filtered_df)}"
+        return self._filter_by_rule(df, "Soil Sensor Humidity", "Soil Sensor Internal Humidity", threshold)
 
     def filter_duplicate_data(self, df):
         print("Status: Running Duplicate Data Test...")
@@ -238,8 +417,10 @@ class DataTests:
         err_rate = len(filtered_df) / len(df) if len(df) > 0 else 0
         return filtered_df, f"Duplicated (only duplicates showed): {len(filtered_df)}"
 
-    def filter_missed_data(self, df, threshold_seconds=3600):
+    def filter_missed_data(self, df, threshold_seconds=None):
         print("Status: Running Missed Data Test...")
+        if threshold_seconds is None:
+            threshold_seconds = int(self.rules.threshold("Missed Data", 3600))
         if "DeltaSeconds_TS" not in df.columns:
             df, _ = self.add_time_difference_column(df)
         missed = df[(df["DeltaSeconds_TS"] > threshold_seconds) & (df["Status"].astype(str).str.strip() == "2G")]
@@ -263,29 +444,24 @@ class DataTests:
 
     def filter_acc_alert(self, df):
         print("Status: Running Accelerometer Alert Test...")
-        if "Acc" not in df.columns:
-            return df, "Warning: 'Acc' column not found."
-        filtered_df = df[~df["Acc"].astype(str).str.startswith("[OK]")]
-        err_rate = len(filtered_df) / len(df) if len(df) > 0 else 0
-        filtered_df = sort_by_timestamp(filtered_df)
-        return filtered_df, f"Accelerometer Alert: {len(filtered_df)}"
+        filtered_df, info_text = self._filter_by_rule(df, "Accelerometer Alert", "Accelerometer Alert")
+        kinds = acc_alert_kinds(filtered_df)
+        if not kinds.empty:
+            info_text += " (" + ", ".join(f"{kind}: {count}" for kind, count in kinds.items()) + ")"
+        return filtered_df, info_text
 
     def filter_status_log(self, df):
         print("Status: Running Status Log Test...")
-        if "Status" not in df.columns:
-            return df, "Warning: 'Status' column not found."
-        filtered_df = df[df["Status"].astype(str).str.lower().str.contains("log")]
-        err_rate = len(filtered_df) / len(df) if len(df) > 0 else 0
-        filtered_df = sort_by_timestamp(filtered_df)
-        return filtered_df, f"Log Data: {len(filtered_df)}"
+        return self._filter_by_rule(df, "Log Data", "Log Data")
 
     def add_time_difference_column(self, df):
         print("Status: Calculating time differences...")
-        df = df.copy()
-        if "LogDate" in df.columns:
-            df.loc[:, "LogDate"] = pd.to_datetime(df["LogDate"], errors="coerce")
-            df["DeltaSeconds"] = df["LogDate"].diff().dt.total_seconds().fillna(0).abs().astype(int)
-        if "TimestampRounded" in df.columns:
-            df.loc[:, "TimestampRounded"] = pd.to_datetime(df["TimestampRounded"], errors="coerce")
-            df["DeltaSeconds_TS"] = df["TimestampRounded"].diff().dt.total_seconds().fillna(0).abs().astype(int)
+        with span("tests.add_time_difference_column", rows=len(df)):
+            df = df.copy()
+            if "LogDate" in df.columns:
+                df["LogDate"] = pd.to_datetime(df["LogDate"], errors="coerce")
+                df["DeltaSeconds"] = df["LogDate"].diff().dt.total_seconds().fillna(0).abs().astype(int)
+            if "TimestampRounded" in df.columns:
+                df["TimestampRounded"] = pd.to_datetime(df["TimestampRounded"], errors="coerce")
+                df["DeltaSeconds_TS"] = df["TimestampRounded"].diff().dt.total_seconds().fillna(0).abs().astype(int)
         return df, "Status: DeltaSeconds and DeltaSeconds_TS columns added."
@@ -0,0 +1,323 @@
+import time
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from PyQt5.QtCore import Qt, QObject, QThread, pyqtSignal
+from PyQt5.QtGui import QColor
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QListWidget, QListWidgetItem, QSpinBox, QDoubleSpinBox,
+    QTableWidget, QTableWidgetItem, QPushButton, QMessageBox, QLineEdit
+)
+
+from dataFetch import datafetch, load_cached_frame, merge_new_rows, save_cached_frame
+from deviceRegistry import DeviceRegistry
+from telemetryStore import write_device_partitions
+from testAccumulator import TestAccumulator, load_accumulator, save_accumulator
+from testRules import load_rules
+from defaultTests import DataTests
+
+MONITOR_COLUMNS = ["Device ID", "Last Poll", "New Rows", "Total Rows", "Worst Test", "Worst Error %", "Status"]
+
+class RateLimiter:
+    # Fetch başlangıçları arasında en az min_interval saniye bırakır (portal'a aynı anda yüklenmemek için)
+    def __init__(self, per_minute):
+        self.min_interval = 60.0 / per_minute if per_minute else 0
+        self.next_allowed = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self, stop_event):
+        with self.lock:
+            now = time.monotonic()
+            delay = max(0.0, self.next_allowed - now)
+            self.next_allowed = max(now, self.next_allowed) + self.min_interval
+        return not stop_event.wait(delay) if delay else not stop_event.is_set()
+
+class MonitorWorker(QObject):
+    device_updated = pyqtSignal(dict)
+    progress = pyqtSignal(str)
+    finished = pyqtSignal()
+
+    def __init__(self, devices, email, password, interval_minutes=30, threshold=5.0, max_workers=2, fetches_per_minute=4):
+        super().__init__()
+        self.devices = devices
+        self.email = email
+        self.password = password
+        self.interval = interval_minutes * 60
+        self.threshold = threshold
+        self.max_workers = max_workers
+        self.limiter = RateLimiter(fetches_per_minute)
+        self.stop_event = threading.Event()
+        self.running = set()
+        self.lock = threading.Lock()
+        self.accumulators = {}
+        self.registry = DeviceRegistry()
+
+    def stop(self):
+        self.stop_event.set()
+
+    def run(self):
+        # Cihazlar aralık boyunca eşit yayılır: 60 cihaz / 30 dk -> her 30 saniyede bir cihaz
+        now = time.monotonic()
+        stagger = self.interval / max(len(self.devices), 1)
+        next_due = {device["deviceId"]: now + i * stagger for i, device in enumerate(self.devices)}
+        paths = {device["deviceId"]: device["path"] for device in self.devices}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="monitor") as pool:
+            while not self.stop_event.is_set():
+                now = time.monotonic()
+                for device_id, due in sorted(next_due.items(), key=lambda item: item[1]):
+                    if due > now:
+                        break
+                    with self.lock:
+                        if device_id in self.running:
+                            continue
+                        self.running.add(device_id)
+                    if not self.limiter.wait(self.stop_event):
+                        break
+                    next_due[device_id] = max(due + self.interval, now)
+                    pool.submit(self.poll_device, device_id, paths[device_id])
+                self.stop_event.wait(1.0)
+            pool.shutdown(wait=True, cancel_futures=True)
+
+        self.finished.emit()
+
+    def accumulator(self, device_id, drep_path, cached_df):
+        tester = DataTests(load_rules(drep_path=drep_path))
+        accumulator = self.accumulators.get(device_id) or load_accumulator(device_id)
+        # Yeniden kurulur: ilk kez, kurallar (test_rules.ini / .drep) değiştiyse, sayaçlar önbellekle tutmuyorsa
+        # veya önbellek yoksa (fetch edilen tüm satırlar yeni satır olarak eklenecek, eski sayaçlar çift sayardı)
+        if (accumulator is None or cached_df is None
+                or getattr(accumulator, "rules_fingerprint", None) != tester.rules.fingerprint()
+                or accumulator.total != len(cached_df)):
+            # Önbellekteki tüm geçmiş bir kere işlenir, sonrası sadece yeni satırlar
+            accumulator = TestAccumulator(device_id, tester)
+            accumulator.append(cached_df)
+        self.accumulators[device_id] = accumulator
+        return accumulator
+
+    def poll_device(self, device_id, drep_path):
+        try:
+            self.progress.emit(f"{device_id}: polling...")
+            cached_df = load_cached_frame(device_id)
+            accumulator = self.accumulator(device_id, drep_path, cached_df)
+
+            fetched_df = datafetch(device_id, self.email, self.password)
+            if fetched_df is None or fetched_df.empty:
+                self.device_updated.emit({"Device ID": device_id, "Last Poll": _now(), "Status": "Fetch failed"})
+                return
+
+            combined_df, new_rows = merge_new_rows(cached_df, fetched_df)
+            if not new_rows.empty:
+                save_cached_frame(device_id, combined_df)
+                # Sadece yeni satırların düştüğü aylar yeniden yazılır
+                write_device_partitions(device_id, combined_df, since=pd.to_datetime(new_rows["LogDate"], errors="coerce").min())
+                accumulator.append(new_rows)
+                save_accumulator(accumulator)
+            self.registry.record_fetch(device_id, len(combined_df))
+
+            summary_rows = accumulator.summary_rows()
+            self.registry.record_summary(device_id, summary_rows)
+
+            rates = accumulator.error_rates()
+            worst_test = max(rates, key=rates.get) if rates else ""
+            worst_rate = rates.get(worst_test, 0.0)
+            flagged = worst_rate >= self.threshold
+            if flagged:
+                print(f"Warning: Device {device_id} {worst_test} error rate {worst_rate:.2f}% exceeds {self.threshold:.2f}%")
+
+            self.device_updated.emit({
+                "Device ID": device_id,
+                "Last Poll": _now(),
+                "New Rows": len(new_rows),
+                "Total Rows": accumulator.total,
+                "Worst Test": worst_test,
+                "Worst Error %": round(worst_rate, 2),
+                "Status": "ALERT" if flagged else "OK",
+            })
+        except Exception as e:
+            print(f"Error: Monitoring poll failed for device {device_id} - {e}")
+            self.device_updated.emit({"Device ID": device_id, "Last Poll": _now(), "Status": f"Error: {e}"})
+        finally:
+            with self.lock:
+                self.running.discard(device_id)
+
+def _now():
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+class DeviceMonitor(QDialog):
+    def __init__(self, email=None, password=None, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Device Monitoring")
+        self.resize(950, 600)
+
+        self.email = email
+        self.password = password
+        self.thread = None
+        self.worker = None
+        self.rows = {}
+
+        self.main_layout = QVBoxLayout()
+        self.setLayout(self.main_layout)
+
+        # === İZLEME LİSTESİ ===
+        self.main_layout.addWidget(QLabel("Watch-list:"))
+        self.filter_input = QLineEdit()
+        self.filter_input.setPlaceholderText("Filter by device ID prefix")
+        self.filter_input.textChanged.connect(self.load_devices)
+        self.main_layout.addWidget(self.filter_input)
+
+        self.device_list = QListWidget()
+        self.device_list.setMaximumHeight(150)
+        self.main_layout.addWidget(self.device_list)
+
+        self.registry = DeviceRegistry()
+        self.registry.scan()
+        self.load_devices()
+
+        # === AYARLAR ===
+        settings_layout = QHBoxLayout()
+        settings_layout.addWidget(QLabel("Interval (min):"))
+        self.interval_spin = QSpinBox()
+        self.interval_spin.setRange(1, 24 * 60)
+        self.interval_spin.setValue(30)
+        settings_layout.addWidget(self.interval_spin)
+
+        settings_layout.addWidget(QLabel("Alert Threshold %:"))
+        self.threshold_spin = QDoubleSpinBox()
+        self.threshold_spin.setRange(0, 100)
+        self.threshold_spin.setValue(5.0)
+        settings_layout.addWidget(self.threshold_spin)
+
+        settings_layout.addWidget(QLabel("Parallel Fetches:"))
+        self.workers_spin = QSpinBox()
+        self.workers_spin.setRange(1, 8)
+        self.workers_spin.setValue(2)
+        settings_layout.addWidget(self.workers_spin)
+
+        settings_layout.addWidget(QLabel("Fetches / min:"))
+        self.rate_spin = QSpinBox()
+        self.rate_spin.setRange(1, 60)
+        self.rate_spin.setValue(4)
+        settings_layout.addWidget(self.rate_spin)
+        settings_layout.addStretch()
+
+        self.start_btn = QPushButton("Start")
+        self.start_btn.clicked.connect(self.start_monitoring)
+        settings_layout.addWidget(self.start_btn)
+
+        self.stop_btn = QPushButton("Stop")
+        self.stop_btn.clicked.connect(self.stop_monitoring)
+        self.stop_btn.setEnabled(False)
+        settings_layout.addWidget(self.stop_btn)
+        self.main_layout.addLayout(settings_layout)
+
+        self.status_label = QLabel("Stopped.")
+        self.status_label.setStyleSheet("color: gray; font-weight: bold;")
+        self.main_layout.addWidget(self.status_label)
+
+        # === DURUM TABLOSU ===
+        self.table = QTableWidget(0, len(MONITOR_COLUMNS))
+        self.table.setHorizontalHeaderLabels(MONITOR_COLUMNS)
+        self.main_layout.addWidget(self.table)
+
+    def load_devices(self):
+        checked = {
+            self.device_list.item(i).text()
+            for i in range(self.device_list.count())
+            if self.device_list.item(i).checkState() == Qt.Checked
+        }
+        self.devices = [
+            {"deviceId": row["device_id"], "path": row["path"]}
+            for row in self.registry.search(prefix=self.filter_input.text().strip())
+        ]
+        self.device_list.clear()
+        for device in self.devices:
+            item = QListWidgetItem(device["deviceId"])
+            item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+            item.setCheckState(Qt.Checked if device["deviceId"] in checked else Qt.Unchecked)
+            self.device_list.addItem(item)
+
+    def selected_devices(self):
+        checked = {
+            self.device_list.item(i).text()
+            for i in range(self.device_list.count())
+            if self.device_list.item(i).checkState() == Qt.Checked
+        }
+        return [device for device in self.devices if device["deviceId"] in checked]
+
+    def start_monitoring(self):
+        if not self.email:
+            QMessageBox.warning(self, "Warning", "Portal credentials are not set.")
+            return
+        devices = self.selected_devices()
+        if not devices:
+            QMessageBox.warning(self, "Warning", "Please select at least one device.")
+            return
+
+        self.thread = QThread()
+        self.worker = MonitorWorker(
+            devices,
+            self.email,
+            self.password,
+            interval_minutes=self.interval_spin.value(),
+            threshold=self.threshold_spin.value(),
+            max_workers=self.workers_spin.value(),
+            fetches_per_minute=self.rate_spin.value()
+        )
+        self.worker.moveToThread(self.thread)
+
+        self.thread.started.connect(self.worker.run)
+        self.worker.device_updated.connect(self.on_device_updated)
+        self.worker.progress.connect(self.on_progress)
+        self.worker.finished.connect(self.on_finished)
+
+        self.worker.finished.connect(self.thread.quit)
+        self.worker.finished.connect(self.worker.deleteLater)
+        self.thread.finished.connect(self.thread.deleteLater)
+
+        self.thread.start()
+        self.start_btn.setEnabled(False)
+        self.stop_btn.setEnabled(True)
+        self.status_label.setText(f"Monitoring {len(devices)} devices every {self.interval_spin.value()} min.")
+        print(f"Status: Monitoring started for {len(devices)} devices.")
+
+    def stop_monitoring(self):
+        if self.worker is not None:
+            self.worker.stop()
+            self.stop_btn.setEnabled(False)
+            self.status_label.setText("Stopping after running fetches finish...")
+
+    def on_progress(self, message):
+        self.status_label.setText(message)
+
+    def on_finished(self):
+        self.worker = None
+        self.thread = None
+        self.start_btn.setEnabled(True)
+        self.stop_btn.setEnabled(False)
+        self.status_label.setText("Stopped.")
+        print("Status: Monitoring stopped.")
+
+    def on_device_updated(self, values):
+        device_id = values["Device ID"]
+        if device_id not in self.rows:
+            self.rows[device_id] = self.table.rowCount()
+            self.table.insertRow(self.rows[device_id])
+        row = self.rows[device_id]
+
+        alert = values.get("Status") == "ALERT"
+        for j, col in enumerate(MONITOR_COLUMNS):
+            if col not in values:
+                continue
+            item = QTableWidgetItem(str(values[col]))
+            if alert:
+                item.setBackground(QColor(255, 200, 200))
+            self.table.setItem(row, j, item)
+
+    def closeEvent(self, event):
+        # Pencere kapatılınca izleme de durur
+        self.stop_monitoring()
+        super().closeEvent(event)
@@ -0,0 +1,293 @@
+import os
+import json
+import sqlite3
+import configparser
+from contextlib import contextmanager
+from datetime import datetime
+
+import pandas as pd
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QDoubleSpinBox, QCheckBox,
+    QDateTimeEdit, QTableWidget, QTableWidgetItem, QPushButton, QAbstractItemView
+)
+
+REPORTS_DIR = os.path.join(os.getcwd(), "Device Reports")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS drep_files (
+    path TEXT PRIMARY KEY,
+    device_id TEXT NOT NULL,
+    mtime REAL NOT NULL,
+    start_date TEXT,
+    end_date TEXT,
+    hardware TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_drep_device ON drep_files(device_id);
+CREATE INDEX IF NOT EXISTS idx_drep_start ON drep_files(start_date);
+
+CREATE TABLE IF NOT EXISTS device_stats (
+    device_id TEXT PRIMARY KEY,
+    last_fetch TEXT,
+    row_count INTEGER,
+    error_rate REAL,
+    summary TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_stats_error ON device_stats(error_rate);
+
+CREATE TABLE IF NOT EXISTS fetch_outcomes (
+    device_id TEXT NOT NULL,
+    source TEXT NOT NULL,
+    time TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER,
+    error TEXT,
+    duration_ms REAL
+);
+CREATE INDEX IF NOT EXISTS idx_outcomes_device ON fetch_outcomes(device_id, time);
+"""
+
+class DeviceRegistry:
+    def __init__(self, reports_dir=REPORTS_DIR, db_path=None):
+        self.reports_dir = reports_dir
+        self.db_path = db_path or os.path.join(reports_dir, "registry.sqlite")
+        os.makedirs(reports_dir, exist_ok=True)
+        with self.connect() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def connect(self):
+        # Her çağrı kendi bağlantısını açar; thread'ler ve süreçler arasında paylaşım gerekmez.
+        # sqlite3'ün kendi context manager'ı sadece commit/rollback yapar; bağlantı burada kapatılır
+        # (monitör her poll'da kayıt yazar, açık bağlantılar GC'ye kalmasın)
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        try:
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def scan(self):
+        # Sadece mtime'ı değişen veya yeni olan .drep dosyaları okunur
+        with self.connect() as conn:
+            known = {row["path"]: row["mtime"] for row in conn.execute("SELECT path, mtime FROM drep_files")}
+            seen = set()
+            changed = []
+
+            if os.path.isdir(self.reports_dir):
+                with os.scandir(self.reports_dir) as entries:
+                    for entry in entries:
+                        if not entry.name.endswith(".drep") or not entry.is_file():
+                            continue
+                        path = os.path.abspath(entry.path)
+                        seen.add(path)
+                        mtime = entry.stat().st_mtime
+                        if known.get(path) != mtime:
+                            changed.append((path, mtime))
+
+            rows = []
+            for path, mtime in changed:
+                info = read_drep(path)
+                if info is None:
+                    continue
+                rows.append((path, info["deviceId"], mtime, info["startDate"], info["endDate"], info["hardware"]))
+
+            conn.executemany(
+                """INSERT INTO drep_files (path, device_id, mtime, start_date, end_date, hardware)
+                   VALUES (?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(path) DO UPDATE SET
+                       device_id = excluded.device_id, mtime = excluded.mtime,
+                       start_date = excluded.start_date, end_date = excluded.end_date,
+                       hardware = excluded.hardware""",
+                rows
+            )
+            removed = [(path,) for path in known if path not in seen]
+            conn.executemany("DELETE FROM drep_files WHERE path = ?", removed)
+
+        print(f"Status: Device registry scanned. {len(rows)} updated, {len(removed)} removed, {len(seen)} total.")
+        return len(rows)
+
+    def search(self, prefix="", start_from=None, start_to=None, min_error_rate=None, max_error_rate=None, limit=None):
+        query = """SELECT f.device_id, f.path, f.start_date, f.end_date, f.hardware,
+                          s.last_fetch, s.row_count, s.error_rate
+                   FROM drep_files f LEFT JOIN device_stats s ON s.device_id = f.device_id
+                   WHERE 1 = 1"""
+        params = []
+        if prefix:
+            # Önek araması birincil indeks üzerinde aralık sorgusuna çevrilir
+            query += " AND f.device_id >= ? AND f.device_id < ?"
+            params += [prefix, prefix + "\uffff"]
+        if start_from is not None:
+            query += " AND f.start_date >= ?"
+            params.append(_date_text(start_from))
+        if start_to is not None:
+            query += " AND f.start_date <= ?"
+            params.append(_date_text(start_to))
+        if min_error_rate is not None:
+            query += " AND s.error_rate >= ?"
+            params.append(min_error_rate)
+        if max_error_rate is not None:
+            query += " AND (s.error_rate IS NULL OR s.error_rate <= ?)"
+            params.append(max_error_rate)
+        query += " ORDER BY f.device_id"
+        if limit:
+            query += f" LIMIT {int(limit)}"
+
+        with self.connect() as conn:
+            return [dict(row) for row in conn.execute(query, params)]
+
+    def devices(self):
+        return self.search()
+
+    def path_for(self, device_id):
+        with self.connect() as conn:
+            row = conn.execute("SELECT path FROM drep_files WHERE device_id = ? LIMIT 1", (str(device_id),)).fetchone()
+        return row["path"] if row else None
+
+    def record_fetch(self, device_id, row_count):
+        with self.connect() as conn:
+            conn.execute(
+                """INSERT INTO device_stats (device_id, last_fetch, row_count) VALUES (?, ?, ?)
+                   ON CONFLICT(device_id) DO UPDATE SET last_fetch = excluded.last_fetch, row_count = excluded.row_count""",
+                (str(device_id), datetime.now().strftime("%Y-%m-%d %H:%M:%S"), int(row_count))
+            )
+
+    def record_summary(self, device_id, summary_rows):
+        # error_rate: en kötü testin hata oranı (%). "Herhangi bir testte %X üstü" filtrelemesi için.
+        rates = {name: (errors / total * 100 if total else 0.0) for name, errors, total in summary_rows}
+        worst = max(rates.values()) if rates else None
+        with self.connect() as conn:
+            conn.execute(
+                """INSERT INTO device_stats (device_id, error_rate, summary) VALUES (?, ?, ?)
+                   ON CONFLICT(device_id) DO UPDATE SET error_rate = excluded.error_rate, summary = excluded.summary""",
+                (str(device_id), worst, json.dumps(rates))
+            )
+
+    def record_outcome(self, device_id, source, status, attempts=0, error=None, duration_ms=None):
+        with self.connect() as conn:
+            conn.execute(
+                """INSERT INTO fetch_outcomes (device_id, source, time, status, attempts, error, duration_ms)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                (str(device_id), source, datetime.now().strftime("%Y-%m-%d %H:%M:%S"), status, attempts, error, duration_ms)
+            )
+
+    def fetch_outcomes(self, device_id, limit=20):
+        with self.connect() as conn:
+            rows = conn.execute(
+                "SELECT * FROM fetch_outcomes WHERE device_id = ? ORDER BY time DESC, rowid DESC LIMIT ?",
+                (str(device_id), int(limit))
+            )
+            return [dict(row) for row in rows]
+
+    def summary(self, device_id):
+        with self.connect() as conn:
+            row = conn.execute("SELECT summary FROM device_stats WHERE device_id = ?", (str(device_id),)).fetchone()
+        return json.loads(row["summary"]) if row and row["summary"] else {}
+
+def _date_text(value):
+    return pd.Timestamp(value).strftime("%Y-%m-%d %H:%M:%S")
+
+def read_drep(file_path):
+    try:
+        config = configparser.ConfigParser()
+        config.read(file_path)
+        if "INFO" not in config or "deviceId" not in config["INFO"]:
+            print(f"Warning: deviceId not found in {file_path}")
+            return None
+        info = config["INFO"]
+        return {
+            "deviceId": info["deviceId"],
+            "startDate": info.get("startDate", "2000-01-01 00:00:00"),
+            "endDate": info.get("endDate"),
+            "hardware": info.get("hardware"),
+        }
+    except Exception as e:
+        print(f"Warning: Could not read {file_path} - {e}")
+        return None
+
+class DeviceBrowser(QDialog):
+    def __init__(self, registry, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Find Device")
+        self.resize(800, 500)
+
+        self.registry = registry
+        self.selected_path = None
+
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+
+        # === FİLTRELER ===
+        filter_layout = QHBoxLayout()
+        filter_layout.addWidget(QLabel("Device ID:"))
+        self.prefix_input = QLineEdit()
+        self.prefix_input.setPlaceholderText("ID prefix")
+        self.prefix_input.textChanged.connect(self.refresh)
+        filter_layout.addWidget(self.prefix_input)
+
+        self.date_checkbox = QCheckBox("Start Date >=")
+        self.date_checkbox.stateChanged.connect(self.refresh)
+        filter_layout.addWidget(self.date_checkbox)
+        self.date_picker = QDateTimeEdit()
+        self.date_picker.setDisplayFormat("yyyy-MM-dd HH:mm:ss")
+        self.date_picker.setCalendarPopup(True)
+        self.date_picker.dateTimeChanged.connect(self.refresh)
+        filter_layout.addWidget(self.date_picker)
+
+        filter_layout.addWidget(QLabel("Error Rate >= %"))
+        self.error_spin = QDoubleSpinBox()
+        self.error_spin.setRange(0, 100)
+        self.error_spin.valueChanged.connect(self.refresh)
+        filter_layout.addWidget(self.error_spin)
+        layout.addLayout(filter_layout)
+
+        self.table = QTableWidget()
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.cellDoubleClicked.connect(self.open_selected)
+        layout.addWidget(self.table)
+
+        button_layout = QHBoxLayout()
+        self.count_label = QLabel()
+        button_layout.addWidget(self.count_label)
+        button_layout.addStretch()
+        open_btn = QPushButton("Open")
+        open_btn.clicked.connect(lambda: self.open_selected(self.table.currentRow(), 0))
+        button_layout.addWidget(open_btn)
+        layout.addLayout(button_layout)
+
+        self.registry.scan()
+        self.refresh()
+
+    def refresh(self):
+        rows = self.registry.search(
+            prefix=self.prefix_input.text().strip(),
+            start_from=self.date_picker.dateTime().toString("yyyy-MM-dd HH:mm:ss") if self.date_checkbox.isChecked() else None,
+            min_error_rate=self.error_spin.value() or None,
+        )
+        columns = ["device_id", "start_date", "end_date", "hardware", "last_fetch", "row_count", "error_rate"]
+        headers = ["Device ID", "Start Date", "End Date", "Hardware", "Last Fetch", "Rows", "Worst Error %"]
+
+        self.rows = rows
+        self.table.clear()
+        self.table.setRowCount(len(rows))
+        self.table.setColumnCount(len(columns))
+        self.table.setHorizontalHeaderLabels(headers)
+        for i, row in enumerate(rows):
+            for j, col in enumerate(columns):
+                value = row[col]
+                if col == "error_rate" and value is not None:
+                    value = f"{value:.2f}"
+                item = QTableWidgetItem("" if value is None else str(value))
+                item.setData(Qt.UserRole, row["path"])
+                self.table.setItem(i, j, item)
+        self.count_label.setText(f"{len(rows)} devices")
+
+    def open_selected(self, row, _column):
+        if row < 0 or row >= len(self.rows):
+            return
+        self.selected_path = self.rows[row]["path"]
+        self.accept()
@@ -0,0 +1,203 @@
+import os
+import time
+import random
+import threading
+
+import pandas as pd
+
+from fetchTrace import span
+
+PARTIAL_DIR = os.path.join(os.getcwd(), "Device Cache", "partial")
+PARTIAL_MAX_AGE = 3600
+
+class RetryPolicy:
+    def __init__(self, attempts=4, base_delay=2.0, max_delay=60.0, jitter=0.25):
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+
+    def delay(self, attempt):
+        # Üstel bekleme: 2, 4, 8 ... saniye; aynı anda yeniden denemeler çakışmasın diye jitter eklenir
+        delay = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return delay * (1 + random.uniform(-self.jitter, self.jitter))
+
+class CircuitBreaker:
+    # closed: normal, open: kaynak çökmüş kabul edilir ve çağrı yapılmaz,
+    # half-open: reset_timeout sonrası tek bir deneme fetch'ine (probe) izin verilir; probe'u alan thread
+    # denemelerini sürdürür, diğer çağıranlar sonuç yazılana kadar atlanır.
+    # Hatalar deneme başına değil, tüm denemeleri tükenen fetch başına sayılır.
+    def __init__(self, name, failure_threshold=3, reset_timeout=120):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.state = "closed"
+        self.opened_at = None
+        self.probe_thread = None
+        self.lock = threading.Lock()
+
+    def allow(self):
+        with self.lock:
+            if self.state == "open":
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    return False
+                self.state = "half-open"
+                self.probe_thread = threading.get_ident()
+                print(f"Status: Circuit '{self.name}' half-open, sending a probe request.")
+            if self.state == "half-open":
+                return self.probe_thread == threading.get_ident()
+            return True
+
+    def record_success(self):
+        with self.lock:
+            if self.state != "closed":
+                print(f"Status: Circuit '{self.name}' closed.")
+            self.state = "closed"
+            self.failures = 0
+            self.probe_thread = None
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.state == "half-open" or self.failures >= self.failure_threshold:
+                if self.state != "open":
+                    print(f"Warning: Circuit '{self.name}' opened after {self.failures} failures.")
+                self.state = "open"
+                self.opened_at = time.monotonic()
+                self.probe_thread = None
+
+    def retry_in(self):
+        with self.lock:
+            if self.state != "open":
+                return 0
+            return max(0, self.reset_timeout - (time.monotonic() - self.opened_at))
+
+# Kaynak başına tek breaker (report sunucusu ve portal ayrı host'lar); ardışık fetch'ler (fleet, monitoring) aynı durumu paylaşır
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+def circuit_breaker(name, **kwargs):
+    with _breakers_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name, **kwargs)
+        return _breakers[name]
+
+def partial_path(device_id, source):
+    return os.path.join(PARTIAL_DIR, f"{device_id}.{source}.pkl")
+
+def save_partial(device_id, source, df):
+    try:
+        os.makedirs(PARTIAL_DIR, exist_ok=True)
+        df.to_pickle(partial_path(device_id, source))
+    except Exception as e:
+        print(f"Warning: Could not cache partial {source} data for device {device_id} - {e}")
+
+def load_partial(device_id, source, max_age=PARTIAL_MAX_AGE):
+    path = partial_path(device_id, source)
+    if not os.path.exists(path) or time.time() - os.path.getmtime(path) > max_age:
+        return None
+    try:
+        return pd.read_pickle(path)
+    except Exception as e:
+        print(f"Warning: Could not read partial {source} data for device {device_id} - {e}")
+        return None
+
+def clear_partials(device_id, sources):
+    for source in sources:
+        path = partial_path(device_id, source)
+        if os.path.exists(path):
+            os.remove(path)
+
+class FetchScheduler:
+    # sources: {"isim": fonksiyon(device_id) -> DataFrame | None}. None veya boş sonuç da hata sayılır.
+    # combine: tüm kaynaklar geldiğinde birleştirme fonksiyonu (sözlük alır)
+    def __init__(self, sources, combine, policy=None, registry=None, partial_max_age=PARTIAL_MAX_AGE, sleep=time.sleep):
+        self.sources = sources
+        self.combine = combine
+        self.policy = policy or RetryPolicy()
+        self.registry = registry
+        self.partial_max_age = partial_max_age
+        self.sleep = sleep
+        self.outcomes = []
+
+    def fetch(self, device_id):
+        frames = {}
+        for source, func in self.sources.items():
+            frames[source] = self.fetch_source(device_id, source, func)
+            if frames[source] is None:
+                # Diğer kaynaklardan gelen sonuçlar partial cache'te kalır; sonraki denemede tekrar çekilmez
+                print(f"Error: {source} data could not be fetched for device {device_id}.")
+                return None
+
+        # Birleştirme başarılı da başarısız da (hata fırlatsa da) olsa partial'lar silinir; bozuk bir partial
+        # PARTIAL_MAX_AGE boyunca yeniden yüklenip aynı hatayı tekrarlatmasın
+        try:
+            df = self.combine(frames)
+        finally:
+            clear_partials(device_id, self.sources)
+        if df is None or df.empty:
+            print(f"Error: Fetched data could not be combined for device {device_id}.")
+        return df
+
+    def fetch_source(self, device_id, source, func):
+        started = time.perf_counter()
+
+        df = load_partial(device_id, source, self.partial_max_age)
+        if df is not None:
+            print(f"Status: Using cached partial {source} data for device {device_id} ({len(df)} rows).")
+            self.record(device_id, source, "cached", 0, None, started)
+            return df
+
+        breaker = circuit_breaker(source)
+        last_error = None
+        for attempt in range(1, self.policy.attempts + 1):
+            if not breaker.allow():
+                if breaker.state == "half-open":
+                    last_error = "circuit half-open, probe request in progress"
+                else:
+                    last_error = f"circuit open, retry in {breaker.retry_in():.0f} s"
+                print(f"Warning: {source} skipped for device {device_id} - {last_error}")
+                self.record(device_id, source, "skipped", attempt - 1, last_error, started)
+                return None
+
+            try:
+                with span("fetch_attempt", source=source, attempt=attempt):
+                    df = func(device_id)
+                if df is None or df.empty:
+                    raise ValueError("source returned no data")
+            except Exception as e:
+                last_error = str(e)
+                print(f"Warning: {source} attempt {attempt}/{self.policy.attempts} failed for device {device_id} - {e}")
+                if attempt < self.policy.attempts:
+                    delay = self.policy.delay(attempt)
+                    print(f"Status: Retrying {source} in {delay:.1f} s...")
+                    self.sleep(delay)
+                continue
+
+            breaker.record_success()
+            save_partial(device_id, source, df)
+            self.record(device_id, source, "ok", attempt, None, started)
+            return df
+
+        # Tüm denemeleri tükenen fetch breaker'a tek hata yazar; tek bir sorunlu cihaz kaynağı
+        # diğer cihazlar için kapatmaz, art arda failure_threshold cihaz başarısız olursa açılır
+        breaker.record_failure()
+        self.record(device_id, source, "failed", self.policy.attempts, last_error, started)
+        return None
+
+    def record(self, device_id, source, status, attempts, error, started):
+        outcome = {
+            "device_id": str(device_id),
+            "source": source,
+            "status": status,
+            "attempts": attempts,
+            "error": error,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+        self.outcomes.append(outcome)
+        if self.registry is not None:
+            try:
+                self.registry.record_outcome(**outcome)
+            except Exception as e:
+                print(f"Warning: Could not record fetch outcome - {e}")
@@ -0,0 +1,263 @@
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+import pandas as pd
+
+from PyQt5.QtWidgets import QDialog, QVBoxLayout, QLabel, QTableWidget, QTableWidgetItem
+
+TRACE_DIR = os.path.join(os.getcwd(), "Traces")
+# Klasörde tutulan en fazla trace (her biri .jsonl + .trace.json); eskiler kaydetme sırasında silinir
+MAX_SAVED_TRACES = 50
+
+# Her thread kendi aktif trace'ini ve span yığınını tutar (FetchWorker QThread'de çalışır)
+_local = threading.local()
+_last_traces = {}
+_last_lock = threading.Lock()
+
+class Span:
+    def __init__(self, name, parent=None, **attrs):
+        self.name = name
+        self.parent = parent
+        self.attrs = dict(attrs)
+        self.thread_id = threading.get_ident()
+        self.start = time.perf_counter()
+        self.end = None
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def set_frame(self, df):
+        if df is not None:
+            self.attrs["rows"] = len(df)
+            self.attrs["bytes"] = int(df.memory_usage(index=False).sum())
+
+    @property
+    def duration_ms(self):
+        end = self.end if self.end is not None else time.perf_counter()
+        return (end - self.start) * 1000
+
+class _NullSpan:
+    # Aktif trace yokken span çağrıları hiçbir şey yapmaz
+    def set(self, **attrs):
+        pass
+
+    def set_frame(self, df):
+        pass
+
+class Trace:
+    def __init__(self, name, **attrs):
+        self.name = name
+        self.attrs = dict(attrs)
+        self.created = datetime.now()
+        self.origin = time.perf_counter()
+        self.wall_origin = time.time()
+        self.spans = []
+        self.lock = threading.Lock()
+        self.root = Span(name, **attrs)
+
+    def set(self, **attrs):
+        self.root.set(**attrs)
+
+    def set_frame(self, df):
+        self.root.set_frame(df)
+
+    def add(self, span):
+        with self.lock:
+            self.spans.append(span)
+
+    def export_spans(self):
+        # Worker süreçten ana sürece taşınmak için; perf_counter süreçler arası ortak olmadığından
+        # başlangıçlar duvar saatine çevrilir
+        positions = {id(span): i for i, span in enumerate(self.spans)}
+        return [
+            {
+                "name": span.name,
+                "parent": positions.get(id(span.parent)),
+                "start": self.wall_origin + (span.start - self.origin),
+                "duration": span.end - span.start,
+                "thread": span.thread_id,
+                "attrs": span.attrs,
+            }
+            for span in self.spans
+        ]
+
+    def attach_spans(self, records, parent=None):
+        # export_spans çıktısı bu trace'e eklenir; üst span'i olmayanlar parent'ın (havuza gönderen span) altına girer
+        spans = []
+        for record in records:
+            span = Span(record["name"], **record["attrs"])
+            span.start = self.origin + (record["start"] - self.wall_origin)
+            span.end = span.start + record["duration"]
+            span.thread_id = record["thread"]
+            spans.append(span)
+        for span, record in zip(spans, records):
+            span.parent = spans[record["parent"]] if record["parent"] is not None else parent
+            self.add(span)
+
+    def records(self):
+        records = []
+        for span in [self.root] + self.spans:
+            records.append({
+                "trace": self.name,
+                "span": span.name,
+                "parent": span.parent.name if span.parent else None,
+                "start_ms": round((span.start - self.origin) * 1000, 3),
+                "duration_ms": round(span.duration_ms, 3),
+                "thread": span.thread_id,
+                **span.attrs,
+            })
+        return records
+
+    def to_chrome_trace(self):
+        # chrome://tracing / Perfetto ile açılabilen "complete" olaylar
+        events = []
+        for span in [self.root] + self.spans:
+            events.append({
+                "name": span.name,
+                "ph": "X",
+                "ts": round((span.start - self.origin) * 1_000_000),
+                "dur": round(span.duration_ms * 1000),
+                "pid": os.getpid(),
+                "tid": span.thread_id,
+                "args": {key: _json_value(value) for key, value in span.attrs.items()},
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def breakdown(self):
+        total = self.root.duration_ms or 1
+        rows = []
+        for span in sorted(self.spans, key=lambda item: item.start):
+            depth = 0
+            parent = span.parent
+            while parent is not None and parent is not self.root:
+                depth += 1
+                parent = parent.parent
+            rows.append({
+                "Stage": "    " * depth + span.name,
+                "Duration (ms)": round(span.duration_ms, 1),
+                "Share": f"{span.duration_ms / total * 100:.1f}%",
+                "Rows": span.attrs.get("rows", ""),
+                "Bytes": span.attrs.get("bytes", ""),
+            })
+        rows.append({
+            "Stage": f"{self.name} (total)",
+            "Duration (ms)": round(self.root.duration_ms, 1),
+            "Share": "100.0%",
+            "Rows": self.root.attrs.get("rows", ""),
+            "Bytes": self.root.attrs.get("bytes", ""),
+        })
+        return pd.DataFrame(rows)
+
+    def save(self, trace_dir=TRACE_DIR):
+        os.makedirs(trace_dir, exist_ok=True)
+        label = "_".join(str(value) for value in self.attrs.values())
+        base = os.path.join(trace_dir, f"{self.name}_{label}_{self.created:%Y%m%d_%H%M%S}".rstrip("_"))
+
+        with open(base + ".jsonl", "w", encoding="utf-8") as file:
+            for record in self.records():
+                file.write(json.dumps(record, default=_json_value) + "\n")
+        with open(base + ".trace.json", "w", encoding="utf-8") as file:
+            json.dump(self.to_chrome_trace(), file)
+        prune_traces(trace_dir)
+        return base + ".jsonl"
+
+def prune_traces(trace_dir=TRACE_DIR, keep=MAX_SAVED_TRACES):
+    bases = {}
+    for entry in os.scandir(trace_dir):
+        for suffix in (".jsonl", ".trace.json"):
+            if entry.name.endswith(suffix):
+                base = entry.path[:-len(suffix)]
+                bases[base] = max(bases.get(base, 0), entry.stat().st_mtime)
+    for base in sorted(bases, key=bases.get)[:max(len(bases) - keep, 0)]:
+        for suffix in (".jsonl", ".trace.json"):
+            try:
+                os.remove(base + suffix)
+            except FileNotFoundError:
+                pass
+
+def _json_value(value):
+    if isinstance(value, (int, float, str, bool)) or value is None:
+        return value
+    return str(value)
+
+def current_trace():
+    return getattr(_local, "trace", None)
+
+def current_span():
+    stack = getattr(_local, "stack", None)
+    return stack[-1] if stack else None
+
+def last_trace(name):
+    with _last_lock:
+        return _last_traces.get(name)
+
+@contextmanager
+def start_trace(name, save=False, **attrs):
+    # save: sadece fetch trace'leri diske yazılır; diğerleri last_trace ile bellekte kalır
+    previous = current_trace()
+    previous_stack = getattr(_local, "stack", [])
+    trace = Trace(name, **attrs)
+    _local.trace = trace
+    _local.stack = [trace.root]
+    try:
+        yield trace
+    except Exception as e:
+        trace.root.set(error=str(e))
+        raise
+    finally:
+        trace.root.end = time.perf_counter()
+        _local.trace = previous
+        _local.stack = previous_stack
+        with _last_lock:
+            _last_traces[name] = trace
+        if save:
+            try:
+                path = trace.save()
+                print(f"Status: Trace saved to {path} ({trace.root.duration_ms:.0f} ms)")
+            except Exception as e:
+                print(f"Warning: Could not save trace - {e}")
+
+@contextmanager
+def span(name, **attrs):
+    trace = current_trace()
+    if trace is None:
+        yield _NullSpan()
+        return
+
+    stack = _local.stack
+    current = Span(name, parent=stack[-1] if stack else None, **attrs)
+    stack.append(current)
+    try:
+        yield current
+    except Exception as e:
+        current.set(error=str(e))
+        raise
+    finally:
+        current.end = time.perf_counter()
+        stack.pop()
+        trace.add(current)
+
+class TraceBreakdown(QDialog):
+    def __init__(self, trace, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Fetch Timings")
+        self.resize(700, 450)
+
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+
+        title = ", ".join(f"{key}: {value}" for key, value in trace.attrs.items())
+        layout.addWidget(QLabel(f"{trace.name} - {title} - {trace.created:%Y-%m-%d %H:%M:%S}"))
+
+        df = trace.breakdown()
+        table = QTableWidget(len(df), len(df.columns))
+        table.setHorizontalHeaderLabels(list(df.columns))
+        for i in range(len(df)):
+            for j in range(len(df.columns)):
+                table.setItem(i, j, QTableWidgetItem(str(df.iloc[i, j])))
+        table.resizeColumnsToContents()
+        layout.addWidget(table)
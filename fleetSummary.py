@@ -0,0 +1,291 @@
+import os
+from concurrent.futures import as_completed
+
+import pandas as pd
+
+from PyQt5.QtCore import Qt, QObject, QThread, pyqtSignal
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QListWidget, QListWidgetItem,
+    QTableWidget, QTableWidgetItem, QPushButton, QCheckBox, QFileDialog, QMessageBox
+)
+
+from dataFetch import datafetch, fetch_metadata, filter_by_date_range, load_cached_frame, save_cached_frame
+from dataExport import EXPORT_FORMATS, ensure_extension, export_frame
+from deviceRegistry import DeviceRegistry
+from defaultTests import DataTests, SUMMARY_TESTS
+from fetchTrace import start_trace
+from iniStorage import IniBatch
+from latencyAnalysis import PERCENTILES, LatencySketch, latency_sketch
+from processPool import submit
+from telemetryStore import write_device_partitions
+from testRules import load_rules
+
+def list_drep_devices(registry=None):
+    # .drep dosyaları her seferinde parse edilmez; registry sadece değişenleri yeniden okur
+    registry = registry or DeviceRegistry()
+    registry.scan()
+    return [
+        {
+            "path": row["path"],
+            "deviceId": row["device_id"],
+            "startDate": pd.to_datetime(row["start_date"] or "2000-01-01 00:00:00"),
+            "endDate": pd.to_datetime(row["end_date"] or "2000-01-01 00:00:00"),
+            "errorRate": row["error_rate"],
+        }
+        for row in registry.devices()
+    ]
+
+def evaluate_device(device_id, start_date=None, end_date=None, drep_path=None):
+    # Worker process içinde çalışır: cache'i kendisi okur, GUI'ye sadece sayılar ve gecikme sketch'i döner.
+    with start_trace("evaluate", device_id=device_id) as trace:
+        df = load_cached_frame(device_id)
+        if df is None or df.empty:
+            return device_id, None, None
+
+        df = filter_by_date_range(df, start_date, end_date)
+        trace.set_frame(df)
+        tester = DataTests(load_rules(drep_path=drep_path))
+        df, _ = tester.add_time_difference_column(df)
+        return device_id, tester.run_summary(df), latency_sketch(df)
+
+LATENCY_COLUMNS = [f"Latency p{round(q * 100)} (s)" for q in PERCENTILES]
+
+def build_error_rate_matrix(results, latencies=None):
+    test_names = [name for name, _ in SUMMARY_TESTS]
+    latencies = latencies or {}
+    records = []
+    for device_id, summary_rows in results.items():
+        record = {"Device ID": device_id, "Total": 0}
+        for name, error_count, total_count in summary_rows:
+            record["Total"] = total_count
+            record[name] = round(error_count / total_count * 100, 2) if total_count > 0 else None
+        if device_id in latencies:
+            for col, value in zip(LATENCY_COLUMNS, latencies[device_id].quantiles(PERCENTILES).values()):
+                record[col] = None if value is None else round(value, 1)
+        records.append(record)
+    return pd.DataFrame(records, columns=["Device ID", "Total"] + test_names + LATENCY_COLUMNS)
+
+class FleetWorker(QObject):
+    progress = pyqtSignal(str)
+    finished = pyqtSignal(object)
+    error = pyqtSignal(str)
+
+    def __init__(self, devices, email=None, password=None, fetch_missing=False):
+        super().__init__()
+        self.devices = devices
+        self.email = email
+        self.password = password
+        self.fetch_missing = fetch_missing
+        self.registry = DeviceRegistry()
+        # Fetch bilgileri .drep dosyalarına iş sonunda toplu yazılır
+        self.metadata = IniBatch()
+        # Cihaz sketch'leri birleştirilerek filo gecikme yüzdelikleri (satırlar ana sürece gelmez)
+        self.latency = LatencySketch()
+
+    def run(self):
+        try:
+            results = {}
+            latencies = {}
+            # Değerlendirmeler paylaşılan process havuzunda (tüm çekirdekler) paralel çalışır
+            futures = []
+            for device in self.devices:
+                device_id = device["deviceId"]
+                if load_cached_frame(device_id) is None:
+                    if not self.fetch_missing or not self.email:
+                        self.progress.emit(f"{device_id}: no cached data, skipped.")
+                        continue
+                    # Selenium tek tek çalışır, değerlendirme havuzda paralel devam eder
+                    self.progress.emit(f"{device_id}: fetching...")
+                    df = datafetch(device_id, self.email, self.password)
+                    if df is None or df.empty:
+                        self.progress.emit(f"{device_id}: fetch failed.")
+                        continue
+                    save_cached_frame(device_id, df)
+                    write_device_partitions(device_id, df)
+                    self.registry.record_fetch(device_id, len(df))
+                    self.metadata.update(device["path"], "INFO", fetch_metadata(df))
+
+                futures.append(submit(
+                    evaluate_device, device_id, device["startDate"], device["endDate"], device["path"]
+                ))
+
+            for future in as_completed(futures):
+                device_id, summary_rows, sketch = future.result()
+                if summary_rows is None:
+                    self.progress.emit(f"{device_id}: no data in cache.")
+                    continue
+                results[device_id] = summary_rows
+                latencies[device_id] = sketch
+                self.latency.merge(sketch)
+                self.registry.record_summary(device_id, summary_rows)
+                self.progress.emit(f"{device_id}: evaluated.")
+
+            self.flush_metadata()
+            self.finished.emit(build_error_rate_matrix(results, latencies))
+        except Exception as e:
+            self.flush_metadata()
+            self.error.emit(str(e))
+
+    def flush_metadata(self):
+        try:
+            count = self.metadata.flush()
+            if count:
+                self.progress.emit(f"Fetch metadata saved to {count} .drep files.")
+        except Exception as e:
+            self.progress.emit(f"Could not save fetch metadata - {e}")
+
+class FleetSummary(QDialog):
+    def __init__(self, email=None, password=None, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Fleet Summary")
+        self.resize(1100, 650)
+
+        self.email = email
+        self.password = password
+        self.matrix_df = None
+
+        self.main_layout = QVBoxLayout()
+        self.setLayout(self.main_layout)
+
+        # === CİHAZ LİSTESİ ===
+        self.main_layout.addWidget(QLabel("Devices (from Device Reports):"))
+        self.device_list = QListWidget()
+        self.device_list.setMaximumHeight(150)
+        self.main_layout.addWidget(self.device_list)
+
+        self.devices = list_drep_devices()
+        for device in self.devices:
+            item = QListWidgetItem(device["deviceId"])
+            item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+            item.setCheckState(Qt.Checked)
+            self.device_list.addItem(item)
+
+        controls_layout = QHBoxLayout()
+        self.fetch_missing_checkbox = QCheckBox("Fetch devices without cached data")
+        self.fetch_missing_checkbox.setEnabled(bool(email))
+        controls_layout.addWidget(self.fetch_missing_checkbox)
+        controls_layout.addStretch()
+
+        self.run_btn = QPushButton("Evaluate Fleet")
+        self.run_btn.clicked.connect(self.run_fleet)
+        controls_layout.addWidget(self.run_btn)
+        self.main_layout.addLayout(controls_layout)
+
+        self.status_label = QLabel("Ready.")
+        self.status_label.setStyleSheet("color: gray; font-weight: bold;")
+        self.main_layout.addWidget(self.status_label)
+
+        # === HATA ORANI MATRİSİ ===
+        self.table = QTableWidget()
+        self.table.setSortingEnabled(True)
+        self.main_layout.addWidget(self.table)
+
+        self.export_btn = QPushButton("Export Matrix")
+        self.export_btn.clicked.connect(self.export_matrix)
+        self.export_btn.setEnabled(False)
+        self.main_layout.addWidget(self.export_btn)
+
+    def selected_devices(self):
+        checked_ids = {
+            self.device_list.item(i).text()
+            for i in range(self.device_list.count())
+            if self.device_list.item(i).checkState() == Qt.Checked
+        }
+        return [device for device in self.devices if device["deviceId"] in checked_ids]
+
+    def run_fleet(self):
+        devices = self.selected_devices()
+        if not devices:
+            QMessageBox.warning(self, "Warning", "Please select at least one device.")
+            return
+
+        self.run_btn.setEnabled(False)
+        self.status_label.setText(f"Evaluating {len(devices)} devices...")
+        print(f"Status: Fleet evaluation started for {len(devices)} devices.")
+
+        self.thread = QThread()
+        self.worker = FleetWorker(
+            devices,
+            email=self.email,
+            password=self.password,
+            fetch_missing=self.fetch_missing_checkbox.isChecked()
+        )
+        self.worker.moveToThread(self.thread)
+
+        self.thread.started.connect(self.worker.run)
+        self.worker.progress.connect(self.on_progress)
+        self.worker.finished.connect(self.on_finished)
+        self.worker.error.connect(self.on_error)
+
+        self.worker.finished.connect(self.thread.quit)
+        self.worker.error.connect(self.thread.quit)
+        self.worker.finished.connect(self.worker.deleteLater)
+        self.thread.finished.connect(self.thread.deleteLater)
+
+        self.thread.start()
+
+    def on_progress(self, message):
+        print(f"Status: Fleet - {message}")
+        self.status_label.setText(message)
+
+    def on_finished(self, matrix_df):
+        self.run_btn.setEnabled(True)
+        self.matrix_df = matrix_df
+        self.update_table(matrix_df)
+        self.export_btn.setEnabled(not matrix_df.empty)
+        percentiles = self.worker.latency.quantiles(PERCENTILES)
+        latency_text = " | ".join(
+            f"p{round(q * 100)}: {value:.0f}s" for q, value in percentiles.items() if value is not None
+        )
+        self.status_label.setText(
+            f"{len(matrix_df)} devices evaluated." + (f" Fleet latency {latency_text}" if latency_text else "")
+        )
+        print(f"Status: Fleet evaluation complete. {len(matrix_df)} devices.")
+
+    def on_error(self, message):
+        self.run_btn.setEnabled(True)
+        self.status_label.setText("Fleet evaluation failed.")
+        print(f"Error: Fleet evaluation failed - {message}")
+        QMessageBox.critical(self, "Error", f"Fleet evaluation failed:\n{message}")
+
+    def update_table(self, df):
+        # Doldururken sıralama kapalı olmalı, yoksa satırlar yer değiştirir
+        self.table.setSortingEnabled(False)
+        self.table.clear()
+        self.table.setRowCount(len(df))
+        self.table.setColumnCount(len(df.columns))
+        self.table.setHorizontalHeaderLabels(list(df.columns))
+
+        for i in range(len(df)):
+            for j, col in enumerate(df.columns):
+                value = df.iloc[i, j]
+                item = QTableWidgetItem()
+                if col == "Device ID" or pd.isna(value):
+                    item.setText("N/A" if pd.isna(value) else str(value))
+                else:
+                    # Sayısal sıralama için değer DisplayRole'e sayı olarak yazılır
+                    item.setData(Qt.DisplayRole, float(value))
+                self.table.setItem(i, j, item)
+
+        self.table.setSortingEnabled(True)
+
+    def export_matrix(self):
+        if self.matrix_df is None or self.matrix_df.empty:
+            QMessageBox.warning(self, "Warning", "Fleet matrix is empty.")
+            return
+
+        file_path, selected_filter = QFileDialog.getSaveFileName(
+            self,
+            "Export Fleet Matrix",
+            os.path.join(os.getcwd(), "fleet_summary.csv"),
+            ";;".join(EXPORT_FORMATS.values())
+        )
+        if not file_path:
+            return
+
+        try:
+            file_path = ensure_extension(file_path, selected_filter)
+            export_frame(self.matrix_df, file_path, sheet_name="Fleet Summary")
+            QMessageBox.information(self, "Exported", f"Fleet matrix exported.\n{file_path}")
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to export fleet matrix:\n{e}")
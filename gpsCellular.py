@@ -2,9 +2,8 @@ import os
 from datetime import datetime
 from math import atan2, cos, sin, radians
 
-import requests
-import pandas as pd
 import folium
+import numpy as np
 from geopy.distance import geodesic
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_qt5agg import (
@@ -16,6 +15,11 @@ from PyQt5.QtWebEngineWidgets import QWebEngineView
 from PyQt5.QtCore import QUrl
 from PyQt5.QtWidgets import QVBoxLayout, QDialog, QMessageBox
 
+from asyncHttp import http_client
+from resultCache import result_cache
+from fetchTrace import span
+from processPool import run_in_process
+
 class MplCanvas(FigureCanvas):
     def __init__(self, parent=None):
         fig = Figure(figsize=(6, 4))
@@ -23,7 +27,8 @@ class MplCanvas(FigureCanvas):
         super().__init__(fig)
 
 class gpsCellularAnalyzer(QDialog):
-    def __init__(self, df, parent=None):
+    def __init__(self, df, parent=None, prepared=None):
+        # prepared: prepare_gps_map sonucu (arka planda hazırlanmış koordinat, kule ve histogram verisi)
         super().__init__(parent)
         self.setWindowTitle("GPS-Cellular Analyze")
         self.setMinimumSize(800, 600)
@@ -32,25 +37,11 @@ class gpsCellularAnalyzer(QDialog):
         layout = QVBoxLayout()
         self.setLayout(layout)
 
-        # === Konum kontrolü ===
-        try:
-            print("Status: Checking device coordinates...")
-            device_df = df[(df["Lat"] != "-999") & (df["Lon"] != "-999")]
-            if device_df.empty:
-                raise ValueError("No valid coordinates found.")
-
-            latest = device_df.sort_values("LogDate").iloc[-1]
-            device_lat = self.convert_nmea_to_decimal(latest["Lat"])
-            device_lon = self.convert_nmea_to_decimal(latest["Lon"])
-
-            if device_lat is None or device_lon is None:
-                raise ValueError("Invalid coordinates.")
-
-            print(f"Status: Device coordinates OK - Lat: {device_lat}, Lon: {device_lon}")
-
-        except Exception as e:
-            print(f"Status: Map generation failed - {e}")
+        if prepared is None:
+            prepared = prepare_gps_analysis(df)
+        if prepared["device"] is None:
             return
+        device_lat, device_lon = prepared["device"]
 
         self.success = True
 
@@ -68,15 +59,13 @@ class gpsCellularAnalyzer(QDialog):
                 icon=folium.Icon(color="blue", icon="info-sign")
             ).add_to(fmap)
 
-            unique_stations = df[["MMC", "MNC", "LAC", "Id"]].drop_duplicates()
-
-            for _, row in unique_stations.iterrows():
-                mcc, mnc, lac, cid = row["MMC"], row["MNC"], row["LAC"], row["Id"]
+            towers = prepared["towers"]
+            locations = prepared.get("locations")
+            if locations is None:
+                locations = lookup_tower_locations(towers)
 
-                if any(pd.isna([mcc, mnc, lac, cid])):
-                    continue
-
-                latlon = self.get_location_from_mylnikov(str(mcc), str(mnc), str(lac), str(cid))
+            for mcc, mnc, lac, cid in towers:
+                latlon = locations.get((mcc, mnc, lac, cid))
                 if latlon:
                     distance_km = geodesic((device_lat, device_lon), latlon).km
                     radius_m = distance_km * 1000
@@ -123,7 +112,8 @@ class gpsCellularAnalyzer(QDialog):
             os.makedirs(temps_dir, exist_ok=True)
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             html_file = os.path.join(temps_dir, f"map_{timestamp}.html")
-            fmap.save(html_file)
+            with span("gps.map_save"):
+                fmap.save(html_file)
             file_path = os.path.abspath(html_file)
             local_url = QUrl.fromLocalFile(file_path)
             map_view.load(local_url)
@@ -140,72 +130,30 @@ class gpsCellularAnalyzer(QDialog):
         layout.addWidget(self.canvas)  # 🔹 Ardından grafik canvas'ını ekle
 
         try:
-            self.run_analysis(df)
+            self.run_analysis(prepared["histogram"])
         except Exception as e:
             print(f"Status: Failed to run analysis - {e}")
 
-    def run_analysis(self, df):
+    def run_analysis(self, histogram):
         print("Status: Starting analysis...")
 
-        if not all(col in df.columns for col in ["MMC", "MNC", "LAC", "Id", "PWR"]):
+        if histogram is None:
             print("Status: Required columns missing in dataframe.")
             QMessageBox.warning(self, "Missing Data", "PWR veya hücre bilgileri eksik.")
             return
 
-        self.canvas.axes.clear()
-
-        device_id = str(df["DeviceId"].iloc[0]) if "DeviceId" in df.columns else "Unknown"
-        grouped = df.groupby(["MMC", "MNC", "LAC", "Id"])
-        valid_pwr = df["PWR"][df["PWR"] < 0]
-
-        if valid_pwr.empty:
+        if not histogram["towers"]:
             print("Status: No valid PWR data found (< 0).")
             QMessageBox.warning(self, "Warning", "No valid PWR data found (< 0).")
             return
 
-        min_pwr = int(valid_pwr.min() // 5 * 5)
-        max_pwr = int(valid_pwr.max() // 5 * 5) + 5
-        bins = list(range(min_pwr, max_pwr + 1, 5))
-
-        for (mcc, mnc, lac, cid), group in grouped:
-            label = f"{mcc}-{mnc}-{lac}-{cid}"
-            tower_pwr = group["PWR"]
-            tower_pwr = tower_pwr[tower_pwr < 0]
-            if tower_pwr.empty:
-                continue
-
-            self.canvas.axes.hist(
-                tower_pwr,
-                bins=bins,
-                alpha=1,
-                label=label
-            )
-
-        self.canvas.axes.set_title(f"Cell Tower - PWR Histogram (Device ID: {device_id})")
-        self.canvas.axes.set_xlabel("PWR (Signal Strength, dBm)")
-        self.canvas.axes.set_ylabel("Data Count")
-        self.canvas.axes.legend(fontsize='x-small')
-        self.canvas.axes.grid(True)
+        self.canvas.axes.clear()
+        draw_pwr_histogram(self.canvas.axes, histogram)
         self.canvas.draw()
         print("Status: Analysis complete and histogram rendered.")
 
-
     def convert_nmea_to_decimal(self, coord_str):
-        try:
-            direction = coord_str[-1]  # Son karakter yön
-            value = float(coord_str[:-1])  # Son karakter hariç sayısal değer
-
-            degrees = int(value // 100)
-            minutes = value - degrees * 100
-            decimal = degrees + minutes / 60
-
-            if direction in ["S", "W"]:
-                decimal = -decimal
-
-            return decimal
-        except Exception as e:
-            print(f"Status: Conversion failed for {coord_str}: {e}")
-            return None
+        return convert_nmea_to_decimal(coord_str)
 
     def hex_to_int(value):
         try:
@@ -214,7 +162,8 @@ class gpsCellularAnalyzer(QDialog):
             print(f"Status: Invalid hex: {value}")
             return None
 
-    def get_location_from_mylnikov(self, mcc, mnc, lac_hex, cid_hex):
+    @staticmethod
+    def mylnikov_url(mcc, mnc, lac_hex, cid_hex):
         try:
             lac = int(lac_hex, 16)
             cid = int(cid_hex, 16)
@@ -222,23 +171,155 @@ class gpsCellularAnalyzer(QDialog):
             print(f"Status: Mylnikov cannot convert LAC/CID ({lac_hex}/{cid_hex}) to integer.")
             return None
 
-        url = (
+        return (
             "https://api.mylnikov.org/geolocation/cell?"
             f"v=1.1&data=open&mcc={mcc}&mnc={mnc}&lac={lac}&cellid={cid}"
         )
 
+    @staticmethod
+    def parse_mylnikov_response(response, tower):
+        if isinstance(response, Exception):
+            print("Status: Mylnikov error:", repr(response))
+            return None
+
         try:
-            response = requests.get(url)
-            if response.status_code == 200:
+            if response.status == 200:
                 json_data = response.json()
                 if json_data["result"] == 200:
                     location = json_data["data"]
                     return (location["lat"], location["lon"])
                 else:
-                    print(f"Status: Mylnikov have no result for {mcc}-{mnc}-{lac}-{cid}")
+                    print(f"Status: Mylnikov have no result for {'-'.join(tower)}")
             else:
-                print(f"Status: Mylnikov HTTP error: {response.status_code}")
+                print(f"Status: Mylnikov HTTP error: {response.status}")
         except Exception as e:
             print("Status: Mylnikov error:", e)
 
-        return None
\ No newline at end of file
+        return None
+
+    @staticmethod
+    def get_locations_from_mylnikov(towers):
+        # Baz istasyonları yer değiştirmez; bulunan konumlar oturumlar arası saklanır, sadece yeni kuleler sorgulanır
+        cache = result_cache()
+        locations = {tower: cache.get("towers", tower) for tower in towers}
+        missing = [tower for tower, latlon in locations.items() if latlon is None]
+
+        urls = {tower: gpsCellularAnalyzer.mylnikov_url(*tower) for tower in missing}
+        valid = [tower for tower, url in urls.items() if url]
+        responses = http_client().fetch_many([urls[tower] for tower in valid], timeout=15) if valid else []
+
+        for tower, response in zip(valid, responses):
+            locations[tower] = gpsCellularAnalyzer.parse_mylnikov_response(response, tower)
+            if locations[tower] is not None:
+                cache.put("towers", tower, locations[tower])
+
+        if len(missing) < len(towers):
+            print(f"Status: {len(towers) - len(missing)} tower locations loaded from cache.")
+        return locations
+
+    def get_location_from_mylnikov(self, mcc, mnc, lac_hex, cid_hex):
+        tower = (mcc, mnc, lac_hex, cid_hex)
+        return self.get_locations_from_mylnikov([tower])[tower]
+
+def convert_nmea_to_decimal(coord_str):
+    try:
+        direction = coord_str[-1]  # Son karakter yön
+        value = float(coord_str[:-1])  # Son karakter hariç sayısal değer
+
+        degrees = int(value // 100)
+        minutes = value - degrees * 100
+        decimal = degrees + minutes / 60
+
+        if direction in ["S", "W"]:
+            decimal = -decimal
+
+        return decimal
+    except Exception as e:
+        print(f"Status: Conversion failed for {coord_str}: {e}")
+        return None
+
+def pwr_histogram(df):
+    # Kule başına PWR histogramı (5 dBm aralık); çizim için sadece sayımlar döner
+    if not all(col in df.columns for col in ["MMC", "MNC", "LAC", "Id", "PWR"]):
+        return None
+
+    device_id = str(df["DeviceId"].iloc[0]) if "DeviceId" in df.columns else "Unknown"
+    valid_pwr = df["PWR"][df["PWR"] < 0]
+    if valid_pwr.empty:
+        return {"device_id": device_id, "bins": [], "towers": []}
+
+    min_pwr = int(valid_pwr.min() // 5 * 5)
+    max_pwr = int(valid_pwr.max() // 5 * 5) + 5
+    bins = list(range(min_pwr, max_pwr + 1, 5))
+
+    towers = []
+    for (mcc, mnc, lac, cid), group in df.groupby(["MMC", "MNC", "LAC", "Id"]):
+        tower_pwr = group["PWR"]
+        tower_pwr = tower_pwr[tower_pwr < 0]
+        if tower_pwr.empty:
+            continue
+        counts, _ = np.histogram(tower_pwr, bins=bins)
+        towers.append((f"{mcc}-{mnc}-{lac}-{cid}", counts))
+    return {"device_id": device_id, "bins": bins, "towers": towers}
+
+def draw_pwr_histogram(axes, histogram):
+    bins = histogram["bins"]
+    for label, counts in histogram["towers"]:
+        # Sayımlar havuzda hesaplandı; ağırlıklı hist aynı çubukları çizer
+        axes.hist(
+            bins[:-1],
+            bins=bins,
+            weights=counts,
+            alpha=1,
+            label=label
+        )
+
+    axes.set_title(f"Cell Tower - PWR Histogram (Device ID: {histogram['device_id']})")
+    axes.set_xlabel("PWR (Signal Strength, dBm)")
+    axes.set_ylabel("Data Count")
+    axes.legend(fontsize='x-small')
+    axes.grid(True)
+
+def prepare_gps_analysis(df):
+    # Worker process içinde çalışır: koordinat kontrolü, kule listesi ve histogram GUI sürecinin dışında hesaplanır
+    prepared = {"device": None, "towers": [], "histogram": None}
+    try:
+        print("Status: Checking device coordinates...")
+        device_df = df[(df["Lat"] != "-999") & (df["Lon"] != "-999")]
+        if device_df.empty:
+            raise ValueError("No valid coordinates found.")
+
+        latest = device_df.sort_values("LogDate").iloc[-1]
+        device_lat = convert_nmea_to_decimal(latest["Lat"])
+        device_lon = convert_nmea_to_decimal(latest["Lon"])
+
+        if device_lat is None or device_lon is None:
+            raise ValueError("Invalid coordinates.")
+
+        print(f"Status: Device coordinates OK - Lat: {device_lat}, Lon: {device_lon}")
+
+    except Exception as e:
+        print(f"Status: Map generation failed - {e}")
+        return prepared
+
+    prepared["device"] = (device_lat, device_lon)
+    if all(col in df.columns for col in ["MMC", "MNC", "LAC", "Id"]):
+        unique_stations = df[["MMC", "MNC", "LAC", "Id"]].drop_duplicates().dropna()
+        prepared["towers"] = [tuple(str(value) for value in row) for row in unique_stations.itertuples(index=False, name=None)]
+    prepared["histogram"] = pwr_histogram(df)
+    return prepared
+
+def lookup_tower_locations(towers):
+    # Tüm baz istasyonları aynı anda sorgulanır (host başına eşzamanlılık sınırı asyncHttp'de)
+    with span("gps.tower_lookup", towers=len(towers)) as lookup_span:
+        locations = gpsCellularAnalyzer.get_locations_from_mylnikov(towers)
+        lookup_span.set(found=sum(1 for latlon in locations.values() if latlon))
+    return locations
+
+def prepare_gps_map(df):
+    # QThread worker'da çalışır: pandas işleri havuzda, kule sorguları (I/O) bu thread'de
+    with span("gps.prepare", rows=len(df)):
+        prepared = run_in_process(prepare_gps_analysis, df)
+    if prepared["device"] is not None:
+        prepared["locations"] = lookup_tower_locations(prepared["towers"])
+    return prepared
@@ -0,0 +1,107 @@
+import os
+import time
+import tempfile
+import threading
+import configparser
+from contextlib import contextmanager
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+LOCK_TIMEOUT = 10
+
+def _try_lock(handle):
+    if os.name == "nt":
+        handle.seek(0)
+        msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+    else:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+def _unlock(handle):
+    if os.name == "nt":
+        handle.seek(0)
+        msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+@contextmanager
+def file_lock(path, timeout=LOCK_TIMEOUT):
+    # Kilit asıl dosya yerine yanındaki .lock dosyasında tutulur; asıl dosya rename ile değiştiği için
+    lock_path = path + ".lock"
+    with open(lock_path, "a+") as handle:
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                _try_lock(handle)
+                break
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"Could not lock {path} within {timeout} s")
+                time.sleep(0.05)
+        try:
+            yield
+        finally:
+            _unlock(handle)
+
+def read_ini(path):
+    config = configparser.ConfigParser()
+    if os.path.exists(path):
+        config.read(path)
+    return config
+
+def write_ini(path, config):
+    # Önce aynı klasörde geçici dosyaya yazılır, sonra tek adımda yerine taşınır;
+    # okuyanlar ya eski ya yeni dosyayı görür, yarım yazılmış dosyayı asla görmez.
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as file:
+            config.write(file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, path)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+@contextmanager
+def update_ini(path, timeout=LOCK_TIMEOUT):
+    # Oku-değiştir-yaz döngüsü kilit altında yapılır; paralel güncellemeler birbirini ezmez
+    with file_lock(path, timeout):
+        config = read_ini(path)
+        yield config
+        write_ini(path, config)
+
+class IniBatch:
+    # Güncellemeler bellekte biriktirilir ve dosya başına tek kilit + tek yazma ile uygulanır.
+    # value=None anahtarı siler.
+    def __init__(self):
+        self.pending = {}
+        self.lock = threading.Lock()
+
+    def set(self, path, section, key, value):
+        with self.lock:
+            self.pending.setdefault(path, {})[(section, key)] = value
+
+    def update(self, path, section, values):
+        for key, value in values.items():
+            self.set(path, section, key, value)
+
+    def flush(self):
+        with self.lock:
+            pending, self.pending = self.pending, {}
+
+        for path, updates in pending.items():
+            with update_ini(path) as config:
+                for (section, key), value in updates.items():
+                    if section not in config:
+                        config[section] = {}
+                    if value is None:
+                        config[section].pop(key, None)
+                    else:
+                        config[section][key] = str(value)
+        return len(pending)
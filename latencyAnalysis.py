@@ -0,0 +1,324 @@
+import numpy as np
+import pandas as pd
+
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QTableWidget, QTableWidgetItem, QSpinBox
+)
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = None
+
+DATE_FORMAT = "%d/%m/%Y %H:%M:%S"
+
+# Raporlanan yüzdelikler
+PERCENTILES = [0.5, 0.95, 0.99]
+# Sketch'in göreli hatası: tahmin edilen yüzdelik gerçek değerden en fazla %1 sapar
+SKETCH_ACCURACY = 0.01
+# Bu değerin altındaki (mutlak) gecikmeler sıfır kovasına sayılır; zaman damgaları saniye çözünürlüğünde
+SKETCH_MIN_VALUE = 0.5
+
+# Biriktirip toplu gönderme (flush): sunucuya en fazla BURST_GAP_SECONDS arayla art arda gelen satırlar bir gruptur.
+# Grup en az BURST_MIN_ROWS satırsa ve cihaz zamanındaki yayılımı sunucu zamanındakinin BURST_COMPRESSION katıysa
+# (saatlerce ölçülen veri birkaç saniyede geldiyse) burst sayılır. Canlı akışta bu oran ~1'dir.
+BURST_GAP_SECONDS = 10
+BURST_MIN_ROWS = 5
+BURST_COMPRESSION = 10
+
+# Kırılım grupları: görünen isim -> sütunlar
+LATENCY_GROUPS = {
+    "Operator": ["Operator"],
+    "Tower": ["MMC", "MNC", "LAC", "Id"],
+}
+
+class LatencySketch:
+    # DDSketch benzeri log kovalı histogram: |v| değeri ceil(log_gamma(|v|)) kovasına sayılır, negatifler
+    # (cihaz saati ileride) ayrı tutulur. Kova sayısı veri boyutundan bağımsızdır (1 sn - 1 yıl ~ 900 kova);
+    # kovalar toplanarak birleştirilir, böylece filo yüzdelikleri satırlar bellekte olmadan hesaplanır.
+    def __init__(self, accuracy=SKETCH_ACCURACY):
+        self.accuracy = accuracy
+        self.gamma = (1 + accuracy) / (1 - accuracy)
+        self.log_gamma = np.log(self.gamma)
+        self.positive = {}
+        self.negative = {}
+        self.zero = 0
+        self.count = 0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def _add_buckets(self, store, values):
+        keys, counts = np.unique(np.ceil(np.log(values) / self.log_gamma).astype(np.int64), return_counts=True)
+        for key, count in zip(keys.tolist(), counts.tolist()):
+            store[key] = store.get(key, 0) + count
+
+    def add(self, values):
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return self
+
+        small = np.abs(values) < SKETCH_MIN_VALUE
+        self.zero += int(small.sum())
+        self._add_buckets(self.positive, values[~small & (values > 0)])
+        self._add_buckets(self.negative, -values[~small & (values < 0)])
+
+        self.count += len(values)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        return self
+
+    def merge(self, other):
+        if other is None or not other.count:
+            return self
+        if other.accuracy != self.accuracy:
+            raise ValueError("Cannot merge latency sketches with different accuracy.")
+        for store, other_store in ((self.positive, other.positive), (self.negative, other.negative)):
+            for key, count in other_store.items():
+                store[key] = store.get(key, 0) + count
+        self.zero += other.zero
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def _bucket_values(self, keys):
+        # Kovanın temsil değeri: [gamma^(k-1), gamma^k] aralığında göreli hatayı en aza indiren nokta
+        return 2 * np.power(self.gamma, np.asarray(keys, dtype=float)) / (self.gamma + 1)
+
+    def quantiles(self, quantiles=PERCENTILES):
+        if not self.count:
+            return {q: None for q in quantiles}
+
+        # Kovalar küçükten büyüğe: en büyük negatiften başlayarak, sıfır, sonra pozitifler
+        negative_keys = sorted(self.negative, reverse=True)
+        positive_keys = sorted(self.positive)
+        values = np.concatenate([-self._bucket_values(negative_keys), [0.0], self._bucket_values(positive_keys)])
+        counts = np.array([self.negative[k] for k in negative_keys] + [self.zero] + [self.positive[k] for k in positive_keys])
+        cumulative = np.cumsum(counts)
+
+        ranks = np.asarray(quantiles, dtype=float) * (self.count - 1)
+        positions = np.searchsorted(cumulative, ranks, side="right")
+        estimates = np.clip(values[positions], self.min, self.max)
+        return {q: float(value) for q, value in zip(quantiles, estimates)}
+
+    def quantile(self, q):
+        return self.quantiles([q])[q]
+
+def _parse_times(series):
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+    parsed = None
+    if pa is not None:
+        # Arrow strptime pandas'ın format'lı çözümlemesinden ~20x hızlı
+        try:
+            values = pa.array(series.to_numpy(dtype=object), type=pa.string(), from_pandas=True)
+            times = pc.strptime(values, format=DATE_FORMAT, unit="s", error_is_null=True)
+            parsed = pd.Series(times.to_numpy(zero_copy_only=False), index=series.index)
+        except (pa.ArrowException, TypeError):
+            parsed = None
+    if parsed is None:
+        parsed = pd.to_datetime(series, format=DATE_FORMAT, errors="coerce")
+    # Portal formatı dışında kalanlar (ISO vb.) için genel çözümleme, sadece çözülemeyen satırlarda
+    missing = parsed.isna() & series.notna()
+    if missing.any():
+        parsed[missing] = pd.to_datetime(series[missing], errors="coerce", dayfirst=True)
+    return parsed
+
+def _delay_seconds(created, logged):
+    return (created - logged).dt.total_seconds().to_numpy(dtype=float, na_value=np.nan)
+
+def latency_seconds(df):
+    # Satır başına gecikme: sunucuya geliş (CreatedOn) - cihaz zamanı (LogDate), saniye
+    if "LogDate" not in df.columns or "CreatedOn" not in df.columns:
+        return np.full(len(df), np.nan)
+    return _delay_seconds(_parse_times(df["CreatedOn"]), _parse_times(df["LogDate"]))
+
+def latency_sketch(df, accuracy=SKETCH_ACCURACY):
+    return LatencySketch(accuracy).add(latency_seconds(df))
+
+def _flush_bursts(created, logged, gap_seconds, min_rows):
+    # created/logged: int64 saniye, CreatedOn'a göre sıralı. Dönen: (grup başlangıçları, boyutlar, burst maskesi)
+    new_group = np.ones(len(created), dtype=bool)
+    new_group[1:] = np.diff(created) > gap_seconds
+    starts = np.flatnonzero(new_group)
+    sizes = np.diff(np.append(starts, len(created)))
+
+    created_span = np.maximum.reduceat(created, starts) - np.minimum.reduceat(created, starts)
+    logged_span = np.maximum.reduceat(logged, starts) - np.minimum.reduceat(logged, starts)
+    burst = (sizes >= min_rows) & (logged_span >= BURST_COMPRESSION * np.maximum(created_span, 1))
+    return starts, sizes, burst
+
+class LatencyResult:
+    # frame: gecikmesi hesaplanabilen satırlar (CreatedOn'a göre sıralı), Delay (s) ve Burst sütunlarıyla
+    def __init__(self, frame, sketch, bursts):
+        self.frame = frame
+        self.sketch = sketch
+        self.bursts = bursts
+
+    def summary(self):
+        delays = self.frame["Delay (s)"]
+        percentiles = self.sketch.quantiles(PERCENTILES)
+        return {
+            "Rows": len(delays),
+            "Mean": float(delays.mean()) if len(delays) else None,
+            **{f"p{round(q * 100)}": value for q, value in percentiles.items()},
+            "Max": float(delays.max()) if len(delays) else None,
+            "Clock Skew Rows": int((delays < 0).sum()),
+            "Bursts": len(self.bursts),
+            "Burst Rows": int(self.frame["Burst"].sum()),
+        }
+
+    def breakdown(self, group="Operator"):
+        columns = [col for col in LATENCY_GROUPS[group] if col in self.frame.columns]
+        if not columns or self.frame.empty:
+            return pd.DataFrame(columns=[group, "Rows", "Mean (s)"] + [f"p{round(q * 100)} (s)" for q in PERCENTILES]
+                                + ["Max (s)", "Burst Rows"])
+
+        grouped = self.frame.groupby(columns, sort=False, dropna=False)
+        delays = grouped["Delay (s)"]
+        table = pd.DataFrame({
+            "Rows": delays.size(),
+            "Mean (s)": delays.mean(),
+            **{f"p{round(q * 100)} (s)": delays.quantile(q) for q in PERCENTILES},
+            "Max (s)": delays.max(),
+            "Burst Rows": grouped["Burst"].sum(),
+        }).reset_index()
+
+        # Grup anahtarları tek etikette birleştirilir (kule: MMC-MNC-LAC-Id), sadece toplanmış satırlarda
+        labels = table[columns[0]].astype(str)
+        for col in columns[1:]:
+            labels = labels + "-" + table[col].astype(str)
+        table = table.drop(columns=columns)
+        table.insert(0, group, labels)
+        return table.sort_values(f"p{round(PERCENTILES[-1] * 100)} (s)", ascending=False, kind="stable").round(1)
+
+def evaluate_latency(df, gap_seconds=BURST_GAP_SECONDS, min_rows=BURST_MIN_ROWS):
+    key_columns = [col for columns in LATENCY_GROUPS.values() for col in columns if col in df.columns]
+    if "LogDate" in df.columns and "CreatedOn" in df.columns:
+        logged, created = _parse_times(df["LogDate"]), _parse_times(df["CreatedOn"])
+        delays = _delay_seconds(created, logged)
+    else:
+        logged = created = pd.Series(pd.NaT, index=df.index, dtype="datetime64[s]")
+        delays = np.full(len(df), np.nan)
+
+    frame = pd.DataFrame({
+        "LogDate": logged,
+        "CreatedOn": created,
+        "Delay (s)": delays,
+        **{col: df[col] for col in key_columns},
+    })
+    frame = frame[~np.isnan(delays)].sort_values("CreatedOn", kind="stable").reset_index(drop=True)
+    frame["Burst"] = False
+
+    sketch = LatencySketch().add(frame["Delay (s)"].to_numpy())
+    if frame.empty:
+        return LatencyResult(frame, sketch, pd.DataFrame())
+
+    created = frame["CreatedOn"].to_numpy(dtype="datetime64[s]").astype(np.int64)
+    logged = frame["LogDate"].to_numpy(dtype="datetime64[s]").astype(np.int64)
+    delay_values = frame["Delay (s)"].to_numpy()
+    starts, sizes, burst = _flush_bursts(created, logged, gap_seconds, min_rows)
+    frame["Burst"] = np.repeat(burst, sizes)
+
+    burst_starts, burst_sizes = starts[burst], sizes[burst]
+    ends = burst_starts + burst_sizes - 1
+    bursts = pd.DataFrame({
+        "Flushed At": frame["CreatedOn"].to_numpy()[burst_starts],
+        "Rows": burst_sizes,
+        "Oldest LogDate": pd.to_datetime(np.minimum.reduceat(logged, starts)[burst], unit="s"),
+        "Newest LogDate": pd.to_datetime(np.maximum.reduceat(logged, starts)[burst], unit="s"),
+        "Flush Duration (s)": created[ends] - created[burst_starts],
+        "Max Delay (s)": np.maximum.reduceat(delay_values, starts)[burst],
+    })
+    return LatencyResult(frame, sketch, bursts.sort_values("Flushed At", ascending=False).reset_index(drop=True))
+
+def _format_seconds(value):
+    if value is None or pd.isna(value):
+        return "N/A"
+    sign = "-" if value < 0 else ""
+    value = abs(value)
+    if value < 60:
+        return f"{sign}{value:.0f}s"
+    if value < 3600:
+        return f"{sign}{value / 60:.1f}m"
+    return f"{sign}{value / 3600:.1f}h"
+
+class LatencyDialog(QDialog):
+    def __init__(self, tester, df, result=None, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Transmission Latency")
+        self.resize(1000, 700)
+
+        self.tester = tester
+        self.df = df
+        self.result = result if result is not None else tester.latency(df)
+
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+
+        # === AYARLAR ===
+        controls = QHBoxLayout()
+        controls.addWidget(QLabel("Group By:"))
+        self.group_combo = QComboBox()
+        self.group_combo.addItems(list(LATENCY_GROUPS))
+        self.group_combo.currentIndexChanged.connect(self.update_breakdown)
+        controls.addWidget(self.group_combo)
+
+        controls.addWidget(QLabel("Burst Gap (s):"))
+        self.gap_spin = QSpinBox()
+        self.gap_spin.setRange(1, 3600)
+        self.gap_spin.setValue(BURST_GAP_SECONDS)
+        self.gap_spin.editingFinished.connect(self.reevaluate)
+        controls.addWidget(self.gap_spin)
+
+        controls.addWidget(QLabel("Burst Min Rows:"))
+        self.rows_spin = QSpinBox()
+        self.rows_spin.setRange(2, 100000)
+        self.rows_spin.setValue(BURST_MIN_ROWS)
+        self.rows_spin.editingFinished.connect(self.reevaluate)
+        controls.addWidget(self.rows_spin)
+        controls.addStretch()
+        layout.addLayout(controls)
+
+        self.info_label = QLabel()
+        layout.addWidget(self.info_label)
+
+        # === OPERATÖR / KULE KIRILIMI ===
+        self.breakdown_table = QTableWidget()
+        layout.addWidget(self.breakdown_table)
+
+        # === TOPLU GÖNDERİMLER ===
+        layout.addWidget(QLabel("Buffered-and-flushed bursts:"))
+        self.burst_table = QTableWidget()
+        layout.addWidget(self.burst_table)
+
+        self.update_tables()
+
+    def reevaluate(self):
+        self.result = self.tester.latency(self.df, self.gap_spin.value(), self.rows_spin.value())
+        self.update_tables()
+
+    def update_tables(self):
+        summary = self.result.summary()
+        self.info_label.setText(
+            f"Rows: {summary['Rows']} | "
+            + " | ".join(f"{name}: {_format_seconds(summary[name])}" for name in ["p50", "p95", "p99", "Max"])
+            + f" | Clock Skew Rows: {summary['Clock Skew Rows']}"
+            + f" | Bursts: {summary['Bursts']} ({summary['Burst Rows']} rows)"
+        )
+        self.update_breakdown()
+        self.fill_table(self.burst_table, self.result.bursts)
+
+    def update_breakdown(self):
+        self.fill_table(self.breakdown_table, self.result.breakdown(self.group_combo.currentText()))
+
+    def fill_table(self, table, df):
+        table.clear()
+        table.setRowCount(len(df))
+        table.setColumnCount(len(df.columns))
+        table.setHorizontalHeaderLabels(list(df.columns))
+        for i, row in enumerate(df.itertuples(index=False, name=None)):
+            for j, value in enumerate(row):
+                table.setItem(i, j, QTableWidgetItem(str(value)))
@@ -0,0 +1,184 @@
+import io
+import os
+import pickle
+import atexit
+import threading
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import nullcontext, redirect_stdout
+
+import pandas as pd
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from fetchTrace import current_span, current_trace, start_trace
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+# False yapılırsa tüm işler çağıran thread'de çalışır (hata ayıklama için)
+PROCESS_POOL_ENABLED = True
+MAX_WORKERS = os.cpu_count() or 1
+
+class FramePayload:
+    # Süreçler arası DataFrame taşıyıcısı: Arrow IPC stream (sütunlar tek blok halinde kopyalanır),
+    # pyarrow yoksa veya sütun tipleri Arrow'a uymuyorsa pickle
+    __slots__ = ("kind", "data")
+
+    def __init__(self, df):
+        self.kind = "pickle"
+        if pa is not None:
+            try:
+                table = pa.Table.from_pandas(df)
+                sink = pa.BufferOutputStream()
+                with pa.ipc.new_stream(sink, table.schema) as writer:
+                    writer.write_table(table)
+                self.kind = "arrow"
+                self.data = sink.getvalue().to_pybytes()
+                return
+            except (pa.ArrowException, TypeError, ValueError):
+                pass
+        self.data = pickle.dumps(df, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def frame(self):
+        if self.kind == "arrow":
+            return pa.ipc.open_stream(self.data).read_all().to_pandas()
+        return pickle.loads(self.data)
+
+    def __getstate__(self):
+        return self.kind, self.data
+
+    def __setstate__(self, state):
+        self.kind, self.data = state
+
+def _encode(value):
+    # Üst seviye DataFrame'ler ve tuple/list/dict içindekiler (bir seviye) paketlenir
+    if isinstance(value, pd.DataFrame):
+        return FramePayload(value)
+    if isinstance(value, (tuple, list)):
+        return type(value)(_encode_item(item) for item in value)
+    if isinstance(value, dict):
+        return {key: _encode_item(item) for key, item in value.items()}
+    return value
+
+def _encode_item(value):
+    return FramePayload(value) if isinstance(value, pd.DataFrame) else value
+
+def _decode(value):
+    if isinstance(value, FramePayload):
+        return value.frame()
+    if isinstance(value, (tuple, list)):
+        return type(value)(item.frame() if isinstance(item, FramePayload) else item for item in value)
+    if isinstance(value, dict):
+        return {key: item.frame() if isinstance(item, FramePayload) else item for key, item in value.items()}
+    return value
+
+def _run_task(func, args, kwargs, traced=False):
+    # Worker process tarafı. Konsol çıktısı yakalanır ve ana süreçte tekrar yazılır (ConsoleWidget'ta görünsün).
+    # traced: gönderen thread'de aktif trace var; worker'daki span'ler kaydedilip sonuçla birlikte döner
+    output = io.StringIO()
+    trace = None
+    try:
+        with redirect_stdout(output), (start_trace("worker") if traced else nullcontext()) as trace:
+            result = func(*_decode(args), **_decode(kwargs))
+        return _encode(result), output.getvalue(), None, _worker_spans(trace)
+    except Exception as e:
+        return None, output.getvalue(), e, _worker_spans(trace)
+
+def _worker_spans(trace):
+    return trace.export_spans() if trace is not None else []
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def process_pool():
+    global _pool
+    if not PROCESS_POOL_ENABLED or multiprocessing.parent_process() is not None:
+        # Worker process içinden yeni havuz açılmaz
+        return None
+    with _pool_lock:
+        if _pool is None:
+            # spawn: alt süreçler GUI'nin stdout yönlendirmesini ve thread'lerini miras almasın
+            context = multiprocessing.get_context("spawn")
+            _pool = ProcessPoolExecutor(max_workers=MAX_WORKERS, mp_context=context)
+        return _pool
+
+def shutdown_process_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+def _reset_broken_pool(pool):
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+
+atexit.register(shutdown_process_pool)
+
+def submit(func, *args, **kwargs):
+    # func modül seviyesinde tanımlı olmalı (spawn ile pickle edilir). Dönen Future'ın sonucu çözülmüş DataFrame'dir.
+    result = Future()
+    pool = process_pool()
+    if pool is None:
+        try:
+            result.set_result(func(*args, **kwargs))
+        except Exception as e:
+            result.set_exception(e)
+        return result
+
+    # Worker'daki span'ler gönderildiği andaki span'in altına eklenir (callback başka thread'de çalışır)
+    trace = current_trace()
+    parent_span = current_span()
+    try:
+        future = pool.submit(_run_task, func, _encode(args), _encode(kwargs), trace is not None)
+    except BrokenProcessPool:
+        # Bir worker çöktüyse havuz yeniden kurulur
+        _reset_broken_pool(pool)
+        return submit(func, *args, **kwargs)
+
+    def done(future):
+        try:
+            payload, output, error, spans = future.result()
+            if output:
+                print(output, end="")
+            if trace is not None and spans:
+                trace.attach_spans(spans, parent_span)
+            if error is not None:
+                result.set_exception(error)
+            else:
+                result.set_result(_decode(payload))
+        except BrokenProcessPool as e:
+            _reset_broken_pool(pool)
+            result.set_exception(e)
+        except Exception as e:
+            result.set_exception(e)
+
+    future.add_done_callback(done)
+    return result
+
+def run_in_process(func, *args, **kwargs):
+    # Bekleyen thread GIL'i bırakır; GUI thread'inden değil, QThread worker'lardan çağrılmalı
+    return submit(func, *args, **kwargs).result()
+
+class TaskWorker(QObject):
+    # Herhangi bir fonksiyonu QThread içinde çalıştırır (fonksiyon ağır kısmı run_in_process ile havuza verir)
+    finished = pyqtSignal(object)
+    error = pyqtSignal(str)
+
+    def __init__(self, func, *args, **kwargs):
+        super().__init__()
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+
+    def run(self):
+        try:
+            self.finished.emit(self.func(*self.args, **self.kwargs))
+        except Exception as e:
+            self.error.emit(str(e))
@@ -0,0 +1,400 @@
+import io
+import os
+import html
+import base64
+from concurrent.futures import as_completed
+from datetime import datetime
+from math import cos, radians
+
+import pandas as pd
+from geopy.distance import geodesic
+from matplotlib import rc_context
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.backends.backend_pdf import PdfPages
+
+from PyQt5.QtCore import Qt, QObject, QThread, pyqtSignal
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QListWidget, QListWidgetItem, QLineEdit,
+    QComboBox, QPushButton, QFileDialog, QMessageBox
+)
+
+from dataFetch import filter_by_date_range, load_cached_frame
+from defaultTests import DataTests, summary_frame
+from deviceRegistry import DeviceRegistry
+from fetchTrace import start_trace
+from fleetSummary import build_error_rate_matrix, list_drep_devices
+from gpsCellular import draw_pwr_histogram, lookup_tower_locations, prepare_gps_analysis
+from processPool import submit
+from testRules import load_rules
+
+REPORTS_OUTPUT_DIR = os.path.join(os.getcwd(), "Test Reports")
+REPORT_FORMATS = {"HTML": ".html", "PDF": ".pdf"}
+
+# Hatalı satır tablolarında gösterilen sütunlar (çerçevede olanlar) ve test başına en fazla satır
+REPORT_COLUMNS = [
+    "LogDate", "Status", "Bat", "PWR", "Operator", "Malfunction", "Defect Code", "AccStatus",
+    "Main Board PCB Humidity", "Soil Moisture Sensor PCB Humidity", "DeltaSeconds_TS",
+]
+MAX_FAILING_ROWS = 200
+# PDF'te tablo sayfası başına satır (A4 yatay)
+PDF_TABLE_ROWS = 60
+PDF_RC = {"pdf.use14corefonts": True, "font.family": "sans-serif", "font.monospace": ["Courier"]}
+
+REPORT_STYLE = """
+body { font-family: Arial, sans-serif; margin: 24px; color: #222; }
+h1 { font-size: 20px; } h2 { font-size: 16px; margin-top: 28px; }
+table { border-collapse: collapse; font-size: 12px; margin-bottom: 8px; }
+th, td { border: 1px solid #ccc; padding: 3px 8px; text-align: left; }
+th { background: #f0f0f0; }
+.error td { background: #fde2e2; } .warning td { background: #fff4d6; }
+.note { color: #777; font-size: 12px; }
+img { max-width: 100%; }
+"""
+
+def render_histogram(histogram, figure=None):
+    figure = figure or Figure(figsize=(8, 4.5))
+    axes = figure.add_subplot(111)
+    if histogram is None or not histogram["towers"]:
+        axes.text(0.5, 0.5, "No valid PWR data", ha="center", va="center")
+        axes.set_axis_off()
+        return figure
+    draw_pwr_histogram(axes, histogram)
+    figure.tight_layout()
+    return figure
+
+def render_tower_map(device, towers, locations, figure=None):
+    # Statik harita: cihaz merkezde, bulunan kuleler mesafe etiketiyle (folium haritasının rapor karşılığı)
+    figure = figure or Figure(figsize=(8, 6))
+    axes = figure.add_subplot(111)
+    if device is None:
+        axes.text(0.5, 0.5, "No valid device coordinates", ha="center", va="center")
+        axes.set_axis_off()
+        return figure
+
+    device_lat, device_lon = device
+    located = 0
+    for tower in towers:
+        latlon = locations.get(tower)
+        if not latlon:
+            continue
+        located += 1
+        distance_m = geodesic(device, latlon).km * 1000
+        axes.plot([device_lon, latlon[1]], [device_lat, latlon[0]], color="green", linestyle="--", linewidth=0.8)
+        axes.plot(latlon[1], latlon[0], marker="^", color="red", markersize=9,
+                  label="Base Station" if located == 1 else None)
+        axes.annotate(f"{'-'.join(tower)}\n{distance_m:.0f}m", (latlon[1], latlon[0]),
+                      textcoords="offset points", xytext=(6, 6), fontsize=7)
+    axes.plot(device_lon, device_lat, marker="o", color="blue", markersize=9, label="Device")
+
+    # Boylam dereceleri enleme göre kısalır; eksen oranı düzeltilmezse mesafeler yanıltıcı görünür
+    axes.set_aspect(1 / max(cos(radians(device_lat)), 0.01), adjustable="datalim")
+    axes.set_title(f"Device & Base Stations ({located}/{len(towers)} towers located)")
+    axes.set_xlabel("Longitude")
+    axes.set_ylabel("Latitude")
+    axes.grid(True)
+    axes.legend(fontsize="x-small")
+    figure.tight_layout()
+    return figure
+
+def figure_png(figure):
+    # Sadece Agg canvas'ı kullanılır; worker süreçlerinde GUI backend'i yüklenmez
+    FigureCanvasAgg(figure)
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format="png", dpi=110)
+    return base64.b64encode(buffer.getvalue()).decode("ascii")
+
+def build_device_report(device_id, start_date=None, end_date=None, drep_path=None):
+    df = load_cached_frame(device_id)
+    if df is None or df.empty:
+        return None
+
+    df = filter_by_date_range(df, start_date, end_date)
+    tester = DataTests(load_rules(drep_path=drep_path))
+    df, _ = tester.add_time_difference_column(df)
+    summary_rows = tester.run_summary(df)
+
+    failing = []
+    for name, filtered_df in tester.iter_test_frames(df):
+        errors = dict((row[0], row[1]) for row in summary_rows).get(name, 0)
+        if not errors:
+            continue
+        columns = [col for col in REPORT_COLUMNS if col in filtered_df.columns]
+        failing.append((name, errors, filtered_df[columns].head(MAX_FAILING_ROWS)))
+
+    prepared = prepare_gps_analysis(df)
+    # Kule konumları result cache'ten gelir; sadece daha önce görülmemiş kuleler sorgulanır
+    locations = lookup_tower_locations(prepared["towers"]) if prepared["device"] is not None else {}
+
+    summary = summary_frame(device_id, summary_rows).drop(columns=["Device ID"])
+    summary["Severity"] = [tester.severity(name) or "" for name in summary["Test"]]
+    return {
+        "device_id": device_id,
+        "rows": len(df),
+        "start": df["LogDate"].min() if len(df) else None,
+        "end": df["LogDate"].max() if len(df) else None,
+        "summary_rows": summary_rows,
+        "summary": summary,
+        "failing": failing,
+        "histogram": prepared["histogram"],
+        "device": prepared["device"],
+        "towers": prepared["towers"],
+        "locations": locations,
+    }
+
+def _html_table(df, row_classes=None):
+    header = "".join(f"<th>{html.escape(str(col))}</th>" for col in df.columns)
+    body = []
+    for i, row in enumerate(df.itertuples(index=False, name=None)):
+        css = f' class="{row_classes[i]}"' if row_classes and row_classes[i] else ""
+        cells = "".join(f"<td>{html.escape('' if pd.isna(value) else str(value))}</td>" for value in row)
+        body.append(f"<tr{css}>{cells}</tr>")
+    return f"<table><thead><tr>{header}</tr></thead><tbody>{''.join(body)}</tbody></table>"
+
+def write_html_report(report, path):
+    # Tek dosya: stil satır içi, grafikler base64 PNG olarak gömülü
+    summary = report["summary"]
+    row_classes = [
+        severity if errors else "" for severity, errors in zip(summary["Severity"], summary["Error Count"])
+    ]
+    parts = [
+        f"<h1>Device Test Report - {html.escape(report['device_id'])}</h1>",
+        f"<p>Rows: {report['rows']} | Range: {report['start']} - {report['end']} | "
+        f"Generated: {datetime.now():%Y-%m-%d %H:%M:%S}</p>",
+        "<h2>Test Summary</h2>",
+        _html_table(summary, row_classes),
+        "<h2>PWR Histogram</h2>",
+        f'<img src="data:image/png;base64,{figure_png(render_histogram(report["histogram"]))}">',
+        "<h2>Base Station Map</h2>",
+        f'<img src="data:image/png;base64,'
+        f'{figure_png(render_tower_map(report["device"], report["towers"], report["locations"]))}">',
+        "<h2>Failing Rows</h2>",
+    ]
+    if not report["failing"]:
+        parts.append("<p class=\"note\">No failing rows.</p>")
+    for name, errors, rows in report["failing"]:
+        parts.append(f"<h3>{html.escape(name)} ({errors})</h3>")
+        if errors > len(rows):
+            parts.append(f'<p class="note">Showing first {len(rows)} of {errors} rows.</p>')
+        parts.append(_html_table(rows))
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(
+            "<!DOCTYPE html><html><head><meta charset=\"utf-8\">"
+            f"<title>{html.escape(report['device_id'])} Test Report</title><style>{REPORT_STYLE}</style></head>"
+            f"<body>{''.join(parts)}</body></html>"
+        )
+
+def _table_page(title, df, note=None):
+    # Tablo tek bir eş aralıklı metin bloğu olarak yazılır; hücre başına artist (axes.table) sayfa başına saniyeler sürer
+    figure = Figure(figsize=(11.69, 8.27))
+    figure.text(0.04, 0.95, title, fontsize=12, weight="bold")
+    if note:
+        figure.text(0.04, 0.925, note, fontsize=8, color="gray")
+    text = df.map(lambda value: "" if pd.isna(value) else str(value)[:24]).to_string(index=False) if len(df) else "No rows."
+    figure.text(0.04, 0.9, text, family="monospace", fontsize=6.5, va="top")
+    return figure
+
+def write_pdf_report(report, path):
+    device_id = report["device_id"]
+    # PDF'in yerleşik fontları (Helvetica/Courier) kullanılır; glif gömme yazma süresinin çoğunu alıyordu
+    with rc_context(PDF_RC), PdfPages(path) as pdf:
+        pdf.savefig(_table_page(
+            f"Device Test Report - {device_id}",
+            report["summary"],
+            note=f"Rows: {report['rows']} | Range: {report['start']} - {report['end']}",
+        ))
+        pdf.savefig(render_histogram(report["histogram"], Figure(figsize=(11.69, 8.27))))
+        pdf.savefig(render_tower_map(report["device"], report["towers"], report["locations"], Figure(figsize=(11.69, 8.27))))
+        for name, errors, rows in report["failing"]:
+            rows = rows.head(PDF_TABLE_ROWS)
+            note = f"Showing first {len(rows)} of {errors} rows." if errors > len(rows) else None
+            pdf.savefig(_table_page(f"{name} ({errors})", rows, note))
+
+def generate_device_report(device_id, output_dir, fmt="HTML", start_date=None, end_date=None, drep_path=None):
+    # Worker process içinde çalışır: veri cache'ten okunur, GUI'ye sadece dosya yolu ve özet döner
+    with start_trace("report", device_id=device_id) as trace:
+        report = build_device_report(device_id, start_date, end_date, drep_path)
+        if report is None:
+            return device_id, None, None
+        trace.set(rows=report["rows"])
+
+        path = os.path.join(output_dir, f"{device_id}_report{REPORT_FORMATS[fmt]}")
+        if fmt == "PDF":
+            write_pdf_report(report, path)
+        else:
+            write_html_report(report, path)
+        return device_id, path, report["summary_rows"]
+
+def write_report_index(results, output_dir):
+    # Filo paketi giriş sayfası: hata oranı matrisi ve cihaz raporlarına bağlantılar
+    matrix = build_error_rate_matrix({device_id: rows for device_id, (_, rows) in results.items()})
+    links = [
+        f'<li><a href="{html.escape(os.path.basename(path))}">{html.escape(device_id)}</a></li>'
+        for device_id, (path, _) in sorted(results.items())
+    ]
+    path = os.path.join(output_dir, "index.html")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(
+            "<!DOCTYPE html><html><head><meta charset=\"utf-8\"><title>Fleet Test Reports</title>"
+            f"<style>{REPORT_STYLE}</style></head><body>"
+            f"<h1>Fleet Test Reports</h1><p>{len(results)} devices | Generated: {datetime.now():%Y-%m-%d %H:%M:%S}</p>"
+            f"<h2>Error Rates (%)</h2>{_html_table(matrix)}<h2>Device Reports</h2><ul>{''.join(links)}</ul>"
+            "</body></html>"
+        )
+    return path
+
+class ReportWorker(QObject):
+    progress = pyqtSignal(str)
+    finished = pyqtSignal(object)
+    error = pyqtSignal(str)
+
+    def __init__(self, devices, output_dir, fmt="HTML"):
+        super().__init__()
+        self.devices = devices
+        self.output_dir = output_dir
+        self.fmt = fmt
+        self.registry = DeviceRegistry()
+
+    def run(self):
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            # Her cihazın raporu paylaşılan process havuzunda ayrı bir çekirdekte üretilir
+            futures = [
+                submit(
+                    generate_device_report, device["deviceId"], self.output_dir, self.fmt,
+                    device["startDate"], device["endDate"], device["path"]
+                )
+                for device in self.devices
+            ]
+
+            results = {}
+            for done, future in enumerate(as_completed(futures), start=1):
+                try:
+                    device_id, path, summary_rows = future.result()
+                except Exception as e:
+                    self.progress.emit(f"[{done}/{len(futures)}] Report failed - {e}")
+                    continue
+                if path is None:
+                    self.progress.emit(f"[{done}/{len(futures)}] {device_id}: no cached data, skipped.")
+                    continue
+                results[device_id] = (path, summary_rows)
+                self.registry.record_summary(device_id, summary_rows)
+                self.progress.emit(f"[{done}/{len(futures)}] {device_id}: report written.")
+
+            index_path = write_report_index(results, self.output_dir) if results else None
+            self.finished.emit((results, index_path))
+        except Exception as e:
+            self.error.emit(str(e))
+
+class ReportGenerator(QDialog):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Generate Test Reports")
+        self.resize(600, 500)
+
+        self.busy = False
+
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+
+        # === CİHAZ LİSTESİ ===
+        layout.addWidget(QLabel("Devices (from Device Reports):"))
+        self.device_list = QListWidget()
+        layout.addWidget(self.device_list)
+
+        self.devices = list_drep_devices()
+        for device in self.devices:
+            item = QListWidgetItem(device["deviceId"])
+            item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+            item.setCheckState(Qt.Checked)
+            self.device_list.addItem(item)
+
+        # === ÇIKTI AYARLARI ===
+        output_layout = QHBoxLayout()
+        output_layout.addWidget(QLabel("Output:"))
+        self.output_edit = QLineEdit(REPORTS_OUTPUT_DIR)
+        output_layout.addWidget(self.output_edit)
+        browse_btn = QPushButton("Browse")
+        browse_btn.clicked.connect(self.browse_output)
+        output_layout.addWidget(browse_btn)
+        layout.addLayout(output_layout)
+
+        controls_layout = QHBoxLayout()
+        controls_layout.addWidget(QLabel("Format:"))
+        self.format_combo = QComboBox()
+        self.format_combo.addItems(list(REPORT_FORMATS))
+        controls_layout.addWidget(self.format_combo)
+        controls_layout.addStretch()
+
+        self.run_btn = QPushButton("Generate Reports")
+        self.run_btn.clicked.connect(self.run_reports)
+        controls_layout.addWidget(self.run_btn)
+        layout.addLayout(controls_layout)
+
+        self.status_label = QLabel("Ready.")
+        self.status_label.setStyleSheet("color: gray; font-weight: bold;")
+        layout.addWidget(self.status_label)
+
+    def browse_output(self):
+        folder = QFileDialog.getExistingDirectory(self, "Select Output Folder", self.output_edit.text())
+        if folder:
+            self.output_edit.setText(folder)
+
+    def selected_devices(self):
+        checked_ids = {
+            self.device_list.item(i).text()
+            for i in range(self.device_list.count())
+            if self.device_list.item(i).checkState() == Qt.Checked
+        }
+        return [device for device in self.devices if device["deviceId"] in checked_ids]
+
+    def run_reports(self):
+        if self.busy:
+            return
+        devices = self.selected_devices()
+        if not devices:
+            QMessageBox.warning(self, "Warning", "Please select at least one device.")
+            return
+
+        self.busy = True
+        self.run_btn.setEnabled(False)
+        self.status_label.setText(f"Generating {len(devices)} reports...")
+        print(f"Status: Report generation started for {len(devices)} devices.")
+
+        self.thread = QThread()
+        self.worker = ReportWorker(devices, self.output_edit.text().strip() or REPORTS_OUTPUT_DIR,
+                                   self.format_combo.currentText())
+        self.worker.moveToThread(self.thread)
+
+        self.thread.started.connect(self.worker.run)
+        self.worker.progress.connect(self.on_progress)
+        self.worker.finished.connect(self.on_finished)
+        self.worker.error.connect(self.on_error)
+
+        self.worker.finished.connect(self.thread.quit)
+        self.worker.error.connect(self.thread.quit)
+        self.worker.finished.connect(self.worker.deleteLater)
+        self.thread.finished.connect(self.thread.deleteLater)
+
+        self.thread.start()
+
+    def on_progress(self, message):
+        print(f"Status: Reports - {message}")
+        self.status_label.setText(message)
+
+    def on_finished(self, result):
+        self.busy = False
+        self.run_btn.setEnabled(True)
+        results, index_path = result
+        self.status_label.setText(f"{len(results)} reports written.")
+        print(f"Status: Report generation complete. {len(results)} reports.")
+        if index_path:
+            QMessageBox.information(self, "Reports", f"{len(results)} reports written:\n{index_path}")
+
+    def on_error(self, message):
+        self.busy = False
+        self.run_btn.setEnabled(True)
+        self.status_label.setText("Report generation failed.")
+        print(f"Error: Report generation failed - {message}")
+        QMessageBox.critical(self, "Error", f"Report generation failed:\n{message}")
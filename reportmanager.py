@@ -3,6 +3,7 @@ import sys
 import base64
 import hashlib
 import configparser
+import multiprocessing
 
 import pandas as pd
 from cryptography.fernet import Fernet
@@ -15,9 +16,24 @@ from PyQt5.QtWidgets import (
     QDateTimeEdit, QDialogButtonBox, QDialog, QLabel, QSizePolicy
 )
 
-from defaultTests import DataTests, DefaultTests
-from gpsCellular import gpsCellularAnalyzer
-from dataFetch import FetchWorker
+from defaultTests import DataTests, DefaultTests, prepare_summary
+from gpsCellular import gpsCellularAnalyzer, prepare_gps_map
+from testRules import load_rules
+from trendAnalysis import TrendAnalysis
+from timeSeriesViewer import TimeSeriesViewer
+from dataFetch import (
+    FetchWorker, fetch_metadata, filter_by_date_range, load_cached_frame, save_cached_frame, sort_by_timestamp
+)
+from fetchTrace import TraceBreakdown, last_trace, start_trace
+from fleetSummary import FleetSummary
+from deviceRegistry import DeviceBrowser, DeviceRegistry
+from deviceMonitor import DeviceMonitor
+from processPool import TaskWorker, run_in_process
+from sensorHealth import SensorHealthDialog, evaluate_sensor_health
+from latencyAnalysis import LatencyDialog, evaluate_latency
+from telemetryStore import TelemetryStoreDialog, submit_device_partitions
+from reportGenerator import ReportGenerator
+from iniStorage import update_ini, write_ini
 
 
 class MainApp(QMainWindow):
@@ -41,6 +57,10 @@ class MainApp(QMainWindow):
 
         # === Test Yardımcısı Sınıf ===
         self.tester = DataTests()
+        self.background_tasks = []
+
+        # === Cihaz Kayıt İndeksi (Device Reports/*.drep) ===
+        self.registry = DeviceRegistry()
 
         # === Arayüzü İnşa Et ===
         self.build_main_ui()
@@ -60,6 +80,22 @@ class MainApp(QMainWindow):
         create_drep_action = file_menu.addAction("Create .drep File")
         create_drep_action.triggered.connect(self.create_drep_file)
 
+        find_device_action = file_menu.addAction("Find Device")
+        find_device_action.triggered.connect(self.open_device_browser)
+
+        file_menu.addSeparator()
+        fleet_summary_action = file_menu.addAction("Fleet Summary")
+        fleet_summary_action.triggered.connect(self.open_fleet_summary)
+
+        monitoring_action = file_menu.addAction("Monitoring")
+        monitoring_action.triggered.connect(self.open_monitoring)
+
+        telemetry_store_action = file_menu.addAction("Telemetry Store")
+        telemetry_store_action.triggered.connect(self.open_telemetry_store)
+
+        generate_reports_action = file_menu.addAction("Generate Reports")
+        generate_reports_action.triggered.connect(self.open_report_generator)
+
         # === HELP MENU ===
 
         help_menu = menu_bar.addMenu("Help")
@@ -69,6 +105,9 @@ class MainApp(QMainWindow):
         credentials_action = help_menu.addAction("Set Credentials")
         credentials_action.triggered.connect(self.open_credentials_dialog)
 
+        timings_action = help_menu.addAction("Last Fetch Timings")
+        timings_action.triggered.connect(self.show_fetch_timings)
+
         # === ANA LAYOUT ===
         device_layout = QVBoxLayout()
 
@@ -157,6 +196,10 @@ class MainApp(QMainWindow):
         self.test_list = QListWidget()
         self.test_list.addItem("1. Default Tests")
         self.test_list.addItem("2. GPS-Cellular Analyze")
+        self.test_list.addItem("3. Trend Analysis")
+        self.test_list.addItem("4. Time Series Viewer")
+        self.test_list.addItem("5. Sensor Health")
+        self.test_list.addItem("6. Transmission Latency")
         self.test_list.setSelectionMode(QListWidget.SingleSelection)
         self.test_list.setMinimumHeight(200)
         test_group_layout.addWidget(self.test_list)
@@ -219,29 +262,25 @@ class MainApp(QMainWindow):
                 print(f"Status: update_date_range aborted - .drep file not found for ID {device_id}.")
                 return
 
-            config = configparser.ConfigParser()
-            config.read(drep_path)
-
-            if "INFO" not in config:
-                config["INFO"] = {}
-
-            config["INFO"]["startDate"] = start_str
-            print(f"Status: Start date saved as {start_str}")
+            with update_ini(drep_path) as config:
+                if "INFO" not in config:
+                    config["INFO"] = {}
 
-            if end_str:
-                config["INFO"]["endDate"] = end_str
-                print(f"Status: End date saved as {end_str}")
-            elif "endDate" in config["INFO"]:
-                del config["INFO"]["endDate"]
-                print("Status: End date removed from config.")
+                config["INFO"]["startDate"] = start_str
+                print(f"Status: Start date saved as {start_str}")
 
-            with open(drep_path, "w") as file:
-                config.write(file)
+                if end_str:
+                    config["INFO"]["endDate"] = end_str
+                    print(f"Status: End date saved as {end_str}")
+                elif "endDate" in config["INFO"]:
+                    del config["INFO"]["endDate"]
+                    print("Status: End date removed from config.")
 
             print("Status: Date range updated in .drep file.")
 
             # TEKRAR OKUMA YAP
             self.load_drep_file(drep_path)
+            self.apply_date_range()
 
 
             msg = f"Start Date: {start_str}"
@@ -252,6 +291,23 @@ class MainApp(QMainWindow):
             print(f"Status: Failed to update date range. Error: {e}")
             QMessageBox.critical(self, "Error", f"Failed to update date range:\n{e}")
 
+    def apply_date_range(self):
+        # Sıralı geçmişte ikili arama ile kesilir (kopya değil görünüm); geçmiş yoksa önbellekten okunur
+        device_id = self.device_display.text().strip()
+        if getattr(self, "history_device_id", None) != device_id:
+            cached_df = load_cached_frame(device_id) if device_id else None
+            if cached_df is None:
+                return
+            self.df_history = sort_by_timestamp(cached_df)
+            self.history_device_id = device_id
+
+        self.df_all = filter_by_date_range(
+            self.df_history,
+            getattr(self, "start_date", None),
+            getattr(self, "end_date", None)
+        )
+        print(f"Status: {len(self.df_all)} of {len(self.df_history)} records in LogDate range.")
+
     def fetch_data(self):
         if hasattr(self, "device_id") and str(self.device_id).isdigit():
             device_id = int(self.device_id)
@@ -286,19 +342,20 @@ class MainApp(QMainWindow):
         def on_finished(df):
             self.set_loading(False)
             if df is not None and not df.empty:
-                df["LogDate"] = pd.to_datetime(df["LogDate"], errors="coerce")
-
-                # Start Date filtresi
-                if hasattr(self, "start_date") and self.start_date:
-                    df = df[df["LogDate"] >= self.start_date]
+                save_cached_frame(device_id, df)
+                # Aylık parquet bölümleri havuzda yazılır, arayüz beklemez
+                submit_device_partitions(str(device_id), df)
+                self.registry.record_fetch(device_id, len(df))
+                self.save_fetch_metadata(df)
 
-                # End Date filtresi
-                if hasattr(self, "end_date") and self.end_date:
-                    if str(self.end_date) != "2000-01-01 00:00:00":
-                        df = df[df["LogDate"] <= self.end_date]
+                # Tüm geçmiş saklanır; tarih aralığı değişince yeniden fetch yerine bundan kesilir
+                self.df_history = sort_by_timestamp(df)
+                self.history_device_id = str(device_id)
+                self.apply_date_range()
 
-                self.df_all = df
-                print(f"Status: {len(df)} records after filtering by LogDate range.")
+                trace = last_trace("fetch")
+                if trace is not None:
+                    print("Status: Fetch timings:\n" + trace.breakdown().to_string(index=False))
 
                 # Başarıyla tamamlanırsa:
                 self.fetch_status_label.setText("Fetch Successful.")
@@ -346,41 +403,223 @@ class MainApp(QMainWindow):
         elif text == "2. GPS-Cellular Analyze":
             self.run_gpscellular_Analyze()
 
+        elif text == "3. Trend Analysis":
+            self.run_trend_analysis()
+
+        elif text == "4. Time Series Viewer":
+            self.run_time_series_viewer()
+
+        elif text == "5. Sensor Health":
+            self.run_sensor_health()
+
+        elif text == "6. Transmission Latency":
+            self.run_latency_analysis()
+
         else:
             QMessageBox.warning(self, "Warning", "Unknown test selected.")
 
+    def run_in_background(self, func, args, on_finished, label):
+        # Ağır işler QThread'de (pandas kısmı processPool'da) çalışır; GUI thread'i sadece sonucu gösterir
+        thread = QThread()
+        worker = TaskWorker(func, *args)
+        worker.moveToThread(thread)
+        self.background_tasks.append((thread, worker))
+        self.set_loading(True)
+
+        def on_done(result):
+            self.set_loading(False)
+            on_finished(result)
+
+        def on_error(message):
+            self.set_loading(False)
+            print(f"Error: {label} failed: {message}")
+            QMessageBox.critical(self, "Error", f"{label} failed:\n{message}")
+
+        def cleanup():
+            self.background_tasks.remove((thread, worker))
+
+        thread.started.connect(worker.run)
+        worker.finished.connect(on_done)
+        worker.error.connect(on_error)
+
+        worker.finished.connect(thread.quit)
+        worker.error.connect(thread.quit)
+        thread.finished.connect(cleanup)
+        thread.finished.connect(worker.deleteLater)
+        thread.finished.connect(thread.deleteLater)
+
+        thread.start()
+
     def run_default_tests(self):
         if not hasattr(self, 'df_all') or self.df_all is None:
             QMessageBox.warning(self, "Warning", "Please fetch data first.")
             return
 
-        try:
-            dialog = DefaultTests(
-                tester=self.tester,
-                df_all=self.df_all,
-                device_id_input=self.device_display,
-                selected_tests=None
-            )
-            dialog.exec_()
+        device_id = self.device_display.text().strip()
+        df = self.df_all
 
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"An unexpected error occurred:\n{str(e)}")
+        def task():
+            with start_trace("default-tests", device_id=device_id):
+                return prepare_summary(self.tester, df)
+
+        def on_finished(prepared):
+            try:
+                # Hazırlanan çerçeve ve özet arka planda hesaplandı; diyalog sadece tabloları doldurur
+                dialog = DefaultTests(
+                    tester=self.tester,
+                    df_all=df,
+                    device_id_input=self.device_display,
+                    selected_tests=None,
+                    prepared=prepared
+                )
+                self.registry.record_summary(device_id, prepared[1])
+                dialog.exec_()
+
+            except Exception as e:
+                QMessageBox.critical(self, "Error", f"An unexpected error occurred:\n{str(e)}")
+
+        self.run_in_background(task, (), on_finished, "Default tests")
 
     def run_gpscellular_Analyze(self):
         if not hasattr(self, 'df_all') or self.df_all is None:
             QMessageBox.warning(self, "Warning", "Please fetch data first.")
             return
 
+        df = self.df_all
+        device_id = self.device_display.text().strip()
+
+        def task():
+            with start_trace("gps-cellular", device_id=device_id):
+                return prepare_gps_map(df)
+
+        def on_finished(prepared):
+            try:
+                dialog = gpsCellularAnalyzer(df=df, parent=self, prepared=prepared)
+
+                if not dialog.success:
+                    QMessageBox.warning(self, "Warning", "Could not generate map. Missing or invalid coordinates.")
+                    return
+
+                dialog.exec_()
+            except Exception as e:
+                QMessageBox.critical(self, "Error", f"Failed to open map viewer:\n{e}")
+
+        self.run_in_background(task, (), on_finished, "GPS-Cellular analysis")
+
+    def run_sensor_health(self):
+        if not hasattr(self, 'df_all') or self.df_all is None:
+            QMessageBox.warning(self, "Warning", "Please fetch data first.")
+            return
+
+        df = self.df_all
+        device_id = self.device_display.text().strip()
+
+        def task():
+            with start_trace("sensor-health", device_id=device_id):
+                return run_in_process(evaluate_sensor_health, df)
+
+        def on_finished(result):
+            try:
+                SensorHealthDialog(self.tester, df, result=result, parent=self).exec_()
+            except Exception as e:
+                QMessageBox.critical(self, "Error", f"Failed to open sensor health:\n{e}")
+
+        self.run_in_background(task, (), on_finished, "Sensor health")
+
+    def run_latency_analysis(self):
+        if not hasattr(self, 'df_all') or self.df_all is None:
+            QMessageBox.warning(self, "Warning", "Please fetch data first.")
+            return
+
+        df = self.df_all
+        device_id = self.device_display.text().strip()
+
+        def task():
+            with start_trace("latency", device_id=device_id):
+                return run_in_process(evaluate_latency, df)
+
+        def on_finished(result):
+            try:
+                LatencyDialog(self.tester, df, result=result, parent=self).exec_()
+            except Exception as e:
+                QMessageBox.critical(self, "Error", f"Failed to open latency analysis:\n{e}")
+
+        self.run_in_background(task, (), on_finished, "Latency analysis")
+
+    def run_trend_analysis(self):
+        if not hasattr(self, 'df_all') or self.df_all is None:
+            QMessageBox.warning(self, "Warning", "Please fetch data first.")
+            return
+
         try:
-            dialog = gpsCellularAnalyzer(df=self.df_all, parent=self)
+            dialog = TrendAnalysis(df=self.df_all, parent=self)
+            dialog.exec_()
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to run trend analysis:\n{e}")
 
-            if not dialog.success:
-                QMessageBox.warning(self, "Warning", "Could not generate map. Missing or invalid coordinates.")
-                return
+    def run_time_series_viewer(self):
+        if not hasattr(self, 'df_all') or self.df_all is None:
+            QMessageBox.warning(self, "Warning", "Please fetch data first.")
+            return
 
+        try:
+            dialog = TimeSeriesViewer(df=self.df_all, parent=self)
             dialog.exec_()
         except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to open map viewer:\n{e}")
+            QMessageBox.critical(self, "Error", f"Failed to open time series viewer:\n{e}")
+
+    def show_fetch_timings(self):
+        trace = last_trace("fetch")
+        if trace is None:
+            QMessageBox.information(self, "Fetch Timings", "No fetch has been traced yet.")
+            return
+        TraceBreakdown(trace, parent=self).exec_()
+
+    def open_fleet_summary(self):
+        dialog = FleetSummary(
+            email=getattr(self, "portal_email", None),
+            password=getattr(self, "portal_password", None),
+            parent=self
+        )
+        dialog.exec_()
+
+    def open_monitoring(self):
+        # Modal değil: izleme arka planda sürerken ana pencere kullanılabilir
+        if getattr(self, "monitor_dialog", None) is None:
+            self.monitor_dialog = DeviceMonitor(
+                email=getattr(self, "portal_email", None),
+                password=getattr(self, "portal_password", None),
+                parent=self
+            )
+        else:
+            self.monitor_dialog.email = getattr(self, "portal_email", None)
+            self.monitor_dialog.password = getattr(self, "portal_password", None)
+        self.monitor_dialog.show()
+        self.monitor_dialog.raise_()
+
+    def open_telemetry_store(self):
+        TelemetryStoreDialog(parent=self).exec_()
+
+    def open_report_generator(self):
+        ReportGenerator(parent=self).exec_()
+
+    def save_fetch_metadata(self, df):
+        drep_path = getattr(self, "drep_path", None)
+        if not drep_path or not os.path.exists(drep_path):
+            return
+
+        try:
+            with update_ini(drep_path) as config:
+                if "INFO" not in config:
+                    config["INFO"] = {}
+                config["INFO"].update(fetch_metadata(df))
+        except Exception as e:
+            print(f"Warning: Could not save fetch metadata - {e}")
+
+    def open_device_browser(self):
+        dialog = DeviceBrowser(self.registry, parent=self)
+        if dialog.exec_() and dialog.selected_path:
+            self.load_drep_file(dialog.selected_path)
 
     def load_drep_file(self, file_path: str):
         try:
@@ -390,6 +629,11 @@ class MainApp(QMainWindow):
             if "INFO" not in config:
                 raise ValueError("Missing [INFO] section in .drep file")
 
+            self.drep_path = file_path
+
+            # Cihaza özel test eşikleri (.drep içindeki kural bölümleri)
+            self.tester.rules = load_rules(drep_path=file_path)
+
             # === Device ID
             if "deviceId" in config["INFO"]:
                 self.device_id = config["INFO"]["deviceId"]
@@ -501,8 +745,7 @@ class MainApp(QMainWindow):
                 if not file_path:
                     return
 
-                with open(file_path, 'w') as file:
-                    config.write(file)
+                write_ini(file_path, config)
 
                 QMessageBox.information(self, "Success", f".drep file saved.\n{file_path}")
                 self.load_drep_file(file_path)  # doğrudan aç
@@ -563,21 +806,16 @@ class MainApp(QMainWindow):
                 return
 
             try:
-                config = configparser.ConfigParser()
-
                 if os.path.exists("config.ini"):
-                    config.read("config.ini")
                     print("Status: config.ini loaded for writing.")
                 else:
                     print("Status: config.ini will be created.")
 
-                if "PORTAL" not in config:
-                    config["PORTAL"] = {}
-
-                config["PORTAL"]["Key"] = key
+                with update_ini("config.ini") as config:
+                    if "PORTAL" not in config:
+                        config["PORTAL"] = {}
 
-                with open("config.ini", "w") as configfile:
-                    config.write(configfile)
+                    config["PORTAL"]["Key"] = key
 
                 QMessageBox.information(dialog, "Success", "Key saved to config file.")
                 print("Status: Key saved to config.ini successfully.")
@@ -680,6 +918,7 @@ class CredentialManager:
         return decrypted.split("||")
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     app = QApplication(sys.argv)
     window = MainApp()
     window.show()
@@ -0,0 +1,162 @@
+import os
+import pickle
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+RESULT_CACHE_DIR = os.path.join(os.getcwd(), "Device Cache", "results")
+MEMORY_ENTRIES = 64
+# Disk katmanının üst sınırı; aşılınca en uzun süredir okunmayan/yazılmayan dosyalar silinir
+DISK_MAX_BYTES = 512 * 1024 * 1024
+# Disk taraması her yazmada değil, bu kadar yazmada bir yapılır
+PRUNE_EVERY = 50
+
+def frame_fingerprint(df, column_name="LogDate", value_columns=()):
+    # Satır sayısı + şema + sıralanmış zaman damgası sütunu. Sıralama, sırası değişmiş ama içeriği aynı
+    # veriyi aynı parmak izine getirir; hash tüm veriyi değil sadece tek sütunu okur.
+    # value_columns: değerleri de anahtara giren sütunlar (satır hash'leri sıralanır, sıra yine önemsizdir);
+    # zaman damgası aynı kalıp değeri düzeltilen veri böylece eski sonucu getirmez.
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str(len(df)).encode())
+    digest.update(repr([(str(col), str(dtype)) for col, dtype in df.dtypes.items()]).encode())
+
+    if column_name in df.columns:
+        column = df[column_name]
+        if pd.api.types.is_datetime64_any_dtype(column):
+            values = column.to_numpy(dtype="datetime64[ns]").view("int64")
+        else:
+            values = pd.util.hash_pandas_object(column, index=False).to_numpy()
+        digest.update(np.sort(values).tobytes())
+
+    value_columns = [col for col in value_columns if col in df.columns]
+    if value_columns:
+        row_hashes = pd.util.hash_pandas_object(df[value_columns], index=False).to_numpy()
+        digest.update(np.sort(row_hashes).tobytes())
+    return digest.hexdigest()
+
+class ResultCache:
+    # İki katman: süreç içinde LRU bellek, süreçler/oturumlar arası diskte pickle
+    def __init__(self, cache_dir=RESULT_CACHE_DIR, memory_entries=MEMORY_ENTRIES, disk=True, disk_max_bytes=DISK_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.memory_entries = memory_entries
+        self.disk = disk
+        self.disk_max_bytes = disk_max_bytes
+        self.writes = 0
+        self.memory = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, namespace, key):
+        return namespace, hashlib.sha1(repr(key).encode()).hexdigest()
+
+    def _path(self, namespace, key_hash):
+        return os.path.join(self.cache_dir, namespace, f"{key_hash}.pkl")
+
+    def get(self, namespace, key):
+        full_key = self._key(namespace, key)
+        with self.lock:
+            if full_key in self.memory:
+                self.memory.move_to_end(full_key)
+                self.hits += 1
+                return self.memory[full_key]
+
+        if self.disk:
+            path = self._path(*full_key)
+            if os.path.exists(path):
+                try:
+                    with open(path, "rb") as file:
+                        value = pickle.load(file)
+                    # mtime son kullanım zamanıdır; prune en eski kullanılanları siler
+                    os.utime(path)
+                    self._remember(full_key, value)
+                    self.hits += 1
+                    return value
+                except Exception as e:
+                    print(f"Warning: Could not read cached result {path} - {e}")
+
+        self.misses += 1
+        return None
+
+    def put(self, namespace, key, value, disk=True):
+        full_key = self._key(namespace, key)
+        self._remember(full_key, value)
+
+        if self.disk and disk:
+            path = self._path(*full_key)
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                temp_path = f"{path}.{os.getpid()}.tmp"
+                with open(temp_path, "wb") as file:
+                    pickle.dump(value, file, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(temp_path, path)
+            except Exception as e:
+                print(f"Warning: Could not write cached result {path} - {e}")
+                return
+
+            with self.lock:
+                self.writes += 1
+                due = self.writes % PRUNE_EVERY == 1
+            if due:
+                self.prune()
+
+    def prune(self):
+        files = []
+        total = 0
+        for root, _, names in os.walk(self.cache_dir):
+            for name in names:
+                if not name.endswith(".pkl"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+
+        removed = 0
+        for _, size, path in sorted(files):
+            if total <= self.disk_max_bytes:
+                break
+            try:
+                os.remove(path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+            total -= size
+        if removed:
+            print(f"Status: Result cache pruned, {removed} old entries removed.")
+        return removed
+
+    def _remember(self, full_key, value):
+        with self.lock:
+            self.memory[full_key] = value
+            self.memory.move_to_end(full_key)
+            while len(self.memory) > self.memory_entries:
+                self.memory.popitem(last=False)
+
+    def memoize(self, namespace, key, compute, disk=True):
+        value = self.get(namespace, key)
+        if value is None:
+            value = compute()
+            if value is not None:
+                self.put(namespace, key, value, disk)
+        return value
+
+    def clear(self):
+        with self.lock:
+            self.memory.clear()
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def result_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResultCache()
+        return _cache
@@ -0,0 +1,225 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QTableWidget, QTableWidgetItem, QSpinBox
+)
+
+from dataFetch import timestamp_order
+
+# Kanal -> fiziksel sınırlar (min, max). None: sınır bilinmiyor, sadece donma ve sıçrama kontrol edilir.
+SENSOR_CHANNELS = {
+    "SC1": None, "SC2": None, "SC3": None, "SC4": None,
+    "SC5": None, "SC6": None, "SC7": None, "SC8": None,
+    "Under Soil Moisture(20 cm)": (0, 100),
+    "Under Soil Moisture(40 cm)": (0, 100),
+    "Under Soil Moisture(60 cm)": (0, 100),
+    "Under Soil Temperature - Filiz 1.7 - 20 cm - Data": (-20, 50),
+    "Under Soil Temperature - Filiz 1.7 - 40 cm": (-20, 50),
+    "Under Soil Temperature - Filiz 1.7 - 60 cm - Data": (-20, 50),
+    "Soil Surface Temperature": (-30, 70),
+    "Soil Surface Humidity": (0, 100),
+    "Air Temperature": (-40, 60),
+    "Air Humidity": (0, 100),
+    "Main Board PCB Humidity": (0, 100),
+    "Main Board PCB Temperature": (-40, 85),
+    "Soil Moisture Sensor PCB Humidity": (0, 100),
+    "Soil Moisture Sensor PCB Temperature": (-40, 85),
+}
+
+# Aynı değer bu kadar ardışık okumada değişmezse sensör donmuş sayılır
+FLATLINE_READINGS = 12
+# Sıçrama: komşularından bu kadar (robust sigma, MAD ile) uzaklaşıp geri dönen tek okuma
+SPIKE_SIGMA = 8.0
+# Kuantize sinyallerde MAD 0 olabilir; eşik en az kanal aralığının (p1-p99) bu oranı kadar olur
+SPIKE_MIN_RANGE_RATIO = 0.05
+
+ISSUES = ["Flatline", "Spike", "Out of Range"]
+
+# Diyalogdaki işaretli okuma tablosunda gösterilen en fazla satır
+MAX_ISSUE_ROWS = 5000
+
+class SensorHealthResult:
+    # masks[issue]: (satır x kanal) bool matrisi; satırlar zaman sırasına göre (eskiden yeniye)
+    def __init__(self, channels, times, values, masks, run_lengths):
+        self.channels = channels
+        self.times = times
+        self.values = values
+        self.masks = masks
+        self.run_lengths = run_lengths
+
+    def summary(self):
+        longest = np.where(self.masks["Flatline"], self.run_lengths, 0).max(axis=0) if len(self.times) else 0
+        summary = pd.DataFrame({
+            "Channel": self.channels,
+            "Readings": (~np.isnan(self.values)).sum(axis=0),
+            "Flatline": self.masks["Flatline"].sum(axis=0),
+            "Spike": self.masks["Spike"].sum(axis=0),
+            "Out of Range": self.masks["Out of Range"].sum(axis=0),
+            "Longest Flatline": longest,
+        })
+        return summary
+
+    def issues(self, issue=None):
+        # Uzun format: her işaretli okuma bir satır (LogDate, Channel, Value, Issue), en yeni kayıt üstte
+        frames = []
+        for name in ([issue] if issue else ISSUES):
+            rows, cols = np.nonzero(self.masks[name])
+            frames.append(pd.DataFrame({
+                "LogDate": self.times[rows],
+                "Channel": np.asarray(self.channels, dtype=object)[cols],
+                "Value": self.values[rows, cols],
+                "Issue": name,
+            }))
+        issues = pd.concat(frames, ignore_index=True)
+        return issues.sort_values(["LogDate", "Channel"], ascending=[False, True], kind="stable").reset_index(drop=True)
+
+    def issue_counts(self):
+        return {name: int(self.masks[name].sum()) for name in ISSUES}
+
+def _channel_matrix(df, channels):
+    # Kanallar tek (satır x kanal) float matrisine alınır; sayısal sütunlar dönüştürülmeden kopyalanır
+    frame = df[channels]
+    text_columns = [col for col in channels if not pd.api.types.is_numeric_dtype(frame[col])]
+    if text_columns:
+        frame = frame.assign(**{col: pd.to_numeric(frame[col], errors="coerce") for col in text_columns})
+    return frame.to_numpy(dtype=float, na_value=np.nan)
+
+def _run_lengths(values):
+    # Sütun sütun (Fortran sırası) düzleştirilip tek 1D run-length encoding yapılır; her kanalın ilk satırı
+    # yeni bir run başlatır. NaN != NaN olduğundan eksik okumalar run'ı böler.
+    n, k = values.shape
+    if n == 0:
+        return np.zeros((n, k), dtype=int)
+    flat = values.ravel(order="F")
+    starts = np.ones(flat.shape, dtype=bool)
+    starts[1:] = flat[1:] != flat[:-1]
+    starts[::n] = True
+
+    start_positions = np.flatnonzero(starts)
+    lengths = np.diff(np.append(start_positions, flat.size))
+    return np.repeat(lengths, lengths).reshape((n, k), order="F")
+
+def _spikes(values):
+    # Tek okumalık sıçrama: önceki ve sonraki okumaya göre büyük ve ters yönlü fark
+    spikes = np.zeros(values.shape, dtype=bool)
+    if len(values) < 3:
+        return spikes
+    diffs = np.diff(values, axis=0)
+    # Tamamen boş kanallar için "All-NaN slice" uyarıları bastırılır; eşikleri NaN olur ve sıçrama üretmez
+    with warnings.catch_warnings(), np.errstate(invalid="ignore"):
+        warnings.simplefilter("ignore", RuntimeWarning)
+        median = np.nanmedian(diffs, axis=0)
+        mad = np.nanmedian(np.abs(diffs - median), axis=0) * 1.4826
+        low, high = np.nanpercentile(values, [1, 99], axis=0)
+    threshold = np.fmax(SPIKE_SIGMA * mad, SPIKE_MIN_RANGE_RATIO * (high - low))
+    threshold = np.where(threshold > 0, threshold, np.inf)
+
+    before, after = diffs[:-1], diffs[1:]
+    with np.errstate(invalid="ignore"):
+        spikes[1:-1] = (np.abs(before) > threshold) & (np.abs(after) > threshold) & (np.sign(before) != np.sign(after))
+    return spikes
+
+def evaluate_sensor_health(df, channels=None, flatline_readings=FLATLINE_READINGS):
+    channels = [col for col in (channels or SENSOR_CHANNELS) if col in df.columns]
+    if not channels or "LogDate" not in df.columns:
+        empty = np.empty((0, len(channels)))
+        return SensorHealthResult(channels, np.array([], dtype="datetime64[ns]"), empty,
+                                  {name: empty.astype(bool) for name in ISSUES}, empty.astype(int))
+
+    # Zaman sırası (eskiden yeniye): sıralı çerçeve ters çevrilir, değilse bir kez sıralanır
+    order = timestamp_order(df)
+    times = pd.to_datetime(df["LogDate"], errors="coerce").to_numpy(dtype="datetime64[ns]")
+    values = _channel_matrix(df, channels)
+    if order is False:
+        times, values = times[::-1], values[::-1]
+    elif order is None:
+        positions = np.argsort(times, kind="stable")
+        times, values = times[positions], values[positions]
+    valid = ~np.isnat(times)
+    times, values = times[valid], np.ascontiguousarray(values[valid])
+
+    run_lengths = _run_lengths(values)
+    bounds = np.array([SENSOR_CHANNELS.get(col) or (np.nan, np.nan) for col in channels], dtype=float).reshape(-1, 2)
+    with np.errstate(invalid="ignore"):
+        out_of_range = (values < bounds[:, 0]) | (values > bounds[:, 1])
+
+    masks = {
+        "Flatline": (run_lengths >= flatline_readings) & ~np.isnan(values),
+        "Spike": _spikes(values),
+        "Out of Range": out_of_range,
+    }
+    return SensorHealthResult(channels, times, values, masks, run_lengths)
+
+class SensorHealthDialog(QDialog):
+    def __init__(self, tester, df, result=None, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Sensor Health")
+        self.resize(1000, 700)
+
+        self.tester = tester
+        self.df = df
+        self.result = result if result is not None else tester.sensor_health(df)
+
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+
+        # === AYARLAR ===
+        controls = QHBoxLayout()
+        controls.addWidget(QLabel("Flatline Readings:"))
+        self.flatline_spin = QSpinBox()
+        self.flatline_spin.setRange(2, 10000)
+        self.flatline_spin.setValue(FLATLINE_READINGS)
+        self.flatline_spin.editingFinished.connect(self.reevaluate)
+        controls.addWidget(self.flatline_spin)
+
+        controls.addWidget(QLabel("Issue:"))
+        self.issue_combo = QComboBox()
+        self.issue_combo.addItems(["All"] + ISSUES)
+        self.issue_combo.currentIndexChanged.connect(self.update_issue_table)
+        controls.addWidget(self.issue_combo)
+        controls.addStretch()
+        layout.addLayout(controls)
+
+        self.info_label = QLabel()
+        layout.addWidget(self.info_label)
+
+        # === KANAL ÖZETİ ===
+        self.summary_table = QTableWidget()
+        layout.addWidget(self.summary_table)
+
+        # === İŞARETLİ OKUMALAR ===
+        self.issue_table = QTableWidget()
+        layout.addWidget(self.issue_table)
+
+        self.update_tables()
+
+    def reevaluate(self):
+        self.result = self.tester.sensor_health(self.df, self.flatline_spin.value())
+        self.update_tables()
+
+    def update_tables(self):
+        counts = self.result.issue_counts()
+        self.info_label.setText(
+            f"Channels: {len(self.result.channels)} | " + ", ".join(f"{name}: {count}" for name, count in counts.items())
+        )
+        self.fill_table(self.summary_table, self.result.summary())
+        self.update_issue_table()
+
+    def update_issue_table(self):
+        issue = self.issue_combo.currentText()
+        issues = self.result.issues(None if issue == "All" else issue)
+        if len(issues) > MAX_ISSUE_ROWS:
+            print(f"Status: Showing latest {MAX_ISSUE_ROWS} of {len(issues)} flagged readings.")
+        self.fill_table(self.issue_table, issues.head(MAX_ISSUE_ROWS))
+
+    def fill_table(self, table, df):
+        table.clear()
+        table.setRowCount(len(df))
+        table.setColumnCount(len(df.columns))
+        table.setHorizontalHeaderLabels(list(df.columns))
+        for i, row in enumerate(df.itertuples(index=False, name=None)):
+            for j, value in enumerate(row):
+                table.setItem(i, j, QTableWidgetItem(str(value)))
@@ -0,0 +1,442 @@
+import os
+import re
+import glob
+import time
+import threading
+from concurrent.futures import as_completed
+
+import numpy as np
+import pandas as pd
+
+from PyQt5.QtCore import QDateTime, QThread
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QComboBox, QCheckBox, QDateTimeEdit,
+    QTableWidget, QTableWidgetItem, QPushButton, QFileDialog, QMessageBox
+)
+
+from dataFetch import CACHE_DIR, FILTERED_COLUMNS_ORDER, load_cached_frame, timestamp_order
+from dataExport import EXPORT_FORMATS, ensure_extension, export_frame
+from processPool import TaskWorker, submit
+from resultCache import frame_fingerprint
+from sensorHealth import SENSOR_CHANNELS
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    ds = None
+    pq = None
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+# Yerleşim: STORE_DIR/device_id=<id>/month=<YYYY-MM>/part-0.parquet (hive). Cihaz ve ay klasör adında olduğundan
+# bu filtreler dosya açılmadan uygulanır; dosya içi satırlar LogDate'e göre artan sıralı (row group istatistikleri dar)
+STORE_DIR = os.path.join(CACHE_DIR, "store")
+PARTITION_FILE = "part-0.parquet"
+FINGERPRINT_KEY = b"fingerprint"
+
+# Bölümler arası şema sabittir (cihazdan cihaza tip değişmez): zaman sütunları timestamp, bu sütunlar float,
+# kalanlar metin. Sadece FILTERED_COLUMNS_ORDER sütunları saklanır.
+STORE_TIME_COLUMNS = ["LogDate", "TimestampRounded"]
+STORE_NUMERIC_COLUMNS = [
+    "Bat", "AccX", "AccY", "AccZ", "AccEvent", "CPUTemp", "Light Intensity", "Precipitation (mm)", "PWR",
+] + list(SENSOR_CHANNELS)
+
+# Sorgu diyaloğunda gösterilen en fazla satır (dışa aktarma tüm sonucu yazar)
+MAX_RESULT_ROWS = 5000
+
+CONDITION_PATTERN = re.compile(
+    r"^\s*(`[^`]+`|[A-Za-z_][\w()]*)\s*(<=|>=|!=|==|=|<|>)\s*('[^']*'|\"[^\"]*\"|[-+]?\d+(?:\.\d+)?)\s*$"
+)
+
+def _arrow_type(column):
+    if column in STORE_TIME_COLUMNS:
+        return pa.timestamp("us")
+    if column in STORE_NUMERIC_COLUMNS:
+        return pa.float64()
+    return pa.string()
+
+def store_schema(columns=FILTERED_COLUMNS_ORDER):
+    return pa.schema([(col, _arrow_type(col)) for col in columns])
+
+PARTITION_FIELDS = ["device_id", "month"]
+
+def _partitioning():
+    # Cihaz ID'leri sayı gibi görünse de metin olarak okunur
+    return ds.partitioning(pa.schema([(name, pa.string()) for name in PARTITION_FIELDS]), flavor="hive")
+
+def partition_path(device_id, month):
+    return os.path.join(STORE_DIR, f"device_id={device_id}", f"month={month}", PARTITION_FILE)
+
+def _store_frame(df, column_name="LogDate"):
+    # Sabit şemaya dönüştürülmüş, LogDate'e göre artan sıralı çerçeve (zamanı olmayan satırlar saklanmaz)
+    columns = [col for col in FILTERED_COLUMNS_ORDER if col in df.columns]
+    converted = {}
+    for col in columns:
+        series = df[col]
+        if col in STORE_TIME_COLUMNS:
+            if not pd.api.types.is_datetime64_any_dtype(series):
+                series = pd.to_datetime(series, errors="coerce", dayfirst=True)
+            converted[col] = series.astype("datetime64[us]")
+        elif col in STORE_NUMERIC_COLUMNS:
+            if series.dtype != np.float64:
+                converted[col] = pd.to_numeric(series, errors="coerce").astype(np.float64)
+        elif not pd.api.types.is_string_dtype(series) or series.dtype == object:
+            converted[col] = series.astype("string")
+    frame = df[columns].assign(**converted)
+
+    frame = frame[frame[column_name].notna()]
+    order = timestamp_order(frame, column_name)
+    if order is False:
+        frame = frame.iloc[::-1]
+    elif order is None:
+        frame = frame.sort_values(column_name, kind="stable")
+    return frame.reset_index(drop=True)
+
+def _partition_fingerprint(path):
+    if not os.path.exists(path):
+        return None
+    try:
+        metadata = pq.read_schema(path).metadata or {}
+        return metadata.get(FINGERPRINT_KEY, b"").decode()
+    except Exception:
+        return None
+
+def write_device_partitions(device_id, df, since=None, column_name="LogDate"):
+    # Her ay ayrı dosya; içeriği değişmeyen aylar (parmak izi aynı) yeniden yazılmaz.
+    # since verilirse sadece o tarihin ayından itibaren olan aylar işlenir (yeni satır ekleyen izleme döngüsü için).
+    if pa is None:
+        print("Warning: Telemetry store requires pyarrow (pip install pyarrow).")
+        return 0
+    if df is None or df.empty or column_name not in df.columns:
+        return 0
+
+    try:
+        if since is not None:
+            times = pd.to_datetime(df[column_name], errors="coerce")
+            df = df[times >= pd.Timestamp(since).to_period("M").to_timestamp()]
+        frame = _store_frame(df, column_name)
+        if frame.empty:
+            return 0
+
+        months = frame[column_name].to_numpy(dtype="datetime64[M]")
+        starts = np.flatnonzero(np.r_[True, months[1:] != months[:-1]])
+        stops = np.append(starts[1:], len(frame))
+        labels = np.datetime_as_string(months[starts], unit="M")
+
+        # Önce hangi ayların değiştiğine bakılır; Arrow'a dönüşüm tüm çerçeve için bir kez yapılır, aylar dilimlenir
+        changed = []
+        for month, start, stop in zip(labels, starts, stops):
+            path = partition_path(device_id, month)
+            # Tüm sütunların değerleri anahtara girer; zaman damgası aynı kalıp değeri düzelen ay da yeniden yazılır
+            fingerprint = frame_fingerprint(frame.iloc[start:stop], column_name, value_columns=list(frame.columns))
+            if _partition_fingerprint(path) != fingerprint:
+                changed.append((path, fingerprint, start, stop))
+
+        table = pa.Table.from_pandas(frame, schema=store_schema(list(frame.columns)), preserve_index=False) if changed else None
+        for path, fingerprint, start, stop in changed:
+            chunk = table.slice(start, stop - start)
+            chunk = chunk.replace_schema_metadata({**(chunk.schema.metadata or {}), FINGERPRINT_KEY: fingerprint.encode()})
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # "." ile başlayan geçici dosya dataset taramasında yok sayılır; yazım bitince atomik olarak yer değiştirir
+            temp_path = os.path.join(os.path.dirname(path), f".{PARTITION_FILE}.{os.getpid()}.{threading.get_ident()}.tmp")
+            pq.write_table(chunk, temp_path, compression="zstd")
+            os.replace(temp_path, path)
+        written = len(changed)
+
+        print(f"Status: Telemetry store updated for device {device_id} ({written} of {len(labels)} months written).")
+        return written
+    except Exception as e:
+        print(f"Warning: Could not update telemetry store for device {device_id} - {e}")
+        return 0
+
+def submit_device_partitions(device_id, df, since=None):
+    # Arayüz beklemeden havuzda yazılır; havuz tarafındaki hatalar kaybolmasın diye sonuç kontrol edilir
+    future = submit(write_device_partitions, device_id, df, since)
+    future.add_done_callback(lambda done: _report_store_failure(device_id, done))
+    return future
+
+def _report_store_failure(device_id, future):
+    error = future.exception()
+    if error is not None:
+        print(f"Error: Telemetry store update failed for device {device_id} - {error}")
+
+def sync_cached_device(device_id):
+    return device_id, write_device_partitions(device_id, load_cached_frame(device_id))
+
+def sync_store_from_cache():
+    # Önbellekteki tüm cihazlar paylaşılan process havuzunda depoya yazılır (değişmeyen aylar atlanır)
+    device_ids = [os.path.splitext(os.path.basename(path))[0] for path in glob.glob(os.path.join(CACHE_DIR, "*.pkl"))]
+    futures = [submit(sync_cached_device, device_id) for device_id in device_ids]
+    return {device_id: written for device_id, written in (future.result() for future in as_completed(futures))}
+
+def store_dataset():
+    if ds is None:
+        raise ImportError("Telemetry store requires pyarrow (pip install pyarrow).")
+    if not os.path.isdir(STORE_DIR):
+        return None
+    schema = pa.schema(list(store_schema()) + [pa.field(name, pa.string()) for name in PARTITION_FIELDS])
+    return ds.dataset(STORE_DIR, schema=schema, format="parquet", partitioning=_partitioning())
+
+def _and(left, right):
+    if left is None:
+        return right
+    return left if right is None else left & right
+
+def store_filter(device_ids=None, start_date=None, end_date=None, column_name="LogDate"):
+    # Cihaz ve ay koşulları klasör adlarıyla eşleşir (partition pruning); LogDate koşulu row group'ları eler
+    expression = None
+    if device_ids:
+        expression = ds.field("device_id").isin([str(device_id) for device_id in device_ids])
+    if start_date is not None:
+        start_date = pd.Timestamp(start_date)
+        expression = _and(expression, ds.field("month") >= start_date.strftime("%Y-%m"))
+        expression = _and(expression, ds.field(column_name) >= pa.scalar(start_date.to_datetime64(), pa.timestamp("us")))
+    if end_date is not None:
+        end_date = pd.Timestamp(end_date)
+        expression = _and(expression, ds.field("month") <= end_date.strftime("%Y-%m"))
+        expression = _and(expression, ds.field(column_name) <= pa.scalar(end_date.to_datetime64(), pa.timestamp("us")))
+    return expression
+
+def parse_condition(text, schema):
+    # "PWR < -90 and Operator = 'Turkcell'" -> Arrow ifadesi. Boşluklu sütun adları `...` içinde yazılır.
+    expression = None
+    for clause in re.split(r"\s+and\s+", text.strip(), flags=re.IGNORECASE):
+        match = CONDITION_PATTERN.match(clause)
+        if not match:
+            raise ValueError(f"Invalid condition: {clause}")
+        column, operator, literal = match.groups()
+        column = column.strip("`")
+        if column not in schema.names:
+            raise ValueError(f"Unknown column: {column}")
+
+        field_type = schema.field(column).type
+        quoted = literal[0] in "'\""
+        literal = literal[1:-1] if quoted else literal
+        if pa.types.is_timestamp(field_type):
+            value = pa.scalar(pd.Timestamp(literal).to_datetime64(), field_type)
+        elif pa.types.is_floating(field_type):
+            if quoted:
+                raise ValueError(f"Column {column} is numeric; remove the quotes around {literal}.")
+            value = float(literal)
+        else:
+            value = literal
+
+        field = ds.field(column)
+        clause_expression = {
+            "<": field < value, "<=": field <= value, ">": field > value, ">=": field >= value,
+            "=": field == value, "==": field == value, "!=": field != value,
+        }[operator]
+        expression = _and(expression, clause_expression)
+    return expression
+
+def query_store(device_ids=None, start_date=None, end_date=None, condition=None, columns=None):
+    dataset = store_dataset()
+    if dataset is None:
+        return pd.DataFrame(), 0, 0
+
+    expression = store_filter(device_ids, start_date, end_date)
+    if condition:
+        expression = _and(expression, parse_condition(condition, dataset.schema))
+
+    # Taranan dosya sayısı sadece klasör adlarından hesaplanır
+    total_files = len(dataset.files)
+    scanned_files = sum(1 for _ in dataset.get_fragments(filter=expression)) if expression is not None else total_files
+
+    columns = columns or ["device_id"] + [name for name in dataset.schema.names if name not in PARTITION_FIELDS]
+    table = dataset.to_table(columns=columns, filter=expression)
+    return table.to_pandas(), scanned_files, total_files
+
+def sql_store(sql):
+    # "telemetry" görünümü Arrow dataset'idir; DuckDB filtreleri dataset'e iletir, budama aynı şekilde çalışır
+    if duckdb is None:
+        raise ImportError("SQL queries require duckdb (pip install duckdb).")
+    dataset = store_dataset()
+    if dataset is None:
+        return pd.DataFrame()
+    connection = duckdb.connect()
+    try:
+        connection.register("telemetry", dataset)
+        return connection.execute(sql).fetch_df()
+    finally:
+        connection.close()
+
+def run_store_query(mode, text, device_ids=None, start_date=None, end_date=None):
+    started = time.perf_counter()
+    if mode == "SQL":
+        df = sql_store(text)
+        return df, f"{len(df)} rows in {time.perf_counter() - started:.2f}s"
+    df, scanned_files, total_files = query_store(device_ids, start_date, end_date, condition=text or None)
+    return df, f"{len(df)} rows in {time.perf_counter() - started:.2f}s ({scanned_files} of {total_files} files scanned)"
+
+class TelemetryStoreDialog(QDialog):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Telemetry Store")
+        self.resize(1100, 700)
+
+        self.result_df = None
+        self.busy = False
+
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+
+        # === KAPSAM ===
+        scope_layout = QHBoxLayout()
+        scope_layout.addWidget(QLabel("Devices:"))
+        self.device_input = QLineEdit()
+        self.device_input.setPlaceholderText("Comma separated IDs (empty = all)")
+        scope_layout.addWidget(self.device_input)
+
+        self.date_checkbox = QCheckBox("LogDate between")
+        scope_layout.addWidget(self.date_checkbox)
+        self.start_picker = QDateTimeEdit(QDateTime.currentDateTime().addMonths(-1))
+        self.end_picker = QDateTimeEdit(QDateTime.currentDateTime())
+        for picker in (self.start_picker, self.end_picker):
+            picker.setDisplayFormat("yyyy-MM-dd HH:mm:ss")
+            picker.setCalendarPopup(True)
+            scope_layout.addWidget(picker)
+        layout.addLayout(scope_layout)
+
+        # === SORGU ===
+        query_layout = QHBoxLayout()
+        self.mode_combo = QComboBox()
+        self.mode_combo.addItem("Filter")
+        if duckdb is not None:
+            self.mode_combo.addItem("SQL")
+        self.mode_combo.currentTextChanged.connect(self.update_placeholder)
+        query_layout.addWidget(self.mode_combo)
+
+        self.query_input = QLineEdit()
+        self.query_input.returnPressed.connect(self.run_query)
+        query_layout.addWidget(self.query_input)
+
+        self.run_btn = QPushButton("Run")
+        self.run_btn.clicked.connect(self.run_query)
+        query_layout.addWidget(self.run_btn)
+
+        self.sync_btn = QPushButton("Import Cached Devices")
+        self.sync_btn.clicked.connect(self.sync_cache)
+        query_layout.addWidget(self.sync_btn)
+        layout.addLayout(query_layout)
+        self.update_placeholder(self.mode_combo.currentText())
+
+        self.status_label = QLabel("Ready.")
+        self.status_label.setStyleSheet("color: gray; font-weight: bold;")
+        layout.addWidget(self.status_label)
+
+        self.table = QTableWidget()
+        layout.addWidget(self.table)
+
+        self.export_btn = QPushButton("Export Result")
+        self.export_btn.clicked.connect(self.export_result)
+        self.export_btn.setEnabled(False)
+        layout.addWidget(self.export_btn)
+
+    def update_placeholder(self, mode):
+        if mode == "SQL":
+            self.query_input.setPlaceholderText(
+                "SELECT device_id, count(*) AS n FROM telemetry WHERE PWR < -90 AND month = '2025-03' GROUP BY device_id"
+            )
+        else:
+            self.query_input.setPlaceholderText("PWR < -90 and Operator = 'Turkcell'  (use `...` for names with spaces)")
+
+    def scope(self):
+        device_ids = [part.strip() for part in self.device_input.text().split(",") if part.strip()]
+        if not self.date_checkbox.isChecked():
+            return device_ids, None, None
+        return (
+            device_ids,
+            pd.Timestamp(self.start_picker.dateTime().toString("yyyy-MM-dd HH:mm:ss")),
+            pd.Timestamp(self.end_picker.dateTime().toString("yyyy-MM-dd HH:mm:ss")),
+        )
+
+    def run_query(self):
+        device_ids, start_date, end_date = self.scope()
+        self.start_task("Querying...", run_store_query, self.mode_combo.currentText(), self.query_input.text().strip(),
+                        device_ids, start_date, end_date)
+
+    def sync_cache(self):
+        self.start_task("Importing cached devices...", sync_store_from_cache)
+
+    def start_task(self, message, func, *args):
+        if self.busy:
+            return
+        self.busy = True
+        self.run_btn.setEnabled(False)
+        self.sync_btn.setEnabled(False)
+        self.status_label.setText(message)
+
+        self.thread = QThread()
+        self.worker = TaskWorker(func, *args)
+        self.worker.moveToThread(self.thread)
+        self.thread.started.connect(self.worker.run)
+        self.worker.finished.connect(self.on_finished)
+        self.worker.error.connect(self.on_error)
+        self.worker.finished.connect(self.thread.quit)
+        self.worker.error.connect(self.thread.quit)
+        self.worker.finished.connect(self.worker.deleteLater)
+        self.thread.finished.connect(self.thread.deleteLater)
+        self.thread.start()
+
+    def task_done(self):
+        self.busy = False
+        self.run_btn.setEnabled(True)
+        self.sync_btn.setEnabled(True)
+
+    def on_finished(self, result):
+        self.task_done()
+        if isinstance(result, dict):
+            written = sum(result.values())
+            self.status_label.setText(f"{len(result)} devices imported, {written} month partitions written.")
+            print(f"Status: Telemetry store import complete. {len(result)} devices, {written} partitions written.")
+            return
+
+        df, message = result
+        self.result_df = df
+        self.status_label.setText(message)
+        self.export_btn.setEnabled(not df.empty)
+        if len(df) > MAX_RESULT_ROWS:
+            print(f"Status: Showing first {MAX_RESULT_ROWS} of {len(df)} query rows.")
+        self.fill_table(df.head(MAX_RESULT_ROWS))
+
+    def on_error(self, message):
+        self.task_done()
+        self.status_label.setText("Query failed.")
+        print(f"Error: Telemetry store query failed - {message}")
+        QMessageBox.critical(self, "Error", f"Query failed:\n{message}")
+
+    def fill_table(self, df):
+        self.table.clear()
+        self.table.setRowCount(len(df))
+        self.table.setColumnCount(len(df.columns))
+        self.table.setHorizontalHeaderLabels([str(col) for col in df.columns])
+        for i, row in enumerate(df.itertuples(index=False, name=None)):
+            for j, value in enumerate(row):
+                self.table.setItem(i, j, QTableWidgetItem("" if pd.isna(value) else str(value)))
+
+    def export_result(self):
+        if self.result_df is None or self.result_df.empty:
+            QMessageBox.warning(self, "Warning", "Query result is empty.")
+            return
+
+        file_path, selected_filter = QFileDialog.getSaveFileName(
+            self,
+            "Export Query Result",
+            os.path.join(os.getcwd(), "telemetry_query.csv"),
+            ";;".join(EXPORT_FORMATS.values())
+        )
+        if not file_path:
+            return
+
+        try:
+            file_path = ensure_extension(file_path, selected_filter)
+            export_frame(self.result_df, file_path, sheet_name="Query")
+            QMessageBox.information(self, "Exported", f"Query result exported.\n{file_path}")
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Export failed:\n{e}")
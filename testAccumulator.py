@@ -0,0 +1,153 @@
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+
+from defaultTests import DataTests, SUMMARY_TESTS
+from testRules import CompiledRuleSet, detect_hardware
+
+# filter_missed_data ile aynı üst sınır
+MAX_MISSING_ROWS = 5000
+
+class TestAccumulator:
+    # Bir cihazın test sayaçlarını tutar; yeni gelen satırlar eklendikçe sadece o satırlar işlenir.
+    # Satıra bağlı testler (kural testleri) parça üzerinde sayılır, Missed Data ve Duplicate Data için
+    # önceki parçanın son satırı (zaman, durum) ve görülen LogDate'ler bağlam olarak saklanır.
+    def __init__(self, device_id=None, tester=None, selected_tests=None):
+        self.device_id = device_id
+        self.tester = tester or DataTests()
+        self.tests = [item for item in SUMMARY_TESTS if not selected_tests or item[0] in selected_tests]
+        self.counts = {name: 0 for name, _ in self.tests}
+        self.total = 0
+        self.hardware = self.tester.rules.hardware
+        self.compiled = None
+        # Kayıtlı sayaçlar hangi kurallarla hesaplandı; kurallar değişirse monitör sayaçları yeniden kurar
+        self.rules_fingerprint = self.tester.rules.fingerprint()
+
+        # Sınır bağlamı: en yeni satırın TimestampRounded / Status değeri
+        self.last_timestamp = None
+        self.last_status = None
+        self.last_log_date = None
+        # Görülen LogDate'ler sıralı parçalar halinde; sadece sıra dışı (geç gelen) veri olursa aranır
+        self.log_date_chunks = []
+
+    def _rule_plan(self, df):
+        if self.compiled is None or (self.hardware is None and detect_hardware(df)):
+            self.hardware = self.hardware or detect_hardware(df)
+            rule_names = [DataTests.RULE_TESTS[m] for _, m in self.tests if m in DataTests.RULE_TESTS]
+            rules = self.tester.rules.rules(self.hardware)
+            self.compiled = CompiledRuleSet([rules[name] for name in rule_names if name in rules], self.hardware)
+        return self.compiled
+
+    def append(self, new_rows):
+        if new_rows is None or new_rows.empty:
+            return self.summary_rows()
+
+        df = new_rows.copy()
+        if "LogDate" in df.columns:
+            df["LogDate"] = pd.to_datetime(df["LogDate"], errors="coerce")
+            # Tam hesaplamadaki azalan sıralı tablonun tersi: önce aynı şekilde (stable, azalan) sıralanır,
+            # sonra çevrilir. Doğrudan artan sıralama eşit LogDate'li satırları ters sırada bırakır ve
+            # Missed Data boşluğu farklı satırın Status'üne yazılırdı.
+            df = df.sort_values("LogDate", ascending=False, kind="stable").iloc[::-1]
+
+        result = self._rule_plan(df).evaluate(df)
+        for name, method_name in self.tests:
+            rule_name = DataTests.RULE_TESTS.get(method_name)
+            if rule_name and result.has(rule_name):
+                self.counts[name] += result.count(rule_name)
+
+        if "Missed Data" in self.counts:
+            self.counts["Missed Data"] += self._count_missed(df)
+        if "Duplicate Data" in self.counts:
+            self.counts["Duplicate Data"] += self._count_duplicates(df)
+
+        self.total += len(df)
+        return self.summary_rows()
+
+    def _count_missed(self, df):
+        if "TimestampRounded" not in df.columns or "Status" not in df.columns:
+            return 0
+        threshold = int(self.tester.rules.threshold("Missed Data", 3600))
+
+        timestamps = pd.to_datetime(df["TimestampRounded"], errors="coerce").to_numpy(dtype="datetime64[s]")
+        statuses = df["Status"].astype(str).str.strip().to_numpy()
+
+        # Boşluk eski satıra yazılır (azalan sıralı tablodaki diff ile aynı); ilk çift önceki parçanın son satırıdır
+        if self.last_timestamp is not None:
+            timestamps = np.concatenate([[self.last_timestamp], timestamps])
+            statuses = np.concatenate([[self.last_status], statuses])
+
+        valid = ~np.isnat(timestamps)
+        gaps = np.abs(np.diff(timestamps.astype("int64")))
+        # NaT içeren çiftlerde diff() NaN verir ve 0 kabul edilir
+        gaps[~(valid[1:] & valid[:-1])] = 0
+        older_status = statuses[:-1]
+        missed = (gaps > threshold) & (older_status == "2G")
+        count = int(((gaps[missed] - threshold) // threshold).sum())
+
+        self.last_timestamp = timestamps[-1]
+        self.last_status = statuses[-1]
+        return count
+
+    def _count_duplicates(self, df):
+        if "LogDate" not in df.columns:
+            return 0
+        values = df["LogDate"].dropna().to_numpy(dtype="datetime64[ns]").astype("int64")
+        if len(values) == 0:
+            return 0
+
+        # Parça içi tekrarlar (değerler sıralı)
+        count = int((values[1:] == values[:-1]).sum())
+        unique = np.unique(values)
+
+        if self.last_log_date is not None and unique[0] <= self.last_log_date:
+            # Eski zamanlı veri geldi: önceki parçalarla karşılaştır
+            for chunk in self.log_date_chunks:
+                positions = np.searchsorted(chunk, unique)
+                positions = np.minimum(positions, len(chunk) - 1)
+                found = chunk[positions] == unique
+                count += int(found.sum())
+                unique = unique[~found]
+
+        if len(unique):
+            self.log_date_chunks.append(unique)
+            self.last_log_date = unique[-1] if self.last_log_date is None else max(self.last_log_date, unique[-1])
+        return count
+
+    def summary_rows(self):
+        rows = []
+        for name, _ in self.tests:
+            count = self.counts[name]
+            if name == "Missed Data":
+                count = min(count, MAX_MISSING_ROWS)
+            rows.append((name, count, self.total))
+        return rows
+
+    def error_rates(self):
+        return {name: (count / total * 100 if total else 0.0) for name, count, total in self.summary_rows()}
+
+ACCUMULATOR_DIR = os.path.join(os.getcwd(), "Device Cache", "accumulators")
+
+def accumulator_path(device_id):
+    return os.path.join(ACCUMULATOR_DIR, f"{device_id}.pkl")
+
+def save_accumulator(accumulator):
+    try:
+        os.makedirs(ACCUMULATOR_DIR, exist_ok=True)
+        with open(accumulator_path(accumulator.device_id), "wb") as file:
+            pickle.dump(accumulator, file, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception as e:
+        print(f"Warning: Could not save test accumulator for device {accumulator.device_id} - {e}")
+
+def load_accumulator(device_id):
+    path = accumulator_path(device_id)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "rb") as file:
+            return pickle.load(file)
+    except Exception as e:
+        print(f"Warning: Could not read test accumulator for device {device_id} - {e}")
+        return None
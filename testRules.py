@@ -0,0 +1,220 @@
+import os
+import json
+import hashlib
+import configparser
+
+import numpy as np
+import pandas as pd
+
+RULES_FILE = os.path.join(os.getcwd(), "test_rules.ini")
+
+# test_rules.ini bulunamazsa kullanılan varsayılan kurallar
+DEFAULT_RULES = {
+    "Low Battery": {"column": "Bat", "operator": "<", "threshold": "3.60", "severity": "warning"},
+    "Low Signal": {"column": "PWR", "operator": "<", "threshold": "-90", "severity": "warning"},
+    "Defect": {"column": "Defect Code", "operator": "!=", "threshold": "0", "severity": "error"},
+    "Malfunction": {"column": "Malfunction", "operator": "!=", "threshold": "0_0", "type": "text", "severity": "error"},
+    "Missed Data": {"column": "DeltaSeconds_TS", "operator": ">", "threshold": "3600", "severity": "warning"},
+    "Accelerometer Alert": {"column": "Acc", "operator": "not startswith", "threshold": "[OK]", "severity": "warning"},
+    "Log Data": {"column": "Status", "operator": "contains", "threshold": "log", "ignore_case": "true", "severity": "info"},
+    "Mainboard Humidity": {"column": "Main Board PCB Humidity", "operator": ">", "threshold": "60", "severity": "warning"},
+    "Soil Sensor Humidity": {"column": "Soil Moisture Sensor PCB Humidity", "operator": ">", "threshold": "60", "severity": "warning"},
+}
+
+NUMERIC_OPERATORS = {
+    "<": np.less,
+    "<=": np.less_equal,
+    ">": np.greater,
+    ">=": np.greater_equal,
+    "==": np.equal,
+    "!=": np.not_equal,
+}
+
+TEXT_OPERATORS = {
+    "==": lambda values, t: values == t,
+    "!=": lambda values, t: values != t,
+    "startswith": lambda values, t: values.str.startswith(t),
+    "not startswith": lambda values, t: ~values.str.startswith(t),
+    "contains": lambda values, t: values.str.contains(t, regex=False),
+    "not contains": lambda values, t: ~values.str.contains(t, regex=False),
+}
+
+# Kural bölümü adındaki donanım ayracı: [Low Battery @ Filiz 1.7]
+REVISION_SEPARATOR = "@"
+
+class TestRule:
+    def __init__(self, name, column, operator, threshold, severity="warning", kind=None, ignore_case=False):
+        self.name = name
+        self.column = column
+        self.operator = operator.strip().lower()
+        self.severity = severity
+        self.ignore_case = ignore_case
+
+        if kind is None:
+            kind = "numeric" if self.operator in NUMERIC_OPERATORS and _is_number(threshold) else "text"
+        self.kind = kind
+
+        if self.kind == "numeric":
+            if self.operator not in NUMERIC_OPERATORS:
+                raise ValueError(f"Rule '{name}': operator '{operator}' is not numeric.")
+            self.threshold = float(threshold)
+        else:
+            if self.operator not in TEXT_OPERATORS:
+                raise ValueError(f"Rule '{name}': unknown operator '{operator}'.")
+            self.threshold = str(threshold).lower() if ignore_case else str(threshold)
+
+    @classmethod
+    def from_options(cls, name, options):
+        missing = [key for key in ("column", "operator", "threshold") if key not in options]
+        if missing:
+            raise ValueError(f"Rule '{name}' is missing {missing}")
+        return cls(
+            name,
+            options["column"],
+            options["operator"],
+            options["threshold"],
+            severity=options.get("severity", "warning"),
+            kind=options.get("type"),
+            ignore_case=str(options.get("ignore_case", "false")).lower() in ("1", "true", "yes"),
+        )
+
+class RuleSet:
+    def __init__(self, base_options, revision_options=None, hardware=None):
+        self.base_options = base_options
+        self.revision_options = revision_options or {}
+        self.hardware = hardware
+
+    def options_for(self, hardware=None):
+        merged = {name: dict(options) for name, options in self.base_options.items()}
+        for name, options in self.revision_options.get(hardware, {}).items():
+            merged.setdefault(name, {}).update(options)
+        return merged
+
+    def rules(self, hardware=None):
+        hardware = hardware or self.hardware
+        return {name: TestRule.from_options(name, options) for name, options in self.options_for(hardware).items()}
+
+    def rule(self, name, hardware=None):
+        return self.rules(hardware).get(name)
+
+    def threshold(self, name, default=None, hardware=None):
+        rule = self.rule(name, hardware)
+        return rule.threshold if rule else default
+
+    def columns(self):
+        # Herhangi bir revizyondaki kuralların okuduğu sütunlar (sonuç önbelleği anahtarına değerleriyle girer)
+        options = list(self.base_options.values())
+        for revision in self.revision_options.values():
+            options.extend(revision.values())
+        return sorted({item["column"] for item in options if "column" in item})
+
+    def fingerprint(self):
+        # Test sonuçları önbelleğinin anahtarı; eşik/kural değişirse önbellek kendiliğinden geçersiz olur
+        content = json.dumps([self.base_options, self.revision_options, self.hardware], sort_keys=True)
+        return hashlib.sha1(content.encode()).hexdigest()
+
+    def compile(self, df, names=None):
+        hardware = self.hardware or detect_hardware(df)
+        rules = self.rules(hardware)
+        if names is not None:
+            rules = {name: rules[name] for name in names if name in rules}
+        return CompiledRuleSet(list(rules.values()), hardware)
+
+class CompiledRuleSet:
+    def __init__(self, rules, hardware=None):
+        self.rules = {rule.name: rule for rule in rules}
+        self.hardware = hardware
+
+        # Plan: her sütun+tip bir kez dönüştürülür, aynı sütunu kullanan tüm kurallar o diziyi paylaşır
+        self.plan = {}
+        for rule in rules:
+            self.plan.setdefault((rule.column, rule.kind, rule.ignore_case), []).append(rule)
+
+    def evaluate(self, df):
+        masks = {}
+        numeric_columns = {}
+
+        for (column, kind, ignore_case), rules in self.plan.items():
+            if column not in df.columns:
+                continue
+
+            if kind == "numeric":
+                values = pd.to_numeric(df[column], errors="coerce").to_numpy(dtype=float)
+                numeric_columns[column] = values
+                for rule in rules:
+                    masks[rule.name] = NUMERIC_OPERATORS[rule.operator](values, rule.threshold)
+            else:
+                # Metin kuralları tekil değerler üzerinde çalışır, sonuç kodlarla satırlara yayılır
+                # pandas 3'te astype(str) NaN'ı korur; eski "nan" metni gibi davranması için doldurulur
+                codes, uniques = pd.factorize(df[column].astype(str).fillna("nan"), use_na_sentinel=False)
+                uniques = pd.Series(uniques, dtype=object)
+                if ignore_case:
+                    uniques = uniques.str.lower()
+                for rule in rules:
+                    unique_mask = TEXT_OPERATORS[rule.operator](uniques, rule.threshold)
+                    masks[rule.name] = unique_mask.to_numpy(dtype=bool)[codes]
+
+        return RuleResult(masks, numeric_columns, len(df))
+
+class RuleResult:
+    def __init__(self, masks, numeric_columns, total):
+        self.masks = masks
+        self.numeric_columns = numeric_columns
+        self.total = total
+
+    def has(self, name):
+        return name in self.masks
+
+    def mask(self, name):
+        return self.masks[name]
+
+    def count(self, name):
+        return int(self.masks[name].sum())
+
+def _is_number(value):
+    try:
+        float(value)
+        return True
+    except (TypeError, ValueError):
+        return False
+
+def detect_hardware(df):
+    # Filiz 1.7 cihazlarda bu revizyona ait toprak altı sıcaklık sütunları dolu gelir
+    for col in df.columns:
+        if "Filiz 1.7" in col and df[col].notna().any():
+            return "Filiz 1.7"
+    return None
+
+def _read_rule_sections(config, base_options, revision_options):
+    for section in config.sections():
+        if section == "INFO":
+            continue
+        options = dict(config[section])
+        if REVISION_SEPARATOR in section:
+            name, hardware = [part.strip() for part in section.split(REVISION_SEPARATOR, 1)]
+            revision_options.setdefault(hardware, {}).setdefault(name, {}).update(options)
+        else:
+            base_options.setdefault(section, {}).update(options)
+
+def load_rules(drep_path=None, rules_path=RULES_FILE):
+    base_options = {name: dict(options) for name, options in DEFAULT_RULES.items()}
+    revision_options = {}
+    hardware = None
+
+    if rules_path and os.path.exists(rules_path):
+        config = configparser.ConfigParser()
+        config.read(rules_path)
+        # Dosya varsa varsayılanların yerine geçer
+        base_options = {}
+        _read_rule_sections(config, base_options, revision_options)
+        print(f"Status: {len(base_options)} test rules loaded from {rules_path}")
+
+    # .drep içindeki [INFO] dışındaki bölümler cihaza özel kural ayarlarıdır
+    if drep_path and os.path.exists(drep_path):
+        config = configparser.ConfigParser()
+        config.read(drep_path)
+        _read_rule_sections(config, base_options, revision_options)
+        if "INFO" in config:
+            hardware = config["INFO"].get("hardware")
+
+    return RuleSet(base_options, revision_options, hardware)
@@ -0,0 +1,42 @@
+import os
+import io
+import sys
+from contextlib import redirect_stdout
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, "benchmarks"))
+
+import numpy as np
+import pytest
+
+import resultCache
+import testAccumulator
+from dataFetch import process_frames
+from defaultTests import DataTests
+from syntheticData import device_frames
+
+@pytest.fixture(autouse=True)
+def memory_result_cache(monkeypatch):
+    # Testler çalışma dizinine önbellek dosyası yazmaz
+    monkeypatch.setattr(resultCache, "_cache", resultCache.ResultCache(disk=False))
+
+def batch_summary(df):
+    tester = DataTests()
+    df, _ = tester.add_time_difference_column(df)
+    return tester.run_summary(df)
+
+@pytest.mark.parametrize("seed", [3, 4, 5])
+@pytest.mark.parametrize("chunks", [1, 7])
+def test_accumulator_matches_full_summary(seed, chunks):
+    with redirect_stdout(io.StringIO()):
+        report_df, portal_df = device_frames(5000, seed)
+        df = process_frames(report_df, portal_df)
+        expected = batch_summary(df)
+
+        # Yeni satırlar uygulamadaki gibi azalan sıralı parçalar halinde, eskiden yeniye gelir
+        accumulator = testAccumulator.TestAccumulator(tester=DataTests())
+        for positions in reversed(np.array_split(np.arange(len(df)), chunks)):
+            accumulator.append(df.iloc[positions])
+
+    assert accumulator.summary_rows() == expected
@@ -0,0 +1,39 @@
+import os
+import io
+import sys
+from contextlib import redirect_stdout
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import resultCache
+from defaultTests import DataTests
+from testRules import DEFAULT_RULES, RuleSet
+
+@pytest.fixture(autouse=True)
+def memory_result_cache(monkeypatch):
+    monkeypatch.setattr(resultCache, "_cache", resultCache.ResultCache(disk=False))
+
+def nan_frame():
+    # Eski astype(str) davranışı: NaN "nan" metni gibi değerlendirilir
+    return pd.DataFrame({
+        "LogDate": pd.date_range("2024-01-01", periods=4, freq="h")[::-1],
+        "Acc": ["[OK] 0", np.nan, "[SHOCK] 3", "[OK] 1"],
+        "Status": ["2G", "Log 2G", np.nan, "2G"],
+    })
+
+def test_text_rules_treat_nan_as_text():
+    tester = DataTests(RuleSet(DEFAULT_RULES))
+    df = nan_frame()
+    with redirect_stdout(io.StringIO()):
+        counts = {name: errors for name, errors, _ in tester._run_summary(df, ["Acc Alert", "Log Data"])}
+        acc_df, _ = tester.filter_acc_alert(df.copy())
+        log_df, _ = tester.filter_status_log(df.copy())
+
+    assert counts == {"Acc Alert": 2, "Log Data": 1}
+    assert len(acc_df) == 2
+    assert log_df["Status"].tolist() == ["Log 2G"]
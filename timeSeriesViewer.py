@@ -0,0 +1,135 @@
+import numpy as np
+import pandas as pd
+from matplotlib import dates as mdates
+
+from PyQt5.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QComboBox
+
+from gpsCellular import MplCanvas, NavigationToolbar
+
+# Ekranda gösterilmeyecek yardımcı sütunlar
+SKIP_COLUMNS = [
+    "LogDate", "CreatedOn", "TimestampRounded", "DeltaSeconds", "DeltaSeconds_TS",
+    "DeviceId", "Master Device ID", "Id", "LAC", "TAC", "MMC", "MNC", "IMSI", "IMEI"
+]
+
+def minmax_decimate(x, y, n_buckets):
+    # Her piksel kovası için min ve max noktası tutulur; tepe/çukurlar kaybolmaz
+    n = len(x)
+    if n <= n_buckets * 2:
+        return x, y
+
+    bucket_size = n // n_buckets
+    full = bucket_size * n_buckets
+    blocks = y[:full].reshape(n_buckets, bucket_size)
+
+    offsets = np.arange(n_buckets) * bucket_size
+    idx_min = offsets + blocks.argmin(axis=1)
+    idx_max = offsets + blocks.argmax(axis=1)
+    indices = np.concatenate((idx_min, idx_max))
+
+    # Kalan kuyruk noktaları son kovaya eklenir
+    if full < n:
+        tail = y[full:]
+        indices = np.concatenate((indices, [full + tail.argmin(), full + tail.argmax()]))
+
+    indices = np.unique(indices)
+    return x[indices], y[indices]
+
+def numeric_columns(df):
+    columns = []
+    for col in df.columns:
+        if col in SKIP_COLUMNS:
+            continue
+        values = pd.to_numeric(df[col], errors="coerce")
+        if values.notna().sum() > len(df) // 2:
+            columns.append(col)
+    return columns
+
+class TimeSeriesViewer(QDialog):
+    def __init__(self, df, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Time Series Viewer")
+        self.resize(1000, 600)
+
+        self.df = df
+        self.x = np.array([])
+        self.y = np.array([])
+        self.line = None
+
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+
+        column_layout = QHBoxLayout()
+        column_layout.addWidget(QLabel("Column:"))
+        self.column_combo = QComboBox()
+        self.column_combo.addItems(numeric_columns(df))
+        self.column_combo.currentIndexChanged.connect(self.plot_column)
+        column_layout.addWidget(self.column_combo)
+        column_layout.addStretch()
+        self.point_label = QLabel()
+        column_layout.addWidget(self.point_label)
+        layout.addLayout(column_layout)
+
+        # === Grafik ve Toolbar ===
+        self.canvas = MplCanvas(self)
+        self.toolbar = NavigationToolbar(self.canvas, self)
+        layout.addWidget(self.toolbar)
+        layout.addWidget(self.canvas)
+
+        self.plot_column()
+
+    def plot_column(self):
+        col = self.column_combo.currentText()
+        if not col:
+            return
+        print(f"Status: Plotting time series for '{col}'...")
+
+        times = pd.to_datetime(self.df["LogDate"], errors="coerce")
+        values = pd.to_numeric(self.df[col], errors="coerce")
+        valid = times.notna() & values.notna()
+        frame = pd.DataFrame({"t": times[valid].values, "v": values[valid].values})
+        if not frame["t"].is_monotonic_increasing:
+            frame = frame.sort_values("t", kind="stable")
+
+        self.x = mdates.date2num(frame["t"].to_numpy())
+        self.y = frame["v"].to_numpy(dtype=float)
+
+        axes = self.canvas.axes
+        axes.clear()
+        self.line = None
+        # clear() callback kayıtlarını sıfırlar; zoom/pan sonrası görünen aralık yeniden seyreltilir
+        axes.callbacks.connect("xlim_changed", self.on_xlim_changed)
+        if not len(self.x):
+            self.canvas.draw_idle()
+            return
+
+        x, y = minmax_decimate(self.x, self.y, self.bucket_count())
+        (self.line,) = axes.plot(x, y, linewidth=0.8)
+        axes.xaxis_date()
+        axes.set_title(col)
+        axes.grid(True)
+        axes.set_xlim(self.x[0], self.x[-1])
+        self.canvas.figure.autofmt_xdate()
+        self.update_point_label(len(x))
+        self.canvas.draw_idle()
+
+    def bucket_count(self):
+        width = self.canvas.axes.get_window_extent().width
+        return max(int(width), 100)
+
+    def on_xlim_changed(self, axes):
+        if self.line is None or not len(self.x):
+            return
+
+        x_min, x_max = axes.get_xlim()
+        # Görünen aralığın bir nokta dışını da al ki çizgi kenarda kopmasın
+        start = max(np.searchsorted(self.x, x_min, side="left") - 1, 0)
+        end = min(np.searchsorted(self.x, x_max, side="right") + 1, len(self.x))
+
+        x, y = minmax_decimate(self.x[start:end], self.y[start:end], self.bucket_count())
+        self.line.set_data(x, y)
+        self.update_point_label(len(x))
+        self.canvas.draw_idle()
+
+    def update_point_label(self, shown):
+        self.point_label.setText(f"{shown} / {len(self.x)} points drawn")
@@ -0,0 +1,202 @@
+import numpy as np
+import pandas as pd
+
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QTableWidget, QTableWidgetItem
+)
+
+TREND_COLUMNS = [
+    "Bat", "PWR", "CPUTemp",
+    "Main Board PCB Humidity", "Main Board PCB Temperature",
+    "Soil Moisture Sensor PCB Humidity", "Soil Moisture Sensor PCB Temperature",
+    "Soil Surface Humidity", "Under Soil Moisture(20 cm)", "Under Soil Moisture(40 cm)",
+    "Under Soil Moisture(60 cm)", "AccX", "AccY", "AccZ", "Acc Alert"
+]
+
+# Veride doğrudan olmayan, başka sütundan türetilen trend sütunları: isim -> (kaynak sütun, hesaplama)
+DERIVED_COLUMNS = {
+    # Pencere ortalaması = o penceredeki ivmeölçer uyarı oranı
+    "Acc Alert": ("AccStatus", lambda status: (status != "OK").astype(float).where(status.notna())),
+}
+
+# (trend adı, sütun, işaretleme eşiği / gün). Eğim eşiği aşarsa cihaz işaretlenir.
+TREND_CHECKS = [
+    ("Battery Discharge", "Bat", -0.01),
+    ("Signal Degradation", "PWR", -0.2),
+    ("Mainboard Humidity Creep", "Main Board PCB Humidity", 0.5),
+    ("Soil Sensor Humidity Creep", "Soil Moisture Sensor PCB Humidity", 0.5),
+]
+
+PERIODS = {"Hourly": "h", "Daily": "D"}
+
+class TrendAnalysis(QDialog):
+    def __init__(self, df, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Trend Analysis")
+        self.resize(1000, 700)
+
+        self.stats = TrendStats(df)
+
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+
+        # === TREND TARAFI ===
+        layout.addWidget(QLabel("Trends (slope per day):"))
+        self.trend_table = QTableWidget()
+        layout.addWidget(self.trend_table)
+
+        # === PENCERE İSTATİSTİKLERİ ===
+        period_layout = QHBoxLayout()
+        period_layout.addWidget(QLabel("Window:"))
+        self.period_combo = QComboBox()
+        self.period_combo.addItems(list(PERIODS.keys()))
+        self.period_combo.setCurrentText("Daily")
+        self.period_combo.currentIndexChanged.connect(self.update_window_table)
+        period_layout.addWidget(self.period_combo)
+        period_layout.addStretch()
+        layout.addLayout(period_layout)
+
+        self.window_table = QTableWidget()
+        layout.addWidget(self.window_table)
+
+        self.fill_table(self.trend_table, self.stats.trend_summary())
+        self.update_window_table()
+
+    def update_window_table(self):
+        freq = PERIODS[self.period_combo.currentText()]
+        self.fill_table(self.window_table, self.stats.window_stats(freq))
+
+    def fill_table(self, table, df):
+        table.clear()
+        table.setRowCount(len(df))
+        table.setColumnCount(len(df.columns))
+        table.setHorizontalHeaderLabels(list(df.columns))
+
+        for i in range(len(df)):
+            for j in range(len(df.columns)):
+                value = df.iloc[i, j]
+                text = f"{value:.4f}" if isinstance(value, float) else str(value)
+                table.setItem(i, j, QTableWidgetItem(text))
+
+class TrendStats:
+    def __init__(self, df, columns=None):
+        print("Status: Preparing trend data...")
+        columns = [
+            col for col in (columns or TREND_COLUMNS)
+            if col in df.columns or (col in DERIVED_COLUMNS and DERIVED_COLUMNS[col][0] in df.columns)
+        ]
+
+        times = pd.to_datetime(df["LogDate"], errors="coerce")
+        frame = pd.DataFrame({col: self.column_values(df, col) for col in columns})
+        frame.insert(0, "LogDate", times.values)
+        frame = frame[frame["LogDate"].notna()]
+
+        # Tüm pencere işlemleri artan sıralı dizi varsayar
+        if not frame["LogDate"].is_monotonic_increasing:
+            frame = frame.sort_values("LogDate", kind="stable")
+
+        self.columns = columns
+        self.times = frame["LogDate"].to_numpy(dtype="datetime64[ns]")
+        self.values = {col: frame[col].to_numpy(dtype=float) for col in columns}
+
+        # Gün cinsinden, ilk kayda göre göreli zaman (kümülatif toplamlarda hassasiyet kaybı olmasın)
+        if len(self.times):
+            self.days = (self.times - self.times[0]).astype("timedelta64[s]").astype(float) / 86400.0
+        else:
+            self.days = np.array([], dtype=float)
+
+    @staticmethod
+    def column_values(df, col):
+        if col not in df.columns and col in DERIVED_COLUMNS:
+            source, compute = DERIVED_COLUMNS[col]
+            return compute(df[source])
+        return pd.to_numeric(df[col], errors="coerce")
+
+    def window_stats(self, freq="D"):
+        print(f"Status: Calculating {freq} window statistics...")
+        if not len(self.times):
+            return pd.DataFrame(columns=["Period", "Column", "Min", "Mean", "Max", "Count"])
+
+        # Sıralı dizide pencere sınırları tek geçişte bulunur, reduceat ile her pencere bir kez işlenir
+        buckets = pd.DatetimeIndex(self.times).floor(freq).asi8
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(buckets)) + 1))
+        periods = pd.to_datetime(buckets[starts])
+
+        blocks = []
+        for col in self.columns:
+            values = self.values[col]
+            valid = ~np.isnan(values)
+            count = np.add.reduceat(valid.astype(int), starts)
+            total = np.add.reduceat(np.where(valid, values, 0.0), starts)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                mean = total / count
+            blocks.append(pd.DataFrame({
+                "Period": periods,
+                "Column": col,
+                "Min": np.fmin.reduceat(values, starts),
+                "Mean": mean,
+                "Max": np.fmax.reduceat(values, starts),
+                "Count": count,
+            }))
+
+        stats = pd.concat(blocks, ignore_index=True)
+        return stats.sort_values(["Period", "Column"], kind="stable").reset_index(drop=True)
+
+    def windowed_slope(self, col, window_days=7.0):
+        # Kayan zaman penceresinde en küçük kareler eğimi; kümülatif toplamlarla O(n)
+        values = self.values[col]
+        valid = ~np.isnan(values)
+        x = self.days[valid]
+        y = values[valid]
+        if len(x) < 2:
+            return x, np.full(len(x), np.nan)
+
+        def prefix(a):
+            return np.concatenate(([0.0], np.cumsum(a)))
+
+        sx, sy, sxx, sxy = prefix(x), prefix(y), prefix(x * x), prefix(x * y)
+        ends = np.arange(1, len(x) + 1)
+        starts = np.searchsorted(x, x - window_days, side="left")
+
+        n = ends - starts
+        sum_x = sx[ends] - sx[starts]
+        sum_y = sy[ends] - sy[starts]
+        sum_xx = sxx[ends] - sxx[starts]
+        sum_xy = sxy[ends] - sxy[starts]
+
+        denominator = n * sum_xx - sum_x * sum_x
+        with np.errstate(invalid="ignore", divide="ignore"):
+            slope = np.where(denominator > 0, (n * sum_xy - sum_x * sum_y) / denominator, np.nan)
+        return x, slope
+
+    def overall_slope(self, col):
+        values = self.values[col]
+        valid = ~np.isnan(values)
+        x = self.days[valid]
+        y = values[valid]
+        if len(x) < 2 or np.ptp(x) == 0:
+            return np.nan
+        x_mean = x.mean()
+        return float(((x - x_mean) * (y - y.mean())).sum() / ((x - x_mean) ** 2).sum())
+
+    def trend_summary(self, window_days=7.0):
+        print("Status: Calculating trends...")
+        rows = []
+        for name, col, limit in TREND_CHECKS:
+            if col not in self.values:
+                continue
+            overall = self.overall_slope(col)
+            _, rolling = self.windowed_slope(col, window_days)
+            recent = float(rolling[-1]) if len(rolling) else np.nan
+
+            # Kısa pencere gürültülü olduğu için işaretleme tüm aralığın eğimine göre yapılır
+            flagged = not np.isnan(overall) and (overall <= limit if limit < 0 else overall >= limit)
+            rows.append({
+                "Trend": name,
+                "Column": col,
+                "Slope/Day (All)": overall,
+                f"Slope/Day (Last {window_days:g}d)": recent,
+                "Limit/Day": float(limit),
+                "Result": "FLAG" if flagged else "OK",
+            })
+        return pd.DataFrame(rows)